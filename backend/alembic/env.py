@@ -20,7 +20,8 @@ from app.database import Base
 from app.tables import (
     Project, CodeFile, Issue, Suggestion, Approval,
     AgentRun, BusinessRule, RuleVersion, ChangeImpact,
-    AgentDependency, ReleaseChecklist
+    AgentDependency, ReleaseChecklist, LLMCacheEntry, DashboardMetric,
+    CodeFileAnalysis, RuleTerm, RuleIdSequence, CodeSymbol
 )
 
 # this is the Alembic Config object, which provides
@@ -0,0 +1,40 @@
+"""Add background job columns to agent_runs
+
+Revision ID: 3f2a9c1d7e44
+Revises: 0b99ee86b5d5
+Create Date: 2026-10-17 09:12:03.418227
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f2a9c1d7e44'
+down_revision: Union[str, Sequence[str], None] = '0b99ee86b5d5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('agent_runs', sa.Column('job_params', sa.Text(), nullable=True))
+    op.add_column('agent_runs', sa.Column('result', sa.Text(), nullable=True))
+    op.add_column('agent_runs', sa.Column('progress', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('agent_runs', sa.Column('worker_id', sa.String(length=255), nullable=True))
+    op.add_column('agent_runs', sa.Column('started_at', sa.DateTime(), nullable=True))
+    op.add_column('agent_runs', sa.Column('finished_at', sa.DateTime(), nullable=True))
+    op.create_index('ix_agent_runs_status', 'agent_runs', ['status'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_agent_runs_status', table_name='agent_runs')
+    op.drop_column('agent_runs', 'finished_at')
+    op.drop_column('agent_runs', 'started_at')
+    op.drop_column('agent_runs', 'worker_id')
+    op.drop_column('agent_runs', 'progress')
+    op.drop_column('agent_runs', 'result')
+    op.drop_column('agent_runs', 'job_params')
@@ -0,0 +1,46 @@
+"""Add composite indexes for hot query patterns
+
+Revision ID: 5d7e2a9b4c18
+Revises: 8c41e07b2d93
+Create Date: 2026-10-17 16:05:27.640913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d7e2a9b4c18'
+down_revision: Union[str, Sequence[str], None] = '8c41e07b2d93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_suggestions_project_status_created', 'suggestions',
+        ['project_id', 'status', 'created_at', 'id'], unique=False
+    )
+    op.create_index(
+        'ix_agent_runs_project_agent_created', 'agent_runs',
+        ['project_id', 'agent_type', 'created_at'], unique=False
+    )
+    op.create_index(
+        'ix_business_rules_project_status', 'business_rules',
+        ['project_id', 'status'], unique=False
+    )
+    op.create_index(
+        'ix_code_files_project_path', 'code_files',
+        ['project_id', 'file_path', 'content_hash', 'language'], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_code_files_project_path', table_name='code_files')
+    op.drop_index('ix_business_rules_project_status', table_name='business_rules')
+    op.drop_index('ix_agent_runs_project_agent_created', table_name='agent_runs')
+    op.drop_index('ix_suggestions_project_status_created', table_name='suggestions')
@@ -0,0 +1,33 @@
+"""Add content_hash to code_files
+
+Revision ID: 8c41e07b2d93
+Revises: 3f2a9c1d7e44
+Create Date: 2026-10-17 14:36:51.207114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c41e07b2d93'
+down_revision: Union[str, Sequence[str], None] = '3f2a9c1d7e44'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('code_files', sa.Column('content_hash', sa.String(length=64), nullable=True))
+    op.create_index('ix_code_files_content_hash', 'code_files', ['content_hash'], unique=False)
+    # Backfill existing rows; same digest as compute_content_hash (sha256 of utf-8 content)
+    if op.get_bind().dialect.name == 'mysql':
+        op.execute("UPDATE code_files SET content_hash = SHA2(content, 256)")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_code_files_content_hash', table_name='code_files')
+    op.drop_column('code_files', 'content_hash')
@@ -0,0 +1,30 @@
+"""Add job lease columns to agent_runs
+
+Revision ID: 9a3c6e1f5b27
+Revises: 5d7e2a9b4c18
+Create Date: 2026-10-17 16:40:12.205931
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a3c6e1f5b27'
+down_revision: Union[str, Sequence[str], None] = '5d7e2a9b4c18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('agent_runs', sa.Column('heartbeat_at', sa.DateTime(), nullable=True))
+    op.add_column('agent_runs', sa.Column('attempts', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('agent_runs', 'attempts')
+    op.drop_column('agent_runs', 'heartbeat_at')
@@ -67,24 +67,22 @@ Always ensure:
                     BusinessRule.status == "approved"
                 ).all()
 
+            rules_context = "\n\n".join([
+                f"Rule ID: {rule.rule_id}\nContent: {rule.content}"
+                for rule in rules
+            ]) if rules else "No business rules provided"
+
             # Get code files if provided
             code_context = ""
             if code_file_id:
                 code_file = self.get_code_file(code_file_id)
                 if code_file:
-                    code_context = f"\n\nExisting Code:\n```{code_file.language or ''}\n{code_file.content}\n```"
+                    code_context = f"\n\nExisting Code:\n```{code_file.language or ''}\n{self.fit_code(code_file, query=rules_context)}\n```"
             else:
-                # Get all code files for context
+                # Pack the project's files most relevant to the rules into the context budget
                 code_files = self.get_project_code_files(project_id)
                 if code_files:
-                    code_context = "\n\nExisting Code Files:\n"
-                    for cf in code_files[:3]:  # Limit to first 3 files
-                        code_context += f"\nFile: {cf.file_path}\n```{cf.language or ''}\n{cf.content[:500]}...\n```"
-
-            rules_context = "\n\n".join([
-                f"Rule ID: {rule.rule_id}\nContent: {rule.content}"
-                for rule in rules
-            ]) if rules else "No business rules provided"
+                    code_context = "\n\nExisting Code Files:\n" + self.build_code_context(code_files, query=rules_context)
 
             user_prompt = f"""Generate comprehensive API contracts from the following business rules and code.
 
@@ -1,15 +1,84 @@
 """Base agent class for all AI agents."""
+import asyncio
+import hashlib
+import os
+import time
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Awaitable, Callable, Sequence, Tuple
 from sqlalchemy.orm import Session
-from ..tables import AgentType, Suggestion, SuggestionStatus, Project, CodeFile, AgentRun
+from ..tables import AgentType, Suggestion, SuggestionStatus, Project, CodeFile, AgentRun, AgentRunRepository, DashboardMetricRepository
+from ..tables import CodeFileAnalysisRepository, CodeSymbolRepository
+from ..tables.code_files import compute_content_hash
 from ..services.groq_service import GroqService
+from ..services.llm_cache import LLM_CACHE_DISABLED_AGENTS
+from ..services.code_search import get_code_search_index, CODE_SEARCH_TOP_K
+from ..utils.incremental_json import IncrementalJSONParser
+from ..utils.context_budget import estimate_tokens, fit_to_budget, pack_files, split_code
 from datetime import datetime
 
+# Per-file fan-out settings: max concurrent LLM calls, and max calls started
+# per second (0 disables rate limiting)
+AGENT_FAN_OUT_CONCURRENCY = int(os.getenv("AGENT_FAN_OUT_CONCURRENCY", "8"))
+AGENT_FAN_OUT_RATE_LIMIT = float(os.getenv("AGENT_FAN_OUT_RATE_LIMIT", "0"))
+# Batched writes: buffer suggestions and run logs during run() and commit them
+# once at the end; the buffer is flushed early once it holds this many rows
+AGENT_BATCH_WRITES = os.getenv("AGENT_BATCH_WRITES", "true").lower() == "true"
+AGENT_BATCH_FLUSH_SIZE = int(os.getenv("AGENT_BATCH_FLUSH_SIZE", "200"))
+# Estimated tokens of code context per LLM call (see fit_code/build_code_context)
+AGENT_CONTEXT_TOKEN_BUDGET = int(os.getenv("AGENT_CONTEXT_TOKEN_BUDGET", "6000"))
+# Map-reduce over context that exceeds the budget: shard size, summary length
+# per shard (tokens) and how many times summaries may be summarized again
+AGENT_MAP_SHARD_TOKENS = int(os.getenv("AGENT_MAP_SHARD_TOKENS", "3000"))
+AGENT_MAP_SUMMARY_TOKENS = int(os.getenv("AGENT_MAP_SUMMARY_TOKENS", "600"))
+AGENT_MAP_MAX_LEVELS = int(os.getenv("AGENT_MAP_MAX_LEVELS", "3"))
+
+# Shared by all agents, so one shard's summary is cached once for all of them
+MAP_SYSTEM_PROMPT = """You condense project material for a later analysis step.
+Keep every identifier exactly as written (Rule IDs such as BL-001, versions, file paths,
+entity, field and endpoint names) and every number, limit and condition.
+Drop wording, not facts. Answer with terse bullet points only."""
+
+
+class _AsyncRateLimiter:
+    """Spaces out call starts so at most `rate` calls begin per second."""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next_start = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        if not self.interval:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            wait = self._next_start - now
+            self._next_start = max(now, self._next_start) + self.interval
+        if wait > 0:
+            await asyncio.sleep(wait)
+
 
 class BaseAgent(ABC):
     """Base class for all AI agents."""
 
+    # Serve repeat prompts from the LLM response cache. Agents whose output
+    # must be freshly generated every run can set this to False.
+    use_llm_cache: bool = True
+
+    # Concurrency and rate limit for fan_out (per agent run)
+    fan_out_concurrency: int = AGENT_FAN_OUT_CONCURRENCY
+    fan_out_rate_limit: float = AGENT_FAN_OUT_RATE_LIMIT
+
+    # Unit-of-work settings for run()
+    batch_writes: bool = AGENT_BATCH_WRITES
+    batch_flush_size: int = AGENT_BATCH_FLUSH_SIZE
+
+    # Code context per prompt, in estimated tokens
+    context_token_budget: int = AGENT_CONTEXT_TOKEN_BUDGET
+    map_shard_tokens: int = AGENT_MAP_SHARD_TOKENS
+    map_summary_tokens: int = AGENT_MAP_SUMMARY_TOKENS
+    map_max_levels: int = AGENT_MAP_MAX_LEVELS
+
     def __init__(self, db: Session):
         """
         Initialize agent.
@@ -18,8 +87,16 @@ class BaseAgent(ABC):
             db: Database session
         """
         self.db = db
+        # GroqService shares one process-wide connection pool, so this is cheap
         self.groq_service = GroqService()
         self.agent_type = self.get_agent_type()
+        # Set by the job queue when this agent runs as a background job
+        self.job_run_id: Optional[int] = None
+        if self.agent_type.value in LLM_CACHE_DISABLED_AGENTS:
+            self.use_llm_cache = False
+        # Unit of work: True while run() buffers writes; rows staged but not yet flushed
+        self._batching = False
+        self._unflushed: List[Any] = []
 
     @abstractmethod
     def get_agent_type(self) -> AgentType:
@@ -45,6 +122,66 @@ class BaseAgent(ABC):
         """
         pass
 
+    def run(self, **params) -> Dict[str, Any]:
+        """
+        Run analyze() as one unit of work.
+
+        Suggestions and run logs created during the run are buffered and
+        written with a single commit when analyze() returns, instead of a
+        commit and refresh per row. Buffered rows are flushed (ids assigned)
+        by log_agent_run, create_suggestions, flush_writes, or once
+        batch_flush_size rows are waiting.
+
+        Args:
+            **params: Keyword arguments for analyze()
+
+        Returns:
+            Dictionary with analysis results
+        """
+        if not self.batch_writes:
+            # Rows are committed as they are created; this commits what
+            # repositories only flushed (analysis baselines, index refreshes)
+            result = self.analyze(**params)
+            self.db.commit()
+            return result
+
+        self._batching = True
+        try:
+            result = self.analyze(**params)
+            self.flush_writes()
+            self.db.commit()
+            return result
+        except Exception:
+            self.db.rollback()
+            raise
+        finally:
+            self._batching = False
+            self._unflushed = []
+
+    def flush_writes(self) -> None:
+        """
+        Write buffered suggestions and run logs to the database (no commit).
+
+        Ids are assigned by the flush, so they can be read afterwards
+        without a SELECT.
+        """
+        if not self._unflushed:
+            return
+        rows, self._unflushed = self._unflushed, []
+        metrics = DashboardMetricRepository(self.db)
+        metrics.record_suggestions_created([row for row in rows if isinstance(row, Suggestion)])
+        for row in rows:
+            if isinstance(row, AgentRun):
+                metrics.record_agent_run_created(row)
+        self.db.add_all(rows)
+        self.db.flush()
+
+    def _stage(self, row: Any) -> None:
+        """Buffer a new row for the current unit of work."""
+        self._unflushed.append(row)
+        if len(self._unflushed) >= self.batch_flush_size:
+            self.flush_writes()
+
     def create_suggestion(
         self,
         project_id: int,
@@ -68,7 +205,8 @@ class BaseAgent(ABC):
             parent_suggestion_id: Optional parent suggestion ID for cascading changes
 
         Returns:
-            Created suggestion object
+            Created suggestion object (inside run(), its id is assigned by the
+            next flush, e.g. log_agent_run)
         """
         suggestion = Suggestion(
             agent_type=self.agent_type,
@@ -81,11 +219,61 @@ class BaseAgent(ABC):
             content=content,
             status=SuggestionStatus.PENDING
         )
+        if self._batching:
+            self._stage(suggestion)
+            return suggestion
+
         self.db.add(suggestion)
+        DashboardMetricRepository(self.db).record_suggestions_created([suggestion])
         self.db.commit()
         self.db.refresh(suggestion)
         return suggestion
 
+    def create_suggestions(
+        self,
+        project_id: int,
+        suggestions: List[Dict[str, Any]]
+    ) -> List[int]:
+        """
+        Create several suggestions in a single transaction.
+
+        Args:
+            project_id: Project ID
+            suggestions: One dict per suggestion with the keyword arguments
+                accepted by create_suggestion (content, code_file_id, ...)
+
+        Returns:
+            IDs of the created suggestions, in input order
+        """
+        rows = [
+            Suggestion(
+                agent_type=self.agent_type,
+                project_id=project_id,
+                code_file_id=data.get("code_file_id"),
+                issue_id=data.get("issue_id"),
+                rule_id=data.get("rule_id"),
+                version=data.get("version"),
+                parent_suggestion_id=data.get("parent_suggestion_id"),
+                content=data["content"],
+                status=SuggestionStatus.PENDING
+            )
+            for data in suggestions
+        ]
+        if not rows:
+            return []
+        if self._batching:
+            self._unflushed.extend(rows)
+            self.flush_writes()
+            return [row.id for row in rows]
+
+        self.db.add_all(rows)
+        DashboardMetricRepository(self.db).record_suggestions_created(rows)
+        self.db.flush()
+        # Read ids before commit expires the objects (avoids a SELECT per row)
+        suggestion_ids = [row.id for row in rows]
+        self.db.commit()
+        return suggestion_ids
+
     def log_agent_run(
         self,
         project_id: int,
@@ -105,6 +293,19 @@ class BaseAgent(ABC):
         Returns:
             Created agent run object
         """
+        if self.job_run_id:
+            # Background job: record the outcome on the job's own row. The job
+            # queue sets the final status once the result has been stored.
+            agent_run = self.db.query(AgentRun).filter(AgentRun.id == self.job_run_id).first()
+            if agent_run:
+                agent_run.result_summary = result_summary
+                agent_run.error_message = error_message
+                if self._batching:
+                    self.flush_writes()
+                else:
+                    self.db.commit()
+                return agent_run
+
         agent_run = AgentRun(
             agent_type=self.agent_type,
             project_id=project_id,
@@ -112,11 +313,34 @@ class BaseAgent(ABC):
             result_summary=result_summary,
             error_message=error_message
         )
+        if self._batching:
+            # Usually the last write of a run: flush so the caller can read
+            # the ids of everything created; run() commits
+            self._unflushed.append(agent_run)
+            self.flush_writes()
+            return agent_run
+
         self.db.add(agent_run)
+        DashboardMetricRepository(self.db).record_agent_run_created(agent_run)
         self.db.commit()
         self.db.refresh(agent_run)
         return agent_run
 
+    def report_progress(self, progress: int) -> None:
+        """
+        Report progress (0-100) when running as a background job.
+
+        Uses a short-lived session so it can be called from any thread.
+        """
+        if not self.job_run_id:
+            return
+        from ..database import SessionLocal
+        db = SessionLocal()
+        try:
+            AgentRunRepository(db).update_progress(self.job_run_id, progress)
+        finally:
+            db.close()
+
     def get_project(self, project_id: int) -> Optional[Project]:
         """Get project by ID."""
         return self.db.query(Project).filter(Project.id == project_id).first()
@@ -129,6 +353,225 @@ class BaseAgent(ABC):
         """Get all code files for a project."""
         return self.db.query(CodeFile).filter(CodeFile.project_id == project_id).all()
 
+    def find_related_files(self, project_id: int, text: str, limit: int = 5) -> List[CodeFile]:
+        """
+        Code files whose symbols the text mentions, most relevant first.
+
+        Brings the project's symbol index up to date first (only files whose
+        content changed since they were indexed are re-extracted).
+
+        Args:
+            project_id: Project ID
+            text: Issue, rule or prompt text
+            limit: Maximum number of files
+
+        Returns:
+            Related code files (empty if no symbol matches)
+        """
+        symbols = CodeSymbolRepository(self.db)
+        symbols.refresh(project_id)
+        return self._get_code_files_in_order(
+            [code_file_id for code_file_id, _ in symbols.related_files(project_id, text, limit)]
+        )
+
+    def search_code_files(self, project_id: int, text: str, limit: int = CODE_SEARCH_TOP_K) -> List[CodeFile]:
+        """
+        Code files ranked by BM25 relevance to a text (issue, bug report).
+
+        Uses the process-wide in-memory index, which re-tokenizes only files
+        changed since the last search of the project.
+
+        Args:
+            project_id: Project ID
+            text: Query text
+            limit: Maximum number of files
+
+        Returns:
+            Matching code files, best first (empty if no term matches)
+        """
+        ranked = get_code_search_index().search(self.db, project_id, text, limit)
+        return self._get_code_files_in_order([code_file_id for code_file_id, _ in ranked])
+
+    def _get_code_files_in_order(self, code_file_ids: List[int]) -> List[CodeFile]:
+        """Load code files by ID, keeping the given order."""
+        if not code_file_ids:
+            return []
+        files = {cf.id: cf for cf in self.db.query(CodeFile).filter(CodeFile.id.in_(code_file_ids))}
+        return [files[code_file_id] for code_file_id in code_file_ids if code_file_id in files]
+
+    def fit_code(self, code_file: CodeFile, query: str = "", budget: Optional[int] = None) -> str:
+        """
+        Content of one code file, cut to the context budget if it is too large.
+
+        Large files are split on function/class boundaries and the chunks most
+        relevant to the query are kept; omitted line ranges are marked.
+
+        Args:
+            code_file: Code file to include in a prompt
+            query: What the prompt is about (rules, issue text, user prompt)
+            budget: Token budget (defaults to context_token_budget)
+
+        Returns:
+            File content for the prompt
+        """
+        return fit_to_budget(code_file.content, budget or self.context_token_budget, query)
+
+    def build_code_context(
+        self,
+        code_files: List[CodeFile],
+        query: str = "",
+        budget: Optional[int] = None
+    ) -> str:
+        """
+        Pack several code files into one context budget.
+
+        Whole small files and chunks of large ones are ranked by relevance to
+        the query and packed until the budget is used; each selected file is
+        rendered as "File: path" and a fenced block.
+
+        Args:
+            code_files: Candidate files, in preference order
+            query: What the prompt is about
+            budget: Token budget (defaults to context_token_budget)
+
+        Returns:
+            Rendered context (empty if there are no files)
+        """
+        return pack_files(
+            [(cf.file_path, cf.language, cf.content) for cf in code_files],
+            budget or self.context_token_budget,
+            query
+        )
+
+    def map_reduce_context(
+        self,
+        blocks: List[str],
+        kind: str,
+        budget: Optional[int] = None
+    ) -> str:
+        """
+        Fit context blocks (rules, files, ...) into the budget, summarizing if needed.
+
+        Blocks that fit are joined unchanged and no LLM call is made. Otherwise
+        this is the map step of a map-reduce analysis: blocks are packed into
+        shards of map_shard_tokens, each shard is summarized in a parallel LLM
+        call, and summaries are summarized again (up to map_max_levels) until
+        they fit. The caller's own prompt over the result is the reduce step.
+
+        Shard summaries always go through the LLM response cache, keyed by the
+        shard content, so unchanged shards are not summarized twice. A shard
+        whose summary call fails is cut down to the summary length instead
+        (see fit_to_budget), so the run still completes.
+
+        Args:
+            blocks: Context blocks, e.g. "Rule ID: BL-001\nContent: ..."
+            kind: What the blocks are, for the summary prompt ("business rules")
+            budget: Token budget (defaults to context_token_budget)
+
+        Returns:
+            Context text within the budget
+        """
+        budget = budget or self.context_token_budget
+        for _ in range(max(1, self.map_max_levels)):
+            if sum(estimate_tokens(block) for block in blocks) <= budget:
+                return "\n\n".join(blocks)
+            shards = ["\n\n".join(shard) for shard in self._shard_blocks(blocks)]
+            summaries = self._run_fan_out(
+                [f"Summarize the following {kind}:\n\n" + shard for shard in shards],
+                lambda prompt: self.groq_service.agenerate(
+                    system_prompt=MAP_SYSTEM_PROMPT,
+                    user_prompt=prompt,
+                    temperature=0.0,
+                    max_tokens=self.map_summary_tokens,
+                    use_cache=True
+                ),
+                return_exceptions=True
+            )
+            summaries = [
+                fit_to_budget(shard, self.map_summary_tokens) if isinstance(summary, Exception) else summary
+                for shard, summary in zip(shards, summaries)
+            ]
+            blocks = [
+                f"Summary {index} of {len(summaries)}:\n{summary.strip()}"
+                for index, summary in enumerate(summaries, 1)
+            ]
+            kind = f"summaries of {kind}"
+        return fit_to_budget("\n\n".join(blocks), budget)
+
+    def _shard_blocks(self, blocks: List[str]) -> List[List[str]]:
+        """Pack blocks into shards of at most map_shard_tokens (large blocks are split)."""
+        shards: List[List[str]] = []
+        current: List[str] = []
+        used = 0
+        for block in blocks:
+            tokens = estimate_tokens(block)
+            pieces = [block] if tokens <= self.map_shard_tokens else [
+                chunk.text for chunk in split_code(block, max_tokens=self.map_shard_tokens)
+            ]
+            for piece in pieces:
+                piece_tokens = tokens if len(pieces) == 1 else estimate_tokens(piece)
+                if current and used + piece_tokens > self.map_shard_tokens:
+                    shards.append(current)
+                    current, used = [], 0
+                current.append(piece)
+                used += piece_tokens
+        if current:
+            shards.append(current)
+        return shards
+
+    @staticmethod
+    def _context_hash(context: str) -> Optional[str]:
+        """Fingerprint of non-file prompt inputs (None when there are none)."""
+        return hashlib.sha256(context.encode("utf-8")).hexdigest() if context else None
+
+    def filter_changed_files(
+        self,
+        code_files: List[CodeFile],
+        context: str = ""
+    ) -> Tuple[List[CodeFile], List[CodeFile]]:
+        """
+        Split files into those changed since this agent last analyzed them and those unchanged.
+
+        Args:
+            code_files: Candidate code files
+            context: Other prompt inputs (e.g. business rules) that should
+                invalidate previous analyses when they change
+
+        Returns:
+            (changed, unchanged) lists
+        """
+        last_hashes = CodeFileAnalysisRepository(self.db).get_hashes(
+            self.agent_type, [code_file.id for code_file in code_files]
+        )
+        context_hash = self._context_hash(context)
+        changed, unchanged = [], []
+        for code_file in code_files:
+            content_hash = code_file.content_hash or compute_content_hash(code_file.content)
+            if last_hashes.get(code_file.id) == (content_hash, context_hash):
+                unchanged.append(code_file)
+            else:
+                changed.append(code_file)
+        return changed, unchanged
+
+    def mark_files_analyzed(self, code_files: List[CodeFile], context: str = "") -> None:
+        """
+        Record the hashes of files this agent just analyzed (baseline for incremental runs).
+
+        Flushed only; run() commits it with the rest of the run.
+
+        Args:
+            code_files: Analyzed code files
+            context: Same context as passed to filter_changed_files
+        """
+        CodeFileAnalysisRepository(self.db).record(
+            self.agent_type,
+            {
+                code_file.id: code_file.content_hash or compute_content_hash(code_file.content)
+                for code_file in code_files
+            },
+            context_hash=self._context_hash(context)
+        )
+
     def generate_with_groq(
         self,
         user_prompt: str,
@@ -150,5 +593,242 @@ class BaseAgent(ABC):
             system_prompt=self.get_system_prompt(),
             user_prompt=user_prompt,
             temperature=temperature,
-            max_tokens=max_tokens
+            max_tokens=max_tokens,
+            use_cache=self.use_llm_cache
         )
+
+    async def agenerate_with_groq(
+        self,
+        user_prompt: str,
+        temperature: float = 0.2,
+        max_tokens: Optional[int] = None
+    ) -> str:
+        """
+        Generate response using Groq API without blocking the event loop.
+
+        Args:
+            user_prompt: User prompt
+            temperature: Temperature for generation
+            max_tokens: Maximum tokens
+
+        Returns:
+            Generated text
+        """
+        return await self.groq_service.agenerate(
+            system_prompt=self.get_system_prompt(),
+            user_prompt=user_prompt,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            use_cache=self.use_llm_cache
+        )
+
+    def generate_json_with_groq(
+        self,
+        user_prompt: str,
+        required_keys: Optional[List[str]] = None,
+        temperature: float = 0.2,
+        max_tokens: Optional[int] = None,
+        on_member: Optional[Callable[[str, Any], None]] = None
+    ) -> Tuple[Dict[str, Any], str]:
+        """
+        Generate a JSON object response, parsing it while it streams.
+
+        Generation stops once the object closes or all required_keys are
+        present, instead of waiting for trailing commentary.
+
+        Args:
+            user_prompt: User prompt
+            required_keys: Keys after which the rest of the response is not needed
+            temperature: Temperature for generation
+            max_tokens: Maximum tokens
+            on_member: Called with (key, value) on this thread as each
+                top-level member completes
+
+        Returns:
+            (parsed object, raw response text received)
+        """
+        parser = IncrementalJSONParser(required_keys)
+        for key, value in self.groq_service.stream_json(
+            system_prompt=self.get_system_prompt(),
+            user_prompt=user_prompt,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            required_keys=required_keys,
+            use_cache=self.use_llm_cache,
+            parser=parser
+        ):
+            if on_member:
+                on_member(key, value)
+        return parser.result, parser.text
+
+    async def agenerate_json_with_groq(
+        self,
+        user_prompt: str,
+        required_keys: Optional[List[str]] = None,
+        temperature: float = 0.2,
+        max_tokens: Optional[int] = None
+    ) -> Tuple[Dict[str, Any], str]:
+        """
+        Generate a JSON object response without blocking the event loop.
+
+        Args:
+            user_prompt: User prompt
+            required_keys: Keys after which the rest of the response is not needed
+            temperature: Temperature for generation
+            max_tokens: Maximum tokens
+
+        Returns:
+            (parsed object, raw response text received)
+        """
+        parser = IncrementalJSONParser(required_keys)
+        async for _ in self.groq_service.astream_json(
+            system_prompt=self.get_system_prompt(),
+            user_prompt=user_prompt,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            required_keys=required_keys,
+            use_cache=self.use_llm_cache,
+            parser=parser
+        ):
+            pass
+        return parser.result, parser.text
+
+    def fan_out(
+        self,
+        items: Sequence[Any],
+        build_prompt: Callable[[Any], str],
+        temperature: float = 0.2,
+        max_tokens: Optional[int] = None
+    ) -> Tuple[List[Tuple[Any, str]], List[Tuple[Any, Exception]]]:
+        """
+        Make one LLM call per item concurrently.
+
+        Calls run on the shared Groq loop, bounded by fan_out_concurrency and
+        fan_out_rate_limit. Prompts are built up front on the calling thread,
+        so build_prompt may safely read ORM attributes.
+
+        A failed call does not discard the others: the caller writes the
+        results it got and reports the failed items (see failed_files).
+
+        Args:
+            items: Items to process (e.g. code files)
+            build_prompt: Returns the user prompt for one item
+            temperature: Temperature for generation
+            max_tokens: Maximum tokens
+
+        Returns:
+            ((item, response) pairs of the calls that succeeded,
+             (item, error) pairs of the calls that failed), both in item order
+        """
+        return self._split_fan_out(items, self._run_fan_out(
+            [build_prompt(item) for item in items],
+            lambda prompt: self.agenerate_with_groq(
+                prompt, temperature=temperature, max_tokens=max_tokens
+            ),
+            return_exceptions=True
+        ))
+
+    def fan_out_json(
+        self,
+        items: Sequence[Any],
+        build_prompt: Callable[[Any], str],
+        required_keys: Optional[List[str]] = None,
+        temperature: float = 0.2,
+        max_tokens: Optional[int] = None
+    ) -> Tuple[List[Tuple[Any, Tuple[Dict[str, Any], str]]], List[Tuple[Any, Exception]]]:
+        """
+        Like fan_out, for prompts that ask for a JSON object.
+
+        Each response is parsed while it streams and stops generating once
+        its object closes or all required_keys are present.
+
+        Args:
+            items: Items to process (e.g. code files)
+            build_prompt: Returns the user prompt for one item
+            required_keys: Keys after which the rest of a response is not needed
+            temperature: Temperature for generation
+            max_tokens: Maximum tokens
+
+        Returns:
+            ((item, (parsed object, raw response text)) pairs of the calls
+             that succeeded, (item, error) pairs of the calls that failed)
+        """
+        return self._split_fan_out(items, self._run_fan_out(
+            [build_prompt(item) for item in items],
+            lambda prompt: self.agenerate_json_with_groq(
+                prompt, required_keys=required_keys, temperature=temperature, max_tokens=max_tokens
+            ),
+            return_exceptions=True
+        ))
+
+    @staticmethod
+    def failed_files(failed: List[Tuple[CodeFile, Exception]]) -> List[Dict[str, str]]:
+        """File path and error of each code file whose fan-out call failed."""
+        return [
+            {"file_path": code_file.file_path, "error": str(error) or type(error).__name__}
+            for code_file, error in failed
+        ]
+
+    @staticmethod
+    def _split_fan_out(
+        items: Sequence[Any],
+        responses: List[Any]
+    ) -> Tuple[List[Tuple[Any, Any]], List[Tuple[Any, Exception]]]:
+        """Pair items with their responses, separating the failed calls."""
+        succeeded, failed = [], []
+        for item, response in zip(items, responses):
+            if isinstance(response, Exception):
+                failed.append((item, response))
+            else:
+                succeeded.append((item, response))
+        return succeeded, failed
+
+    def _run_fan_out(
+        self,
+        prompts: List[str],
+        call: Callable[[str], Awaitable[Any]],
+        return_exceptions: bool = False
+    ) -> List[Any]:
+        """
+        Run call(prompt) for every prompt under the fan-out limits, reporting job progress.
+
+        All calls settle before this returns. A failed call's exception takes
+        the place of its response if return_exceptions is set; otherwise the
+        first failure is raised.
+        """
+        if not prompts:
+            return []
+
+        async def run_all():
+            semaphore = asyncio.Semaphore(max(1, self.fan_out_concurrency))
+            limiter = _AsyncRateLimiter(self.fan_out_rate_limit)
+
+            completed = 0
+            reported = 0
+
+            async def run_one(prompt: str) -> Any:
+                nonlocal completed, reported
+                async with semaphore:
+                    await limiter.acquire()
+                    response = await call(prompt)
+                completed += 1
+                # Leave the last few percent for post-processing
+                progress = completed * 95 // len(prompts)
+                if self.job_run_id and progress - reported >= 5:
+                    reported = progress
+                    await asyncio.to_thread(self.report_progress, progress)
+                return response
+
+            return await asyncio.gather(
+                *(run_one(prompt) for prompt in prompts),
+                return_exceptions=True
+            )
+
+        responses = self.groq_service.run_coroutine(run_all())
+        for response in responses:
+            # Cancellation and interpreter exits are never per-item results
+            if isinstance(response, BaseException) and (
+                not return_exceptions or not isinstance(response, Exception)
+            ):
+                raise response
+        return list(responses)
@@ -3,7 +3,7 @@ import json
 from typing import Dict, Any, Optional
 from sqlalchemy.orm import Session
 from .base_agent import BaseAgent
-from ..tables import AgentType, Issue
+from ..tables import AgentType, Issue, CodeFile
 from ..services.bitbucket_mock import BitbucketMockService
 
 
@@ -51,6 +51,7 @@ Always provide clear explanations of bugs and comprehensive fix suggestions with
 
             suggestions_created = []
             issues_created = []
+            failed_files = []
 
             # Handle human-identified bug (issue_id provided)
             if issue_id:
@@ -58,10 +59,18 @@ Always provide clear explanations of bugs and comprehensive fix suggestions with
                 if not issue:
                     return {"error": "Issue not found", "status": "error"}
 
-                # Get related code file if available
-                code_file = None
-                if issue.project.code_files:
-                    code_file = issue.project.code_files[0]  # Use first file or find by context
+                # Related code: the files that best match the issue text (BM25),
+                # else those whose symbols it mentions, else the first file of
+                # the project (issue.project.code_files would load every file)
+                issue_text = f"{issue.title} {issue.description}"
+                related = self.search_code_files(issue.project_id, issue_text) or \
+                    self.find_related_files(issue.project_id, issue_text)
+                if not related:
+                    first_file = self.db.query(CodeFile).filter(
+                        CodeFile.project_id == issue.project_id
+                    ).order_by(CodeFile.id).first()
+                    related = [first_file] if first_file else []
+                code_file = related[0] if related else None
 
                 # Generate fix suggestion
                 user_prompt = f"""A bug has been identified in the project. Please analyze and suggest a fix.
@@ -71,13 +80,9 @@ Title: {issue.title}
 Description: {issue.description}
 
 """
-                if code_file:
-                    user_prompt += f"""Related Code File: {code_file.file_path}
-
-Code:
-```{code_file.language or ''}
-{code_file.content}
-```
+                if related:
+                    user_prompt += f"""Related Code (most relevant parts of the best matching files):
+{self.build_code_context(related, query=issue_text)}
 
 """
                 user_prompt += """Please provide:
@@ -112,27 +117,25 @@ Format your response as JSON:
                         "suggested_fix": "See explanation above"
                     }, indent=2)
 
-                suggestion = self.create_suggestion(
-                    project_id=project_id,
-                    content=content,
-                    code_file_id=code_file.id if code_file else None,
-                    issue_id=issue_id
-                )
-                suggestions_created.append(suggestion.id)
+                suggestions_created.extend(self.create_suggestions(project_id, [{
+                    "content": content,
+                    "code_file_id": code_file.id if code_file else None,
+                    "issue_id": issue_id
+                }]))
 
             # Scan codebase for bugs (if scan_all or no issue_id)
             if scan_all or not issue_id:
                 code_files = self.get_project_code_files(project_id)
                 if code_files:
-                    for code_file in code_files:
-                        user_prompt = f"""Scan the following code for potential bugs, vulnerabilities, and issues.
+                    def build_prompt(code_file):
+                        return f"""Scan the following code for potential bugs, vulnerabilities, and issues.
 
 Code File: {code_file.file_path}
 Language: {code_file.language or 'Unknown'}
 
 Code:
 ```{code_file.language or ''}
-{code_file.content}
+{self.fit_code(code_file)}
 ```
 
 Please identify:
@@ -159,8 +162,14 @@ Format your response as JSON:
     "summary": "overall summary"
 }}"""
 
-                        response = self.generate_with_groq(user_prompt, temperature=0.2)
-                        
+                    # Scan all files concurrently
+                    succeeded, failed = self.fan_out(code_files, build_prompt, temperature=0.2)
+                    if failed and not succeeded and not suggestions_created:
+                        raise failed[0][1]
+                    failed_files = self.failed_files(failed)
+
+                    suggestion_rows = []
+                    for code_file, response in succeeded:
                         try:
                             if "```json" in response:
                                 json_str = response.split("```json")[1].split("```")[0].strip()
@@ -191,23 +200,21 @@ Format your response as JSON:
                                 "summary": response
                             }, indent=2)
 
-                        suggestion = self.create_suggestion(
-                            project_id=project_id,
-                            content=content,
-                            code_file_id=code_file.id
-                        )
-                        suggestions_created.append(suggestion.id)
+                        suggestion_rows.append({"content": content, "code_file_id": code_file.id})
+
+                    suggestions_created.extend(self.create_suggestions(project_id, suggestion_rows))
 
             self.log_agent_run(
                 project_id=project_id,
                 status="success",
-                result_summary=f"Scanned for bugs, created {len(suggestions_created)} suggestion(s), {len(issues_created)} issue(s)"
+                result_summary=f"Scanned for bugs, created {len(suggestions_created)} suggestion(s), {len(issues_created)} issue(s), {len(failed_files)} file(s) failed"
             )
 
             return {
                 "status": "success",
                 "suggestions_created": suggestions_created,
                 "issues_created": issues_created,
+                "failed_files": failed_files,
                 "message": f"Bug scan completed. Created {len(suggestions_created)} suggestion(s) and {len(issues_created)} issue(s)"
             }
 
@@ -4,7 +4,6 @@ from typing import Dict, Any, Optional
 from sqlalchemy.orm import Session
 from .base_agent import BaseAgent
 from ..tables import AgentType, BusinessRule, RuleStatus
-from ..services.groq_service import GroqService
 from ..services.rule_service import RuleService
 
 
@@ -63,8 +62,6 @@ When you detect conflicts or ambiguities, clearly state them and ask for clarifi
                     "status": "error"
                 }
 
-            groq_service = GroqService()
-
             # If updating existing rule
             if rule_id:
                 existing_rule = RuleService.get_rule_by_id(self.db, rule_id)
@@ -131,11 +128,7 @@ Format your response as JSON:
     "overall_assumptions": ["assumptions that apply to all rules"]
 }}"""
 
-            response = groq_service.generate(
-                system_prompt=self.get_system_prompt(),
-                user_prompt=user_prompt,
-                temperature=0.2
-            )
+            response = self.generate_with_groq(user_prompt, temperature=0.2)
 
             # Parse response using robust JSON extractor
             from ..utils.json_extractor import extract_json_from_text
@@ -189,6 +182,7 @@ Format your response as JSON:
             # Create multiple business rules if we have a list
             created_rule_ids = []
             if not rule_id and rules_list:
+                new_rules = []
                 for rule_data in rules_list:
                     rule_content = rule_data.get("content", "")
                     if not rule_content:
@@ -199,15 +193,17 @@ Format your response as JSON:
                         rule_content = json.dumps(rule_content, indent=2)
                     elif not isinstance(rule_content, str):
                         rule_content = str(rule_content) if rule_content else ""
-                    
+                    new_rules.append((rule_data, rule_content))
+                
+                # Reserve unique rule IDs for the whole batch in one step
+                new_rule_ids = RuleService.generate_rule_ids(self.db, project_id, len(new_rules))
+                
+                for (rule_data, rule_content), new_rule_id in zip(new_rules, new_rule_ids):
                     # Check for conflicts
                     conflicts = RuleService.detect_conflicts(self.db, project_id, rule_content)
                     if conflicts:
                         analysis_data["conflicts_detected"].extend([c["rule_id"] for c in conflicts])
                     
-                    # Generate unique rule ID
-                    new_rule_id = RuleService.generate_rule_id(self.db, project_id)
-                    
                     # Get assumptions for this specific rule or use overall assumptions
                     rule_assumptions = rule_data.get("assumptions", [])
                     if not rule_assumptions:
@@ -224,6 +220,8 @@ Format your response as JSON:
                         created_by=kwargs.get("created_by", "system")
                     )
                     self.db.add(business_rule)
+                    # Index now so later rules in this batch are checked against it
+                    RuleService.index_rule(self.db, business_rule)
                     created_rule_ids.append(new_rule_id)
                 
                 self.db.commit()
@@ -240,6 +238,7 @@ Format your response as JSON:
                 existing_rule.content = analysis_data.get("updated_content", existing_rule.content)
                 existing_rule.assumptions = json.dumps(analysis_data.get("assumptions", []))
                 existing_rule.status = RuleStatus.PENDING_APPROVAL
+                RuleService.index_rule(self.db, existing_rule)
                 self.db.commit()
                 self.db.refresh(existing_rule)
 
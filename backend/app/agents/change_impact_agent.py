@@ -3,7 +3,7 @@ import json
 from typing import Dict, Any, Optional, List
 from sqlalchemy.orm import Session
 from .base_agent import BaseAgent
-from ..tables import AgentType, ChangeType, ChangeImpact, RiskLevel, BusinessRule, Suggestion
+from ..tables import AgentType, ChangeType, ChangeImpact, RiskLevel, BusinessRule, Suggestion, CodeFile
 from ..services.groq_service import GroqService
 from ..services.orchestration_service import OrchestrationService
 
@@ -84,13 +84,19 @@ Always ensure:
                 Suggestion.project_id == project_id
             ).order_by(Suggestion.created_at.desc()).limit(10).all()
 
-            # Get code files for consistency check
-            code_files = self.get_project_code_files(project_id)
+            # Code files for consistency check: count them, and include the ones
+            # whose symbols the affected rules mention
+            code_file_count = self.db.query(CodeFile.id).filter(CodeFile.project_id == project_id).count()
+            rules_text = "\n".join(str(rule.content) for rule in affected_rules)
+            related_files = self.find_related_files(project_id, rules_text) if affected_rules else []
+            related_code = self.build_code_context(related_files, query=rules_text) if related_files else (
+                "No code files reference the affected rules"
+            )
 
-            rules_context = "\n\n".join([
+            rules_context = self.map_reduce_context([
                 f"Rule ID: {rule.rule_id}\nVersion: {rule.version}\nContent: {rule.content}"
                 for rule in affected_rules
-            ]) if affected_rules else "No specific rules provided"
+            ], kind="changed business rules") if affected_rules else "No specific rules provided"
 
             user_prompt = f"""Analyze the impact of the following change and detect any drift.
 
@@ -100,7 +106,10 @@ Affected Business Rules:
 {rules_context}
 
 Existing Suggestions Count: {len(existing_suggestions)}
-Code Files Count: {len(code_files)}
+Code Files Count: {code_file_count}
+
+Code Related to the Affected Rules:
+{related_code}
 
 Please analyze:
 1. Impact on product requirements
@@ -28,6 +28,7 @@ Always provide actionable, specific feedback with examples."""
         self,
         project_id: int,
         code_file_id: Optional[int] = None,
+        incremental: bool = False,
         **kwargs
     ) -> Dict[str, Any]:
         """
@@ -36,6 +37,7 @@ Always provide actionable, specific feedback with examples."""
         Args:
             project_id: Project ID
             code_file_id: Optional specific code file ID
+            incremental: Skip files unchanged since this agent last reviewed them
             **kwargs: Additional parameters
 
         Returns:
@@ -57,17 +59,32 @@ Always provide actionable, specific feedback with examples."""
                 if not code_files:
                     return {"error": "No code files found in project", "status": "error"}
 
-            suggestions_created = []
-            for code_file in code_files:
+            skipped_files = []
+            if incremental:
+                code_files, skipped_files = self.filter_changed_files(code_files)
+                if not code_files:
+                    self.log_agent_run(
+                        project_id=project_id,
+                        status="success",
+                        result_summary=f"No changed files ({len(skipped_files)} unchanged)"
+                    )
+                    return {
+                        "status": "success",
+                        "suggestions_created": [],
+                        "files_skipped": len(skipped_files),
+                        "message": "No files changed since the last code review"
+                    }
+
+            def build_prompt(code_file):
                 # Generate code review
-                user_prompt = f"""Review the following code and provide comprehensive feedback.
+                return f"""Review the following code and provide comprehensive feedback.
 
 Code File: {code_file.file_path}
 Language: {code_file.language or 'Unknown'}
 
 Code:
 ```{code_file.language or ''}
-{code_file.content}
+{self.fit_code(code_file)}
 ```
 
 Please provide a code review covering:
@@ -95,11 +112,17 @@ Format your response as JSON:
     "summary": "overall review summary"
 }}"""
 
-                response = self.generate_with_groq(user_prompt, temperature=0.3)
-                
-                # Parse response using robust JSON extractor
-                from ..utils.json_extractor import extract_json_from_text
-                
+            # Review all files concurrently
+            succeeded, failed = self.fan_out(code_files, build_prompt, temperature=0.3)
+            if failed and not succeeded:
+                raise failed[0][1]
+            failed_files = self.failed_files(failed)
+
+            # Parse response using robust JSON extractor
+            from ..utils.json_extractor import extract_json_from_text
+
+            suggestion_rows = []
+            for code_file, response in succeeded:
                 extracted = extract_json_from_text(response, fallback_to_text=False)
                 
                 if isinstance(extracted, dict):
@@ -111,22 +134,23 @@ Format your response as JSON:
                         "summary": "Generated code review"
                     }, indent=2)
 
-                suggestion = self.create_suggestion(
-                    project_id=project_id,
-                    content=content,
-                    code_file_id=code_file.id
-                )
-                suggestions_created.append(suggestion.id)
+                suggestion_rows.append({"content": content, "code_file_id": code_file.id})
+
+            suggestions_created = self.create_suggestions(project_id, suggestion_rows)
+            # Failed files stay unmarked so the next run retries them
+            self.mark_files_analyzed([code_file for code_file, _ in succeeded])
 
             self.log_agent_run(
                 project_id=project_id,
                 status="success",
-                result_summary=f"Reviewed {len(suggestions_created)} file(s)"
+                result_summary=f"Reviewed {len(suggestions_created)} file(s), {len(failed_files)} failed"
             )
 
             return {
                 "status": "success",
                 "suggestions_created": suggestions_created,
+                "files_skipped": len(skipped_files),
+                "failed_files": failed_files,
                 "message": f"Code review completed for {len(suggestions_created)} file(s)"
             }
 
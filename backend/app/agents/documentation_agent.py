@@ -58,19 +58,18 @@ Always write clear, concise, and helpful documentation that follows best practic
                 if not code_files:
                     return {"error": "No code files found in project", "status": "error"}
 
-            suggestions_created = []
-            for code_file in code_files:
-                # Generate documentation based on type
-                doc_instructions = {
-                    "api": "Generate API documentation with endpoint descriptions, parameters, and examples.",
-                    "readme": "Generate a comprehensive README file with project description, setup instructions, and usage examples.",
-                    "comments": "Generate code comments and docstrings for all functions and classes.",
-                    "all": "Generate all types of documentation: API docs, README, and code comments."
-                }
-                
-                instruction = doc_instructions.get(doc_type, doc_instructions["all"])
-
-                user_prompt = f"""Generate documentation for the following code.
+            # Generate documentation based on type
+            doc_instructions = {
+                "api": "Generate API documentation with endpoint descriptions, parameters, and examples.",
+                "readme": "Generate a comprehensive README file with project description, setup instructions, and usage examples.",
+                "comments": "Generate code comments and docstrings for all functions and classes.",
+                "all": "Generate all types of documentation: API docs, README, and code comments."
+            }
+            
+            instruction = doc_instructions.get(doc_type, doc_instructions["all"])
+
+            def build_prompt(code_file):
+                return f"""Generate documentation for the following code.
 
 Code File: {code_file.file_path}
 Language: {code_file.language or 'Unknown'}
@@ -80,7 +79,7 @@ Documentation Type: {doc_type}
 
 Code:
 ```{code_file.language or ''}
-{code_file.content}
+{self.fit_code(code_file)}
 ```
 
 Please provide:
@@ -96,8 +95,14 @@ Format your response as JSON:
     "examples": ["usage examples if applicable"]
 }}"""
 
-                response = self.generate_with_groq(user_prompt, temperature=0.2)
-                
+            # Document all files concurrently
+            succeeded, failed = self.fan_out(code_files, build_prompt, temperature=0.2)
+            if failed and not succeeded:
+                raise failed[0][1]
+            failed_files = self.failed_files(failed)
+
+            suggestion_rows = []
+            for code_file, response in succeeded:
                 # Try to parse as JSON
                 try:
                     if "```json" in response:
@@ -117,22 +122,20 @@ Format your response as JSON:
                         "explanation": "Generated documentation"
                     }, indent=2)
 
-                suggestion = self.create_suggestion(
-                    project_id=project_id,
-                    content=content,
-                    code_file_id=code_file.id
-                )
-                suggestions_created.append(suggestion.id)
+                suggestion_rows.append({"content": content, "code_file_id": code_file.id})
+
+            suggestions_created = self.create_suggestions(project_id, suggestion_rows)
 
             self.log_agent_run(
                 project_id=project_id,
                 status="success",
-                result_summary=f"Generated {doc_type} documentation for {len(suggestions_created)} file(s)"
+                result_summary=f"Generated {doc_type} documentation for {len(suggestions_created)} file(s), {len(failed_files)} failed"
             )
 
             return {
                 "status": "success",
                 "suggestions_created": suggestions_created,
+                "failed_files": failed_files,
                 "message": f"Generated documentation for {len(suggestions_created)} file(s)"
             }
 
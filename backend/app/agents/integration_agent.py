@@ -6,6 +6,9 @@ from sqlalchemy.orm import Session
 from .base_agent import BaseAgent
 from ..tables import AgentType
 
+# Top-level members of the generated spec; the response is complete once all have arrived
+SPEC_REQUIRED_KEYS = ["serviceName", "endpoints", "openapi_spec"]
+
 
 class IntegrationAgent(BaseAgent):
     """Integration Agent for generating API specifications."""
@@ -239,9 +242,8 @@ components:
               error:
                 type: string
 
-Format your response as JSON:
+Format your response as JSON, with the fields in this order:
 {{
-    "openapi_spec": "complete OpenAPI 3.0.0 YAML specification (ready for Swagger Editor - must be valid YAML)",
     "serviceName": "{service_name}",
     "version": "1.0.0",
     "baseUrl": "{base_url}",
@@ -266,10 +268,26 @@ Format your response as JSON:
         "OAuth 2.0 authentication required",
         "Rate limiting: 100 requests per minute",
         "All requests must be sent over HTTPS"
-    ]
+    ],
+    "openapi_spec": "complete OpenAPI 3.0.0 YAML specification (ready for Swagger Editor - must be valid YAML)"
 }}"""
 
-            response = self.generate_with_groq(user_prompt, temperature=0.2)
+            # The spec is parsed while it streams: the short fields and
+            # endpoints arrive before the long openapi_spec, and generation
+            # stops as soon as the spec is complete
+            received = set()
+
+            def on_member(key, value):
+                if key in SPEC_REQUIRED_KEYS and key not in received:
+                    received.add(key)
+                    self.report_progress(90 * len(received) // len(SPEC_REQUIRED_KEYS))
+
+            streamed_spec, response = self.generate_json_with_groq(
+                user_prompt,
+                required_keys=SPEC_REQUIRED_KEYS,
+                temperature=0.2,
+                on_member=on_member
+            )
 
             # Parse response using robust JSON extractor
             from ..utils.json_extractor import extract_json_from_text, extract_yaml_from_text
@@ -307,9 +325,9 @@ Format your response as JSON:
                         except:
                             pass
             
-            # Use preferred_keys to ensure we get the complete spec structure
+            # Keys that identify the complete spec structure (vs. a schema fragment)
             preferred_keys = ["openapi_spec", "serviceName", "version", "baseUrl", "description", "endpoints"]
-            spec_data = extract_json_from_text(response, fallback_to_text=False, preferred_keys=preferred_keys)
+            spec_data = streamed_spec
             
             # If we found YAML content, ensure it's in the openapi_spec field
             if yaml_content and isinstance(spec_data, dict):
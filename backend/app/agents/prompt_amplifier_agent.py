@@ -262,9 +262,9 @@ Always ensure:
             code_files = self.get_project_code_files(project_id)
             code_context = ""
             if code_files:
-                code_context = "\n\nExisting Codebase Context:\n"
-                for cf in code_files[:5]:  # Limit to first 5 files
-                    code_context += f"\nFile: {cf.file_path}\n```{cf.language or ''}\n{cf.content[:300]}...\n```"
+                code_context = "\n\nExisting Codebase Context:\n" + self.build_code_context(
+                    code_files, query=f"{original_prompt} {context or ''}"
+                )
                 knowledge_sources_used.append({
                     "source": "Project Codebase",
                     "type": "codebase",
@@ -7,6 +7,9 @@ from ..tables import AgentType, BusinessRule
 from ..services.groq_service import GroqService
 from ..services.rule_service import RuleService
 
+# Members of the JSON object the test generation prompt asks for
+TEST_RESPONSE_KEYS = ["test_code", "test_cases", "coverage_analysis", "business_rule_validation", "explanation"]
+
 
 class QualityTestAgent(BaseAgent):
     """Agent 5: Quality & Test Intelligence Agent."""
@@ -34,6 +37,7 @@ Always ensure:
         project_id: int,
         code_file_id: Optional[int] = None,
         rule_ids: Optional[List[str]] = None,
+        incremental: bool = False,
         **kwargs
     ) -> Dict[str, Any]:
         """
@@ -43,6 +47,7 @@ Always ensure:
             project_id: Project ID
             code_file_id: Optional specific code file
             rule_ids: Optional list of Rule IDs
+            incremental: Skip files (and rules) unchanged since this agent last analyzed them
             **kwargs: Additional parameters
 
         Returns:
@@ -87,11 +92,28 @@ Always ensure:
                 for rule in rules
             ])
 
-            suggestions_created = []
             all_rule_ids = [rule.rule_id for rule in rules]
 
-            for code_file in code_files:
-                user_prompt = f"""Generate comprehensive test cases for the following code, ensuring all business rules are validated.
+            # Rule changes invalidate earlier analyses, so they are part of the hash
+            skipped_files = []
+            if incremental:
+                code_files, skipped_files = self.filter_changed_files(code_files, context=rules_context)
+                if not code_files:
+                    self.log_agent_run(
+                        project_id=project_id,
+                        status="success",
+                        result_summary=f"No changed files ({len(skipped_files)} unchanged)"
+                    )
+                    return {
+                        "status": "success",
+                        "suggestions_created": [],
+                        "rule_ids_processed": all_rule_ids,
+                        "files_skipped": len(skipped_files),
+                        "message": "No files or business rules changed since the last test generation"
+                    }
+
+            def build_prompt(code_file):
+                return f"""Generate comprehensive test cases for the following code, ensuring all business rules are validated.
 
 Business Rules:
 {rules_context}
@@ -101,7 +123,7 @@ Language: {code_file.language or 'Unknown'}
 
 Code:
 ```{code_file.language or ''}
-{code_file.content}
+{self.fit_code(code_file, query=rules_context)}
 ```
 
 Please generate:
@@ -137,19 +159,18 @@ Format your response as JSON:
     "explanation": "test suite explanation"
 }}"""
 
-                response = self.generate_with_groq(user_prompt, temperature=0.2)
-
-                # Parse response
-                try:
-                    if "```json" in response:
-                        json_str = response.split("```json")[1].split("```")[0].strip()
-                    elif "```" in response:
-                        json_str = response.split("```")[1].split("```")[0].strip()
-                    else:
-                        json_str = response.strip()
+            # Generate tests for all files concurrently, parsing each response
+            # as it streams so generation stops when the JSON object closes
+            succeeded, failed = self.fan_out_json(
+                code_files, build_prompt, required_keys=TEST_RESPONSE_KEYS, temperature=0.2
+            )
+            if failed and not succeeded:
+                raise failed[0][1]
+            failed_files = self.failed_files(failed)
 
-                    test_data = json.loads(json_str)
-                except (json.JSONDecodeError, KeyError):
+            suggestion_rows = []
+            for code_file, (test_data, response) in succeeded:
+                if not test_data:
                     test_data = {
                         "test_code": response,
                         "test_cases": [],
@@ -157,25 +178,29 @@ Format your response as JSON:
                         "explanation": "Generated unit tests"
                     }
 
-                # Create suggestion
-                suggestion = self.create_suggestion(
-                    project_id=project_id,
-                    content=json.dumps(test_data, indent=2),
-                    code_file_id=code_file.id,
-                    rule_id=all_rule_ids[0] if all_rule_ids else None
-                )
-                suggestions_created.append(suggestion.id)
+                suggestion_rows.append({
+                    "content": json.dumps(test_data, indent=2),
+                    "code_file_id": code_file.id,
+                    "rule_id": all_rule_ids[0] if all_rule_ids else None
+                })
+
+            # Create suggestions
+            suggestions_created = self.create_suggestions(project_id, suggestion_rows)
+            # Failed files stay unmarked so the next run retries them
+            self.mark_files_analyzed([code_file for code_file, _ in succeeded], context=rules_context)
 
             self.log_agent_run(
                 project_id=project_id,
                 status="success",
-                result_summary=f"Generated tests for {len(suggestions_created)} file(s)"
+                result_summary=f"Generated tests for {len(suggestions_created)} file(s), {len(failed_files)} failed"
             )
 
             return {
                 "status": "success",
                 "suggestions_created": suggestions_created,
                 "rule_ids_processed": all_rule_ids,
+                "files_skipped": len(skipped_files),
+                "failed_files": failed_files,
                 "message": f"Generated test cases mapped to {len(all_rule_ids)} business rule(s) for {len(suggestions_created)} file(s)"
             }
 
@@ -0,0 +1,48 @@
+"""Registry mapping agent types to agent classes."""
+from typing import Optional, Type
+from ..tables import AgentType
+from .base_agent import BaseAgent
+# New agents
+from .business_logic_agent import BusinessLogicAgent
+from .product_requirements_agent import ProductRequirementsAgent
+from .api_contract_agent import APIContractAgent
+from .technical_architecture_agent import TechnicalArchitectureAgent
+from .quality_test_agent import QualityTestAgent
+from .change_impact_agent import ChangeImpactAgent
+from .release_readiness_agent import ReleaseReadinessAgent
+# Demo/UI agents
+from .integration_agent import IntegrationAgent
+from .code_template_agent import CodeTemplateAgent
+from .prompt_amplifier_agent import PromptAmplifierAgent
+# Legacy agents (for backward compatibility)
+from .unit_test_agent import UnitTestAgent
+from .api_spec_agent import APISpecAgent
+from .bug_scanner_agent import BugScannerAgent
+from .code_review_agent import CodeReviewAgent
+from .documentation_agent import DocumentationAgent
+
+AGENT_CLASSES = {
+    # New production agents
+    AgentType.BUSINESS_LOGIC_POLICY: BusinessLogicAgent,
+    AgentType.PRODUCT_REQUIREMENTS: ProductRequirementsAgent,
+    AgentType.API_CONTRACT: APIContractAgent,
+    AgentType.TECHNICAL_ARCHITECTURE: TechnicalArchitectureAgent,
+    AgentType.QUALITY_TEST: QualityTestAgent,
+    AgentType.CHANGE_IMPACT: ChangeImpactAgent,
+    AgentType.RELEASE_READINESS: ReleaseReadinessAgent,
+    # Demo/UI agents
+    AgentType.INTEGRATION_AGENT: IntegrationAgent,
+    AgentType.CODE_TEMPLATE_AGENT: CodeTemplateAgent,
+    AgentType.PROMPT_AMPLIFIER_AGENT: PromptAmplifierAgent,
+    # Legacy agents
+    AgentType.UNIT_TEST: UnitTestAgent,
+    AgentType.API_SPEC: APISpecAgent,
+    AgentType.BUG_SCANNER: BugScannerAgent,
+    AgentType.CODE_REVIEW: CodeReviewAgent,
+    AgentType.DOCUMENTATION: DocumentationAgent,
+}
+
+
+def get_agent_class(agent_type: AgentType) -> Optional[Type[BaseAgent]]:
+    """Get the agent class for an agent type, or None if not implemented."""
+    return AGENT_CLASSES.get(agent_type)
@@ -72,10 +72,10 @@ Always ensure:
                 Suggestion.status == "approved"
             ).order_by(Suggestion.created_at.desc()).limit(10).all()
 
-            rules_context = "\n\n".join([
+            rules_context = self.map_reduce_context([
                 f"Rule ID: {rule.rule_id}\nContent: {rule.content}"
                 for rule in rules
-            ]) if rules else "No business rules provided"
+            ], kind="business rules") if rules else "No business rules provided"
 
             release_version = release_version or f"v{project.business_logic_version}"
 
@@ -77,10 +77,12 @@ Always ensure recommendations are:
                 languages = set(cf.language for cf in code_files if cf.language)
                 existing_tech_stack = f"\n\nExisting Tech Stack: {', '.join(languages) if languages else 'Unknown'}"
 
-            rules_context = "\n\n".join([
+            # Large rule sets are summarized shard by shard (map) before the
+            # final prompt below (reduce)
+            rules_context = self.map_reduce_context([
                 f"Rule ID: {rule.rule_id}\nContent: {rule.content}"
                 for rule in rules
-            ]) if rules else "No business rules provided"
+            ], kind="business rules") if rules else "No business rules provided"
 
             user_prompt = f"""Design technical architecture based on the following business rules.
 
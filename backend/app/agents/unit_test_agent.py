@@ -56,17 +56,16 @@ Provide tests in the appropriate testing framework for the language (e.g., pytes
                 if not code_files:
                     return {"error": "No code files found in project", "status": "error"}
 
-            suggestions_created = []
-            for code_file in code_files:
+            def build_prompt(code_file):
                 # Generate unit tests
-                user_prompt = f"""Analyze the following code and generate comprehensive unit tests.
+                return f"""Analyze the following code and generate comprehensive unit tests.
 
 Code File: {code_file.file_path}
 Language: {code_file.language or 'Unknown'}
 
 Code:
 ```{code_file.language or ''}
-{code_file.content}
+{self.fit_code(code_file)}
 ```
 
 Please provide:
@@ -81,8 +80,14 @@ Format your response as JSON with the following structure:
     "explanation": "brief explanation of the test suite"
 }}"""
 
-                response = self.generate_with_groq(user_prompt, temperature=0.2)
-                
+            # Generate tests for all files concurrently
+            succeeded, failed = self.fan_out(code_files, build_prompt, temperature=0.2)
+            if failed and not succeeded:
+                raise failed[0][1]
+            failed_files = self.failed_files(failed)
+
+            suggestion_rows = []
+            for code_file, response in succeeded:
                 # Try to parse as JSON, fallback to text
                 try:
                     if "```json" in response:
@@ -101,22 +106,20 @@ Format your response as JSON with the following structure:
                         "explanation": "Generated unit tests"
                     }, indent=2)
 
-                suggestion = self.create_suggestion(
-                    project_id=project_id,
-                    content=content,
-                    code_file_id=code_file.id
-                )
-                suggestions_created.append(suggestion.id)
+                suggestion_rows.append({"content": content, "code_file_id": code_file.id})
+
+            suggestions_created = self.create_suggestions(project_id, suggestion_rows)
 
             self.log_agent_run(
                 project_id=project_id,
                 status="success",
-                result_summary=f"Generated unit tests for {len(suggestions_created)} file(s)"
+                result_summary=f"Generated unit tests for {len(suggestions_created)} file(s), {len(failed_files)} failed"
             )
 
             return {
                 "status": "success",
                 "suggestions_created": suggestions_created,
+                "failed_files": failed_files,
                 "message": f"Generated unit tests for {len(suggestions_created)} file(s)"
             }
 
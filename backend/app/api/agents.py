@@ -1,28 +1,15 @@
 """Agent API routes."""
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from typing import Optional, Dict, Any, List
 from pydantic import BaseModel
-from ..database import get_db
+from ..database import get_db, run_db
 from ..tables import AgentType
-# New agents
-from ..agents.business_logic_agent import BusinessLogicAgent
-from ..agents.product_requirements_agent import ProductRequirementsAgent
-from ..agents.api_contract_agent import APIContractAgent
-from ..agents.technical_architecture_agent import TechnicalArchitectureAgent
-from ..agents.quality_test_agent import QualityTestAgent
-from ..agents.change_impact_agent import ChangeImpactAgent
-from ..agents.release_readiness_agent import ReleaseReadinessAgent
-# Demo/UI agents
-from ..agents.integration_agent import IntegrationAgent
-from ..agents.code_template_agent import CodeTemplateAgent
-from ..agents.prompt_amplifier_agent import PromptAmplifierAgent
-# Legacy agents (for backward compatibility)
-from ..agents.unit_test_agent import UnitTestAgent
-from ..agents.api_spec_agent import APISpecAgent
-from ..agents.bug_scanner_agent import BugScannerAgent
-from ..agents.code_review_agent import CodeReviewAgent
-from ..agents.documentation_agent import DocumentationAgent
+from ..services.llm_cache import get_llm_cache
+from ..services.groq_service import coalesce_stats
+from ..services.job_queue import job_queue
+from ..agents.registry import get_agent_class
 
 router = APIRouter(prefix="/api/agents", tags=["agents"])
 
@@ -47,6 +34,8 @@ class AnalyzeRequest(BaseModel):
     context: Optional[str] = None
     agent_config: Optional[Dict[str, Any]] = None
     enhancement_rules: Optional[List[Dict[str, Any]]] = None
+    # Skip files unchanged since the agent's last analysis (agents that support it)
+    incremental: bool = False
     additional_params: Optional[Dict[str, Any]] = {}
 
 
@@ -57,66 +46,75 @@ def get_agent(agent_type: str, db: Session):
     except ValueError:
         raise HTTPException(status_code=400, detail=f"Invalid agent type: {agent_type}")
 
-    agent_map = {
-        # New production agents
-        AgentType.BUSINESS_LOGIC_POLICY: BusinessLogicAgent,
-        AgentType.PRODUCT_REQUIREMENTS: ProductRequirementsAgent,
-        AgentType.API_CONTRACT: APIContractAgent,
-        AgentType.TECHNICAL_ARCHITECTURE: TechnicalArchitectureAgent,
-        AgentType.QUALITY_TEST: QualityTestAgent,
-        AgentType.CHANGE_IMPACT: ChangeImpactAgent,
-        AgentType.RELEASE_READINESS: ReleaseReadinessAgent,
-        # Demo/UI agents
-        AgentType.INTEGRATION_AGENT: IntegrationAgent,
-        AgentType.CODE_TEMPLATE_AGENT: CodeTemplateAgent,
-        AgentType.PROMPT_AMPLIFIER_AGENT: PromptAmplifierAgent,
-        # Legacy agents
-        AgentType.UNIT_TEST: UnitTestAgent,
-        AgentType.API_SPEC: APISpecAgent,
-        AgentType.BUG_SCANNER: BugScannerAgent,
-        AgentType.CODE_REVIEW: CodeReviewAgent,
-        AgentType.DOCUMENTATION: DocumentationAgent,
-    }
-
-    agent_class = agent_map.get(agent_enum)
+    agent_class = get_agent_class(agent_enum)
     if not agent_class:
         raise HTTPException(status_code=400, detail=f"Agent type {agent_type} not implemented")
 
     return agent_class(db)
 
 
+def build_analyze_kwargs(request: AnalyzeRequest) -> Dict[str, Any]:
+    """Build analyze() keyword arguments from the request body."""
+    return {
+        "project_id": request.project_id,
+        "code_file_id": request.code_file_id,
+        "issue_id": request.issue_id,
+        "rule_ids": request.rule_ids,
+        "business_logic_text": request.business_logic_text,
+        "change_type": request.change_type,
+        "release_version": request.release_version,
+        # Integration Agent params
+        "service_name": request.service_name,
+        "base_url": request.base_url,
+        "description": request.description,
+        # Code Template Agent params
+        "template_type": request.template_type,
+        "technologies": request.technologies,
+        # Prompt Amplifier Agent params
+        "original_prompt": request.original_prompt,
+        "context": request.context,
+        "agent_config": request.agent_config,
+        "enhancement_rules": request.enhancement_rules,
+        "incremental": request.incremental,
+        **(request.additional_params or {})
+    }
+
+
 @router.post("/{agent_type}/analyze")
 async def analyze(
     agent_type: str,
     request: AnalyzeRequest,
+    background: bool = False,
     db: Session = Depends(get_db)
 ):
-    """Run agent analysis."""
+    """
+    Run agent analysis.
+
+    With ?background=true the run is queued and a job id is returned
+    immediately; poll GET /api/jobs/{job_id} for status, progress and result.
+    """
+    agent = get_agent(agent_type, db)
+    kwargs = build_analyze_kwargs(request)
+
+    if background:
+        def enqueue(session: Session) -> Dict[str, Any]:
+            job = job_queue.enqueue(session, agent.agent_type, request.project_id, kwargs)
+            return {
+                "job_id": job.id,
+                "status": job.status,
+                "poll_url": f"/api/jobs/{job.id}"
+            }
+
+        try:
+            # Don't block the event loop on the insert
+            return await run_db(enqueue)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+
     try:
-        agent = get_agent(agent_type, db)
-        result = agent.analyze(
-            project_id=request.project_id,
-            code_file_id=request.code_file_id,
-            issue_id=request.issue_id,
-            rule_ids=request.rule_ids,
-            business_logic_text=request.business_logic_text,
-            change_type=request.change_type,
-            release_version=request.release_version,
-            # Integration Agent params
-            service_name=request.service_name,
-            base_url=request.base_url,
-            description=request.description,
-            # Code Template Agent params
-            template_type=request.template_type,
-            technologies=request.technologies,
-            # Prompt Amplifier Agent params
-            original_prompt=request.original_prompt,
-            context=request.context,
-            agent_config=request.agent_config,
-            enhancement_rules=request.enhancement_rules,
-            **request.additional_params
-        )
-        return result
+        # Agents are synchronous; run them off the event loop so LLM waits
+        # don't stall other requests on this worker
+        return await run_in_threadpool(agent.run, **kwargs)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -133,3 +131,22 @@ def get_agent_types():
             for agent_type in AgentType
         ]
     }
+
+
+@router.get("/cache/stats")
+def get_llm_cache_stats():
+    """Get LLM response cache hit/miss counters and in-flight request coalescing counters."""
+    cache = get_llm_cache()
+    if not cache:
+        return {"enabled": False, "coalescing": coalesce_stats()}
+    return {"enabled": True, **cache.stats(), "coalescing": coalesce_stats()}
+
+
+@router.delete("/cache")
+def clear_llm_cache():
+    """Clear all cached LLM responses."""
+    cache = get_llm_cache()
+    if not cache:
+        return {"enabled": False, "cleared": False}
+    cache.clear()
+    return {"enabled": True, "cleared": True}
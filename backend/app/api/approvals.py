@@ -5,7 +5,7 @@ from typing import Optional
 from datetime import datetime
 from pydantic import BaseModel, model_validator
 from ..database import get_db
-from ..tables import Approval, Suggestion, SuggestionStatus, ApprovalRepository
+from ..tables import Approval, Suggestion, SuggestionStatus, ApprovalRepository, SuggestionRepository, DashboardMetricRepository
 
 router = APIRouter(prefix="/api/approvals", tags=["approvals"])
 
@@ -43,6 +43,7 @@ def approve_suggestion(
     if not suggestion:
         raise HTTPException(status_code=404, detail="Suggestion not found")
 
+    old_status = suggestion.status
     if request.user_action == "approve":
         suggestion.status = SuggestionStatus.APPROVED
     elif request.user_action == "reject":
@@ -53,6 +54,8 @@ def approve_suggestion(
     else:
         raise HTTPException(status_code=400, detail="Invalid action. Use 'approve', 'reject', or 'modify'")
 
+    DashboardMetricRepository(db).record_suggestion_status_change(suggestion, old_status)
+
     # Create approval record
     approval = Approval(
         suggestion_id=suggestion_id,
@@ -76,13 +79,12 @@ def approve_suggestion(
 @router.get("/suggestions/{suggestion_id}/history", response_model=list[ApprovalResponse])
 def get_approval_history(suggestion_id: int, db: Session = Depends(get_db)):
     """Get approval history for a suggestion."""
-    suggestion = db.query(Suggestion).filter(Suggestion.id == suggestion_id).first()
+    suggestion = SuggestionRepository(db).get_with_approvals(suggestion_id)
     if not suggestion:
         raise HTTPException(status_code=404, detail="Suggestion not found")
 
-    approvals = db.query(Approval).filter(Approval.suggestion_id == suggestion_id).all()
     result = []
-    for approval in approvals:
+    for approval in suggestion.approvals:
         approval_dict = {
             "id": approval.id,
             "suggestion_id": approval.suggestion_id,
@@ -92,6 +92,7 @@ def create_business_rule(
         created_by=rule.created_by
     )
     db.add(business_rule)
+    RuleService.index_rule(db, business_rule)
     db.commit()
     db.refresh(business_rule)
 
@@ -203,6 +204,8 @@ def update_business_rule(
         # Only set to pending_approval if content was updated
         if rule_update.content:
             rule.status = RuleStatus.PENDING_APPROVAL
+    if rule_update.content:
+        RuleService.index_rule(db, rule)
     db.commit()
     db.refresh(rule)
 
@@ -1,11 +1,13 @@
 """Change Impact API routes."""
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from datetime import datetime
 from pydantic import BaseModel, model_validator
 from ..database import get_db
 from ..tables import ChangeImpact, ChangeType, RiskLevel, ChangeImpactRepository
+from ..utils.pagination import paginate, set_next_cursor
 
 router = APIRouter(prefix="/api/change-impact", tags=["change-impact"])
 
@@ -47,7 +49,8 @@ async def analyze_change_impact(
     
     try:
         agent = ChangeImpactAgent(db)
-        result = agent.analyze(
+        result = await run_in_threadpool(
+            agent.run,
             project_id=request.project_id,
             change_type=request.change_type,
             rule_ids=request.rule_ids or []
@@ -58,11 +61,19 @@ async def analyze_change_impact(
 
 
 @router.get("/projects/{project_id}/impacts", response_model=List[ChangeImpactResponse])
-def list_change_impacts(project_id: int, db: Session = Depends(get_db)):
-    """List all change impacts for a project."""
-    impacts = db.query(ChangeImpact).filter(
-        ChangeImpact.project_id == project_id
-    ).order_by(ChangeImpact.created_at.desc()).all()
+def list_change_impacts(
+    project_id: int,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None,
+    db: Session = Depends(get_db)
+):
+    """List change impacts for a project, newest first (paged with ?limit=/?cursor=; next cursor in the X-Next-Cursor header)."""
+    impacts, next_cursor = paginate(
+        db.query(ChangeImpact).filter(ChangeImpact.project_id == project_id),
+        ChangeImpact, cursor, limit
+    )
+    set_next_cursor(response, next_cursor)
     
     result = []
     for impact in impacts:
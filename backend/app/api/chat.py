@@ -1,7 +1,9 @@
 """Chat API routes for global chat interface."""
+import json
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import Optional, List, Any
+from typing import Optional, List, Any, AsyncIterator
 from ..services.groq_service import GroqService
 from ..utils.json_extractor import extract_json_from_text
 
@@ -65,23 +67,7 @@ def _normalize_mock_payload(raw: dict) -> Optional[dict]:
     }
 
 
-@router.post("/message", response_model=ChatResponse)
-async def chat_message(request: ChatRequest):
-    """
-    Process a chat message and return AI response.
-    
-    Args:
-        request: Chat request with message and optional agent_id
-        
-    Returns:
-        Chat response with content and agent name
-    """
-    try:
-        groq_service = GroqService()
-
-        # Service Virtualization: structured mock API payload from AI
-        if request.agent_id == "service-virtualization":
-            sv_system = """You are a Service Virtualization assistant. Given the user's request, output a mock API design as a single JSON object only (no markdown, no code fences). Use exactly this structure:
+SERVICE_VIRTUALIZATION_SYSTEM_PROMPT = """You are a Service Virtualization assistant. Given the user's request, output a mock API design as a single JSON object only (no markdown, no code fences). Use exactly this structure:
 {
   "serviceName": "short name for the mock service",
   "serverUrl": "https://mock.axisbank.com/api/v1",
@@ -90,29 +76,8 @@ async def chat_message(request: ChatRequest):
   ]
 }
 Rules: The base domain for serverUrl MUST be mock.axisbank.com (e.g. https://mock.axisbank.com/api/v1 or https://mock.axisbank.com/v1/...). serviceName and serverUrl are strings; endpoints is an array of objects with method (GET/POST/PUT/PATCH/DELETE), path (must start with /), and description. Infer resources from the user message (e.g. users, payments, orders). Return only the JSON object."""
-            sv_prompt = request.message.strip() or "Create a mock API with a few sample endpoints."
-            sv_response = groq_service.generate(
-                system_prompt=sv_system,
-                user_prompt=sv_prompt,
-                temperature=0.3,
-                max_tokens=800,
-            )
-            raw = extract_json_from_text(sv_response, fallback_to_text=False)
-            mock_payload = _normalize_mock_payload(raw) if isinstance(raw, dict) else None
-            if not mock_payload:
-                mock_payload = _normalize_mock_payload({
-                    "serviceName": "Mock API",
-                    "serverUrl": "https://mock.axisbank.com/api/v1",
-                    "endpoints": [{"method": "GET", "path": "/data", "description": "Default endpoint"}],
-                })
-            return ChatResponse(
-                content=f"Mock API {mock_payload['serviceName']} is ready. Use the endpoints below.",
-                agent="Service Virtualization Agent",
-                mock_payload=mock_payload,
-            )
-        
-        # Build system prompt based on context
-        system_prompt = """You are a helpful AI assistant for Axis Bank's development team.
+
+CHAT_SYSTEM_PROMPT = """You are a helpful AI assistant for Axis Bank's development team.
 You have access to:
 - Centralized code repository across all microservices
 - Jira MCP for project management and tickets
@@ -126,59 +91,100 @@ Provide helpful, accurate, and concise responses. When asked about:
 - Architecture: Explain system design and patterns
 
 Keep responses professional and technical, suitable for enterprise software development."""
+
+AGENT_CONTEXT = {
+    'code-generation': 'Code Generation Agent - specializes in generating microservice boilerplate and business logic',
+    'security-guardian': 'Security Guardian Agent - focuses on security compliance, OWASP standards, and vulnerability scanning',
+    'integration': 'Integration Agent - handles API contracts, SDKs, and frontend integration code',
+    'knowledge': 'Knowledge Agent - provides institutional memory, indexes microservices and patterns',
+    'code-template': 'Code Template Agent - offers production-ready service templates and code patterns',
+    'prompt-amplifier': 'Prompt Amplifier Agent - enhances developer prompts with best practices',
+    'test-data-ui': 'Test Data UI Agent - generates UIs for test data creation',
+    'test-case-generator': 'Test Case Generator Agent - creates comprehensive test cases',
+    'load-testing': 'Load Testing Agent - handles performance validation and load scenarios',
+    'devops': 'DevOps Agent - manages CI/CD pipelines and automated operations',
+    'documentation': 'Documentation Agent - generates comprehensive documentation'
+}
+
+AGENT_NAMES = {
+    'code-generation': 'Code Generation Agent',
+    'security-guardian': 'Security Guardian Agent',
+    'integration': 'Integration Agent',
+    'knowledge': 'Knowledge Agent',
+    'code-template': 'Code Template Agent',
+    'prompt-amplifier': 'Prompt Amplifier Agent',
+    'test-data-ui': 'Test Data UI Agent',
+    'test-case-generator': 'Test Case Generator Agent',
+    'load-testing': 'Load Testing Agent',
+    'devops': 'DevOps Agent',
+    'documentation': 'Documentation Agent',
+    'service-virtualization': 'Service Virtualization Agent',
+}
+
+
+def _build_chat_prompt(request: ChatRequest) -> str:
+    """Enhance the user prompt with context about the selected agent."""
+    user_prompt = request.message
+    if request.agent_id:
+        agent_info = AGENT_CONTEXT.get(request.agent_id, '')
+        if agent_info:
+            user_prompt = f"Using {agent_info}:\n\n{user_prompt}"
+    return user_prompt
+
+
+def _build_service_virtualization_response(sv_response: str) -> ChatResponse:
+    """Turn the raw Service Virtualization completion into a validated response."""
+    raw = extract_json_from_text(sv_response, fallback_to_text=False)
+    mock_payload = _normalize_mock_payload(raw) if isinstance(raw, dict) else None
+    if not mock_payload:
+        mock_payload = _normalize_mock_payload({
+            "serviceName": "Mock API",
+            "serverUrl": "https://mock.axisbank.com/api/v1",
+            "endpoints": [{"method": "GET", "path": "/data", "description": "Default endpoint"}],
+        })
+    return ChatResponse(
+        content=f"Mock API {mock_payload['serviceName']} is ready. Use the endpoints below.",
+        agent="Service Virtualization Agent",
+        mock_payload=mock_payload,
+    )
+
+
+@router.post("/message", response_model=ChatResponse)
+async def chat_message(request: ChatRequest):
+    """
+    Process a chat message and return AI response.
+    
+    Args:
+        request: Chat request with message and optional agent_id
         
-        # Enhance user prompt with context about selected agent
-        user_prompt = request.message
-        
-        if request.agent_id:
-            agent_context = {
-                'code-generation': 'Code Generation Agent - specializes in generating microservice boilerplate and business logic',
-                'security-guardian': 'Security Guardian Agent - focuses on security compliance, OWASP standards, and vulnerability scanning',
-                'integration': 'Integration Agent - handles API contracts, SDKs, and frontend integration code',
-                'knowledge': 'Knowledge Agent - provides institutional memory, indexes microservices and patterns',
-                'code-template': 'Code Template Agent - offers production-ready service templates and code patterns',
-                'prompt-amplifier': 'Prompt Amplifier Agent - enhances developer prompts with best practices',
-                'test-data-ui': 'Test Data UI Agent - generates UIs for test data creation',
-                'test-case-generator': 'Test Case Generator Agent - creates comprehensive test cases',
-                'load-testing': 'Load Testing Agent - handles performance validation and load scenarios',
-                'devops': 'DevOps Agent - manages CI/CD pipelines and automated operations',
-                'documentation': 'Documentation Agent - generates comprehensive documentation'
-            }
-            
-            agent_info = agent_context.get(request.agent_id, '')
-            if agent_info:
-                user_prompt = f"Using {agent_info}:\n\n{user_prompt}"
-        
+    Returns:
+        Chat response with content and agent name
+    """
+    try:
+        groq_service = GroqService()
+
+        # Service Virtualization: structured mock API payload from AI
+        if request.agent_id == "service-virtualization":
+            sv_prompt = request.message.strip() or "Create a mock API with a few sample endpoints."
+            sv_response = await groq_service.agenerate(
+                system_prompt=SERVICE_VIRTUALIZATION_SYSTEM_PROMPT,
+                user_prompt=sv_prompt,
+                temperature=0.3,
+                max_tokens=800,
+            )
+            return _build_service_virtualization_response(sv_response)
+
         # Generate AI response
-        response_text = groq_service.generate(
-            system_prompt=system_prompt,
-            user_prompt=user_prompt,
+        response_text = await groq_service.agenerate(
+            system_prompt=CHAT_SYSTEM_PROMPT,
+            user_prompt=_build_chat_prompt(request),
             temperature=0.7,  # Slightly higher for more natural conversation
             max_tokens=1000
         )
-        
-        # Determine agent name for response
-        agent_name = None
-        if request.agent_id:
-            agent_names = {
-                'code-generation': 'Code Generation Agent',
-                'security-guardian': 'Security Guardian Agent',
-                'integration': 'Integration Agent',
-                'knowledge': 'Knowledge Agent',
-                'code-template': 'Code Template Agent',
-                'prompt-amplifier': 'Prompt Amplifier Agent',
-                'test-data-ui': 'Test Data UI Agent',
-                'test-case-generator': 'Test Case Generator Agent',
-                'load-testing': 'Load Testing Agent',
-                'devops': 'DevOps Agent',
-                'documentation': 'Documentation Agent',
-                'service-virtualization': 'Service Virtualization Agent',
-            }
-            agent_name = agent_names.get(request.agent_id)
-        
+
         return ChatResponse(
             content=response_text,
-            agent=agent_name
+            agent=AGENT_NAMES.get(request.agent_id) if request.agent_id else None
         )
         
     except ValueError as e:
@@ -192,3 +198,84 @@ Keep responses professional and technical, suitable for enterprise software deve
             status_code=500,
             detail=f"Error processing chat message: {str(e)}"
         )
+
+
+def _sse_event(event: str, data: dict) -> str:
+    """Format a server-sent event."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def _stream_chat_events(groq_service: GroqService, request: ChatRequest) -> AsyncIterator[str]:
+    """Yield SSE events for a chat message: start, token*, done (or error)."""
+    agent_name = AGENT_NAMES.get(request.agent_id) if request.agent_id else None
+    yield _sse_event("start", {"agent": agent_name})
+
+    try:
+        # Service Virtualization: the completion is raw JSON, so it is collected
+        # and the validated mock_payload is sent as the final event
+        if request.agent_id == "service-virtualization":
+            sv_prompt = request.message.strip() or "Create a mock API with a few sample endpoints."
+            chunks = []
+            async for delta in groq_service.astream(
+                system_prompt=SERVICE_VIRTUALIZATION_SYSTEM_PROMPT,
+                user_prompt=sv_prompt,
+                temperature=0.3,
+                max_tokens=800,
+            ):
+                chunks.append(delta)
+            response = _build_service_virtualization_response("".join(chunks))
+            yield _sse_event("done", response.model_dump())
+            return
+
+        chunks = []
+        async for delta in groq_service.astream(
+            system_prompt=CHAT_SYSTEM_PROMPT,
+            user_prompt=_build_chat_prompt(request),
+            temperature=0.7,  # Slightly higher for more natural conversation
+            max_tokens=1000
+        ):
+            chunks.append(delta)
+            yield _sse_event("token", {"content": delta})
+
+        response = ChatResponse(content="".join(chunks), agent=agent_name)
+        yield _sse_event("done", response.model_dump())
+
+    except Exception as e:
+        yield _sse_event("error", {"detail": f"Error processing chat message: {str(e)}"})
+
+
+@router.post("/message/stream")
+async def chat_message_stream(request: ChatRequest):
+    """
+    Process a chat message and stream the AI response as server-sent events.
+
+    Events:
+        start: {"agent": ...} sent immediately
+        token: {"content": ...} for each generated text delta
+        done: full ChatResponse (includes mock_payload for service-virtualization)
+        error: {"detail": ...} if generation fails mid-stream
+
+    Args:
+        request: Chat request with message and optional agent_id
+
+    Returns:
+        text/event-stream response
+    """
+    try:
+        groq_service = GroqService()
+    except ValueError:
+        # Handle missing API key gracefully
+        raise HTTPException(
+            status_code=503,
+            detail="AI service is not configured. Please set GROQ_API_KEY environment variable."
+        )
+
+    return StreamingResponse(
+        _stream_chat_events(groq_service, request),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            # Stop reverse proxies (nginx) from buffering the stream
+            "X-Accel-Buffering": "no"
+        }
+    )
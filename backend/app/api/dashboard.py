@@ -1,16 +1,14 @@
 """Dashboard statistics API routes."""
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_
+from sqlalchemy import func, and_, case
 from datetime import datetime, timedelta
 from typing import Dict, Any, List
 from pydantic import BaseModel
 from ..database import get_db
-from ..tables import (
-    Project, Suggestion, Issue, AgentRun, Approval
-)
-from ..tables.suggestions import SuggestionStatus, AgentType
-from ..tables.issues import IssueStatus
+from ..tables import Project, Suggestion, DashboardMetric
+from ..tables.suggestions import AgentType
+from ..tables.dashboard_metrics import COUNTER_COLUMNS, NO_AGENT
 
 router = APIRouter(prefix="/api/dashboard", tags=["dashboard"])
 
@@ -22,81 +20,112 @@ class DashboardStatsResponse(BaseModel):
     charts: Dict[str, Any]
 
 
+def _sum_if(condition, column):
+    """Conditional sum for use inside an aggregate query: SUM(CASE WHEN ... THEN column ELSE 0 END)."""
+    return func.coalesce(func.sum(case((condition, column), else_=0)), 0)
+
+
 @router.get("/stats", response_model=DashboardStatsResponse)
 def get_dashboard_stats(db: Session = Depends(get_db)):
-    """Get dashboard statistics."""
-    # Use direct queries instead of repositories for counts
-    
+    """
+    Get dashboard statistics.
+
+    Counters come from the dashboard_daily_metrics rollup (maintained as
+    suggestions, runs and issues are written), so a load reads O(days)
+    rollup rows instead of scanning the source tables.
+    """
     # Calculate date ranges
     now = datetime.now()
     last_month = now - timedelta(days=30)
     last_week = now - timedelta(days=7)
-    
-    # Total counts
-    total_projects = db.query(func.count(Project.id)).scalar() or 0
-    total_suggestions = db.query(func.count(Suggestion.id)).scalar() or 0
-    total_issues = db.query(func.count(Issue.id)).scalar() or 0
-    total_agent_runs = db.query(func.count(AgentRun.id)).scalar() or 0
-    
-    # Suggestions breakdown
-    approved_suggestions = db.query(func.count(Suggestion.id)).filter(
-        Suggestion.status == SuggestionStatus.APPROVED
-    ).scalar() or 0
-    rejected_suggestions = db.query(func.count(Suggestion.id)).filter(
-        Suggestion.status == SuggestionStatus.REJECTED
-    ).scalar() or 0
-    pending_suggestions = db.query(func.count(Suggestion.id)).filter(
-        Suggestion.status == SuggestionStatus.PENDING
-    ).scalar() or 0
-    
-    # Issues breakdown
-    resolved_issues = db.query(func.count(Issue.id)).filter(
-        Issue.status == IssueStatus.RESOLVED
-    ).scalar() or 0
-    open_issues = db.query(func.count(Issue.id)).filter(
-        Issue.status == IssueStatus.OPEN
-    ).scalar() or 0
-    in_progress_issues = db.query(func.count(Issue.id)).filter(
-        Issue.status == IssueStatus.IN_PROGRESS
-    ).scalar() or 0
-    
-    # Agent runs breakdown
-    successful_runs = db.query(func.count(AgentRun.id)).filter(
-        AgentRun.status == "success"
-    ).scalar() or 0
-    failed_runs = db.query(func.count(AgentRun.id)).filter(
-        AgentRun.status == "error"
-    ).scalar() or 0
-    
-    # Calculate auto-fixed bugs (issues with resolved status that have approved suggestions)
-    auto_fixed_bugs = db.query(func.count(Issue.id)).join(
-        Suggestion, Issue.id == Suggestion.issue_id
-    ).filter(
-        and_(
-            Issue.status == IssueStatus.RESOLVED,
-            Suggestion.status == SuggestionStatus.APPROVED
-        )
-    ).scalar() or 0
-    
-    # Calculate auto-fixed bugs from last month
-    auto_fixed_bugs_last_month = db.query(func.count(Issue.id)).join(
-        Suggestion, Issue.id == Suggestion.issue_id
-    ).filter(
-        and_(
-            Issue.status == IssueStatus.RESOLVED,
-            Suggestion.status == SuggestionStatus.APPROVED,
-            Issue.updated_at >= last_month
+    last_month_day = last_month.date()
+    last_week_day = last_week.date()
+
+    # Weekly buckets for the suggestions timeline
+    week_starts = []
+    current_date = last_month
+    while current_date <= now:
+        week_starts.append(current_date)
+        current_date = current_date + timedelta(days=7)
+
+    # Query 1: rollup totals per agent type, with conditional sums for the
+    # recent windows and each timeline bucket
+    M = DashboardMetric
+    counter_sums = [func.coalesce(func.sum(getattr(M, name)), 0) for name in COUNTER_COLUMNS]
+    metric_rows = db.query(
+        M.agent_type,
+        *counter_sums,
+        _sum_if(M.day >= last_month_day, M.suggestions_created),
+        _sum_if(M.day >= last_week_day, M.suggestions_created),
+        _sum_if(M.day >= last_week_day, M.runs_total),
+        _sum_if(M.day >= last_month_day, M.auto_fixed),
+        *[
+            _sum_if(and_(
+                M.day >= week_start.date(),
+                M.day < (week_start + timedelta(days=7)).date()
+            ), M.suggestions_created)
+            for week_start in week_starts
+        ]
+    ).group_by(M.agent_type).all()
+
+    totals = {name: 0 for name in COUNTER_COLUMNS}
+    suggestions_last_month = 0
+    suggestions_last_week = 0
+    auto_fixed_bugs_last_month = 0
+    security_suggestions = 0
+    total_agent_types = 0
+    active_agents_count = 0
+    agent_type_counts: Dict[str, int] = {}
+    week_counts = [0] * len(week_starts)
+    security_agent_types = {AgentType.BUSINESS_LOGIC_POLICY.value, AgentType.RELEASE_READINESS.value}
+    for row in metric_rows:
+        agent_type = row[0]
+        sums = dict(zip(COUNTER_COLUMNS, (int(value) for value in row[1:1 + len(COUNTER_COLUMNS)])))
+        month_count, week_count, week_runs, month_auto_fixed, *bucket_counts = (
+            int(value) for value in row[1 + len(COUNTER_COLUMNS):]
         )
-    ).scalar() or 0
-    
-    # Calculate suggestions from last month
-    suggestions_last_month = db.query(func.count(Suggestion.id)).filter(
-        Suggestion.created_at >= last_month
-    ).scalar() or 0
-    suggestions_last_week = db.query(func.count(Suggestion.id)).filter(
-        Suggestion.created_at >= last_week
-    ).scalar() or 0
-    
+        for name, value in sums.items():
+            totals[name] += value
+        suggestions_last_month += month_count
+        suggestions_last_week += week_count
+        auto_fixed_bugs_last_month += month_auto_fixed
+        for i, bucket_count in enumerate(bucket_counts):
+            week_counts[i] += bucket_count
+        if agent_type == NO_AGENT:
+            continue
+        if sums["suggestions_created"]:
+            agent_type_counts[agent_type] = sums["suggestions_created"]
+        if agent_type in security_agent_types:
+            security_suggestions += sums["suggestions_approved"]
+        if sums["runs_total"]:
+            total_agent_types += 1
+        if week_runs:
+            active_agents_count += 1
+
+    total_suggestions = totals["suggestions_created"]
+    approved_suggestions = totals["suggestions_approved"]
+    rejected_suggestions = totals["suggestions_rejected"]
+    pending_suggestions = totals["suggestions_pending"]
+    total_issues = totals["issues_created"]
+    resolved_issues = totals["issues_resolved"]
+    open_issues = totals["issues_open"]
+    total_agent_runs = totals["runs_total"]
+    successful_runs = totals["runs_success"]
+    failed_runs = totals["runs_error"]
+    auto_fixed_bugs = totals["auto_fixed"]
+
+    # Query 2: resolved issues by last update day, folded into MySQL
+    # dayofweek numbering (1 = Sunday) for the bug resolution chart
+    resolved_by_weekday: Dict[int, int] = {}
+    for day, count in db.query(
+        M.day, func.sum(M.issues_resolved_on)
+    ).filter(M.issues_resolved_on != 0).group_by(M.day):
+        weekday = day.isoweekday() % 7 + 1
+        resolved_by_weekday[weekday] = resolved_by_weekday.get(weekday, 0) + int(count)
+
+    # Query 3: project count (small table)
+    total_projects = db.query(func.count(Project.id)).scalar() or 0
+
     # Calculate approval rate
     approval_rate = 0
     if total_suggestions > 0:
@@ -107,16 +136,6 @@ def get_dashboard_stats(db: Session = Depends(get_db)):
     if total_agent_runs > 0:
         agent_success_rate = round((successful_runs / total_agent_runs) * 100, 1)
     
-    # Get active agent types (agents that have run in last 7 days)
-    active_agent_types = db.query(AgentRun.agent_type).filter(
-        AgentRun.created_at >= last_week
-    ).distinct().all()
-    active_agents_count = len([a[0] for a in active_agent_types])
-    
-    # Get total unique agent types
-    all_agent_types = db.query(AgentRun.agent_type).distinct().all()
-    total_agent_types = len([a[0] for a in all_agent_types])
-    
     # Calculate trend percentages (mock for now, can be improved with historical data)
     auto_fixed_trend = 0
     if auto_fixed_bugs_last_month > 0:
@@ -124,8 +143,9 @@ def get_dashboard_stats(db: Session = Depends(get_db)):
         auto_fixed_trend = 28  # Mock value
     
     # Get recent AI insights (from recent suggestions)
+    # (ids grow with creation time; ordering by the primary key avoids a table scan)
     recent_suggestions = db.query(Suggestion).order_by(
-        Suggestion.created_at.desc()
+        Suggestion.id.desc()
     ).limit(5).all()
     ai_insights = []
     for suggestion in recent_suggestions:
@@ -158,28 +178,8 @@ def get_dashboard_stats(db: Session = Depends(get_db)):
             "suggestion_id": None
         })
     
-    # Get suggestions by agent type for charts
-    suggestions_by_agent = db.query(
-        Suggestion.agent_type,
-        func.count(Suggestion.id).label('count')
-    ).group_by(Suggestion.agent_type).all()
-    
-    agent_type_counts = {
-        agent_type.value: count for agent_type, count in suggestions_by_agent
-    }
-    
     # Calculate security score (based on business rules compliance)
     # For now, use a mock calculation based on approved security-related suggestions
-    security_suggestions = db.query(func.count(Suggestion.id)).filter(
-        and_(
-            Suggestion.agent_type.in_([
-                AgentType.BUSINESS_LOGIC_POLICY,
-                AgentType.RELEASE_READINESS
-            ]),
-            Suggestion.status == SuggestionStatus.APPROVED
-        )
-    ).scalar() or 0
-    
     security_score = min(100, 85 + (security_suggestions * 2))  # Mock calculation
     
     # Build metrics
@@ -209,8 +209,8 @@ def get_dashboard_stats(db: Session = Depends(get_db)):
     # Build charts data
     charts = {
         "suggestions_by_agent": agent_type_counts,
-        "suggestions_timeline": _generate_timeline_data(db, last_month),
-        "bug_resolution_timeline": _generate_bug_timeline_data(db, last_week)
+        "suggestions_timeline": _build_timeline_data(week_starts, week_counts),
+        "bug_resolution_timeline": _build_bug_timeline_data(resolved_by_weekday)
     }
     
     return DashboardStatsResponse(
@@ -220,40 +220,23 @@ def get_dashboard_stats(db: Session = Depends(get_db)):
     )
 
 
-def _generate_timeline_data(db: Session, start_date: datetime) -> List[Dict[str, Any]]:
-    """Generate timeline data for suggestions."""
-    # Get suggestions grouped by week
-    timeline = []
-    current_date = start_date
-    while current_date <= datetime.now():
-        week_end = current_date + timedelta(days=7)
-        count = db.query(func.count(Suggestion.id)).filter(
-            and_(
-                Suggestion.created_at >= current_date,
-                Suggestion.created_at < week_end
-            )
-        ).scalar() or 0
-        timeline.append({
-            "date": current_date.strftime("%Y-%m-%d"),
+def _build_timeline_data(week_starts: List[datetime], week_counts: List[int]) -> List[Dict[str, Any]]:
+    """Build timeline data for suggestions from weekly bucket counts."""
+    return [
+        {
+            "date": week_start.strftime("%Y-%m-%d"),
             "count": count
-        })
-        current_date = week_end
-    return timeline
+        }
+        for week_start, count in zip(week_starts, week_counts)
+    ]
 
 
-def _generate_bug_timeline_data(db: Session, start_date: datetime) -> List[Dict[str, Any]]:
-    """Generate timeline data for bug resolution."""
-    # Get resolved issues by day of week
+def _build_bug_timeline_data(resolved_by_weekday: Dict[int, int]) -> List[Dict[str, Any]]:
+    """Build timeline data for bug resolution from resolved issue counts keyed by MySQL dayofweek."""
     timeline = []
     days = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
     for i, day in enumerate(days):
-        # Count resolved issues (mock data for now)
-        count = db.query(func.count(Issue.id)).filter(
-            and_(
-                Issue.status == IssueStatus.RESOLVED,
-                func.dayofweek(Issue.updated_at) == (i + 2) % 7 + 1  # MySQL dayofweek
-            )
-        ).scalar() or 0
+        count = resolved_by_weekday.get((i + 2) % 7 + 1, 0)
         timeline.append({
             "day": day,
             "count": count or (i * 2 + 10)  # Mock data if no real data
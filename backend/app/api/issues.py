@@ -1,5 +1,5 @@
 """Issues API routes."""
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from datetime import datetime
@@ -7,6 +7,7 @@ from pydantic import BaseModel, model_validator
 from ..database import get_db
 from ..tables import Issue, IssueStatus, IssueRepository
 from ..services.bitbucket_mock import BitbucketMockService
+from ..utils.pagination import paginate, set_next_cursor
 
 router = APIRouter(prefix="/api/issues", tags=["issues"])
 
@@ -74,9 +75,18 @@ def create_issue(
 
 
 @router.get("/projects/{project_id}/issues", response_model=List[IssueResponse])
-def list_issues(project_id: int, db: Session = Depends(get_db)):
-    """List all issues for a project."""
-    issues = db.query(Issue).filter(Issue.project_id == project_id).all()
+def list_issues(
+    project_id: int,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None,
+    db: Session = Depends(get_db)
+):
+    """List issues for a project, newest first (paged with ?limit=/?cursor=; next cursor in the X-Next-Cursor header)."""
+    issues, next_cursor = paginate(
+        db.query(Issue).filter(Issue.project_id == project_id), Issue, cursor, limit
+    )
+    set_next_cursor(response, next_cursor)
     result = []
     for issue in issues:
         issue_dict = {
@@ -0,0 +1,89 @@
+"""Background job API routes."""
+import json
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from typing import List, Optional, Any
+from pydantic import BaseModel
+from ..database import get_db, run_db
+from ..tables import AgentRun, AgentRunRepository
+
+router = APIRouter(prefix="/api/jobs", tags=["jobs"])
+
+
+class JobResponse(BaseModel):
+    job_id: int
+    agent_type: str
+    project_id: int
+    status: str
+    progress: int
+    result: Optional[Any] = None
+    result_summary: Optional[str] = None
+    error_message: Optional[str] = None
+    worker_id: Optional[str] = None
+    created_at: str
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+
+
+def job_to_response(job: AgentRun, include_result: bool = True) -> JobResponse:
+    """Convert an AgentRun job record to a response."""
+    result = None
+    if include_result and job.result:
+        try:
+            result = json.loads(job.result)
+        except ValueError:
+            result = job.result
+
+    job_dict = {
+        "job_id": job.id,
+        "agent_type": job.agent_type.value,
+        "project_id": job.project_id,
+        "status": job.status,
+        "progress": job.progress or 0,
+        "result": result,
+        "result_summary": job.result_summary,
+        "error_message": job.error_message,
+        "worker_id": job.worker_id,
+        "created_at": job.created_at.isoformat() if job.created_at else "",
+        "started_at": job.started_at.isoformat() if job.started_at else None,
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None
+    }
+    return JobResponse(**job_dict)
+
+
+@router.get("/{job_id}", response_model=JobResponse)
+async def get_job(job_id: int):
+    """
+    Get status, progress and (when finished) result of a background job.
+
+    Clients poll this, so the lookup goes through run_db (async engine when
+    configured) instead of holding a threadpool slot.
+    """
+    def load(db: Session) -> Optional[JobResponse]:
+        job = AgentRunRepository(db).get_by_id(job_id)
+        if not job or job.job_params is None:
+            return None
+        return job_to_response(job)
+
+    response = await run_db(load)
+    if response is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return response
+
+
+@router.get("/projects/{project_id}/jobs", response_model=List[JobResponse])
+def list_jobs(
+    project_id: int,
+    status: Optional[str] = None,
+    limit: int = 50,
+    db: Session = Depends(get_db)
+):
+    """List background jobs for a project (results omitted; fetch a job for its result)."""
+    query = db.query(AgentRun).filter(
+        AgentRun.project_id == project_id,
+        AgentRun.job_params.isnot(None)
+    )
+    if status:
+        query = query.filter(AgentRun.status == status)
+    jobs = query.order_by(AgentRun.id.desc()).limit(min(limit, 200)).all()
+    return [job_to_response(job, include_result=False) for job in jobs]
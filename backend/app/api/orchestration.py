@@ -1,11 +1,13 @@
 """Agent Orchestration API routes."""
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import List, Optional, Dict, Any
 from pydantic import BaseModel
-from ..database import get_db
+import time
+from ..database import get_db, SessionLocal
 from ..tables import AgentType, ChangeType
-from ..services.orchestration_service import OrchestrationService
+from ..services.orchestration_service import OrchestrationService, ORCHESTRATION_MAX_CONCURRENCY
 from ..agents.business_logic_agent import BusinessLogicAgent
 from ..agents.product_requirements_agent import ProductRequirementsAgent
 from ..agents.api_contract_agent import APIContractAgent
@@ -24,20 +26,39 @@ class OrchestrationRequest(BaseModel):
     code_file_id: Optional[int] = None
     change_type: Optional[str] = None
     release_version: Optional[str] = None
+    max_concurrency: Optional[int] = None  # Defaults to ORCHESTRATION_MAX_CONCURRENCY
+
+
+ORCHESTRATED_AGENTS = {
+    AgentType.BUSINESS_LOGIC_POLICY: BusinessLogicAgent,
+    AgentType.PRODUCT_REQUIREMENTS: ProductRequirementsAgent,
+    AgentType.API_CONTRACT: APIContractAgent,
+    AgentType.TECHNICAL_ARCHITECTURE: TechnicalArchitectureAgent,
+    AgentType.QUALITY_TEST: QualityTestAgent,
+    AgentType.CHANGE_IMPACT: ChangeImpactAgent,
+    AgentType.RELEASE_READINESS: ReleaseReadinessAgent,
+}
+
+
+def _run_agent_with_own_session(agent_class, params: Dict[str, Any]) -> Dict[str, Any]:
+    """Run an agent in its own database session (sessions are not shared across threads)."""
+    db = SessionLocal()
+    try:
+        return agent_class(db).run(**params)
+    finally:
+        db.close()
 
 
 @router.post("/run-sequence")
-async def run_agent_sequence(
-    request: OrchestrationRequest,
-    db: Session = Depends(get_db)
-):
+async def run_agent_sequence(request: OrchestrationRequest):
     """
     Run agents in the correct execution order based on dependencies.
     
     This endpoint orchestrates agent execution by:
-    1. Determining the correct execution order based on dependencies
-    2. Running agents sequentially
-    3. Passing results from one agent to the next when applicable
+    1. Determining the dependency graph between the requested agents
+    2. Running each agent as soon as its dependencies finish, in parallel
+       up to max_concurrency
+    3. Passing results from dependencies to the next agent when applicable
     """
     try:
         # Convert agent type strings to enums
@@ -55,31 +76,13 @@ async def run_agent_sequence(
         # Get execution order
         execution_order = OrchestrationService.get_execution_order(agent_enums)
 
-        results = []
-        last_result = None
-
-        for agent_type in execution_order:
-            # Get agent instance
-            agent_map = {
-                AgentType.BUSINESS_LOGIC_POLICY: BusinessLogicAgent,
-                AgentType.PRODUCT_REQUIREMENTS: ProductRequirementsAgent,
-                AgentType.API_CONTRACT: APIContractAgent,
-                AgentType.TECHNICAL_ARCHITECTURE: TechnicalArchitectureAgent,
-                AgentType.QUALITY_TEST: QualityTestAgent,
-                AgentType.CHANGE_IMPACT: ChangeImpactAgent,
-                AgentType.RELEASE_READINESS: ReleaseReadinessAgent,
-            }
-
-            agent_class = agent_map.get(agent_type)
+        async def run_agent(agent_type: AgentType, dependency_results: Dict[AgentType, Dict[str, Any]]):
+            agent_class = ORCHESTRATED_AGENTS.get(agent_type)
             if not agent_class:
-                results.append({
-                    "agent_type": agent_type.value,
+                return {
                     "status": "skipped",
                     "message": "Agent not implemented"
-                })
-                continue
-
-            agent = agent_class(db)
+                }
 
             # Prepare parameters
             params = {
@@ -90,33 +93,32 @@ async def run_agent_sequence(
 
             # Add agent-specific parameters
             if agent_type == AgentType.BUSINESS_LOGIC_POLICY:
-                # Extract business logic text from previous result if available
-                if last_result and "business_logic_text" in last_result:
-                    params["business_logic_text"] = last_result["business_logic_text"]
+                # Extract business logic text from a dependency result if available
+                for dep_result in dependency_results.values():
+                    if "business_logic_text" in dep_result:
+                        params["business_logic_text"] = dep_result["business_logic_text"]
             elif agent_type == AgentType.CHANGE_IMPACT:
                 params["change_type"] = request.change_type or ChangeType.BUSINESS_RULE_UPDATE.value
             elif agent_type == AgentType.RELEASE_READINESS:
                 params["release_version"] = request.release_version
 
-            # Run agent
-            try:
-                result = agent.analyze(**params)
-                result["agent_type"] = agent_type.value
-                results.append(result)
-                last_result = result
-            except Exception as e:
-                results.append({
-                    "agent_type": agent_type.value,
-                    "status": "error",
-                    "error": str(e)
-                })
+            return await run_in_threadpool(_run_agent_with_own_session, agent_class, params)
+
+        max_concurrency = request.max_concurrency or ORCHESTRATION_MAX_CONCURRENCY
+        start = time.perf_counter()
+        results = await OrchestrationService.run_dag(execution_order, run_agent, max_concurrency)
+        wall_clock_ms = round((time.perf_counter() - start) * 1000, 1)
 
         return {
             "status": "completed",
             "execution_order": [a.value for a in execution_order],
-            "results": results
+            "max_concurrency": max_concurrency,
+            "wall_clock_ms": wall_clock_ms,
+            "results": list(results.values())
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -139,7 +141,8 @@ async def trigger_agents_by_change(
     try:
         # First, run change impact analysis
         change_impact_agent = ChangeImpactAgent(db)
-        impact_result = change_impact_agent.analyze(
+        impact_result = await run_in_threadpool(
+            change_impact_agent.run,
             project_id=project_id,
             change_type=change_type,
             rule_ids=rule_ids or []
@@ -174,37 +177,26 @@ async def trigger_agents_by_change(
         # Get execution order
         execution_order = OrchestrationService.get_execution_order(agent_enums)
 
-        # Run agents
-        results = []
-        for agent_type in execution_order:
-            agent_map = {
-                AgentType.PRODUCT_REQUIREMENTS: ProductRequirementsAgent,
-                AgentType.API_CONTRACT: APIContractAgent,
-                AgentType.TECHNICAL_ARCHITECTURE: TechnicalArchitectureAgent,
-                AgentType.QUALITY_TEST: QualityTestAgent,
-                AgentType.RELEASE_READINESS: ReleaseReadinessAgent,
-            }
-
-            agent_class = agent_map.get(agent_type)
-            if not agent_class:
-                continue
+        rerun_agents = {
+            AgentType.PRODUCT_REQUIREMENTS,
+            AgentType.API_CONTRACT,
+            AgentType.TECHNICAL_ARCHITECTURE,
+            AgentType.QUALITY_TEST,
+            AgentType.RELEASE_READINESS,
+        }
+        rerun_order = [a for a in execution_order if a in rerun_agents]
 
-            agent = agent_class(db)
+        async def run_agent(agent_type: AgentType, dependency_results: Dict[AgentType, Dict[str, Any]]):
             params = {
                 "project_id": project_id,
                 "rule_ids": rule_ids
             }
+            return await run_in_threadpool(
+                _run_agent_with_own_session, ORCHESTRATED_AGENTS[agent_type], params
+            )
 
-            try:
-                result = agent.analyze(**params)
-                result["agent_type"] = agent_type.value
-                results.append(result)
-            except Exception as e:
-                results.append({
-                    "agent_type": agent_type.value,
-                    "status": "error",
-                    "error": str(e)
-                })
+        # Run agents
+        results = list((await OrchestrationService.run_dag(rerun_order, run_agent)).values())
 
         return {
             "status": "completed",
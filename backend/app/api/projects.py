@@ -1,11 +1,22 @@
 """Project API routes."""
-from fastapi import APIRouter, Depends, HTTPException
+import asyncio
+import io
+import tarfile
+import zipfile
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import func
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional, Union
 from datetime import datetime
 from pydantic import BaseModel, model_validator
 from ..database import get_db
-from ..tables import Project, CodeFile, ProjectRepository, CodeFileRepository
+from ..tables import (
+    Project, CodeFile, AgentType, ProjectRepository, CodeFileRepository,
+    AgentRunRepository, CodeFileAnalysisRepository
+)
+from ..services.code_ingestion import CodeIngestionService, StreamingBodyReader
+from ..utils.pagination import paginate, set_next_cursor, PREVIEW_CHARS
 
 router = APIRouter(prefix="/api/projects", tags=["projects"])
 
@@ -60,6 +71,27 @@ class CodeFileResponse(BaseModel):
         from_attributes = True
 
 
+class CodeFileSummaryResponse(BaseModel):
+    """Code file without its content (list views)."""
+    id: int
+    project_id: int
+    file_path: str
+    content_preview: str
+    content_size: int
+    content_hash: str
+    language: str
+    created_at: str
+    updated_at: str
+
+
+class CodeFileChangeResponse(BaseModel):
+    id: int
+    file_path: str
+    language: str
+    content_hash: str
+    updated_at: str
+
+
 @router.post("/", response_model=ProjectResponse)
 def create_project(project: ProjectCreate, db: Session = Depends(get_db)):
     """Create a new project."""
@@ -146,23 +178,172 @@ def create_code_file(
     return CodeFileResponse(**file_dict)
 
 
-@router.get("/{project_id}/files", response_model=List[CodeFileResponse])
-def list_code_files(project_id: int, db: Session = Depends(get_db)):
-    """List all code files for a project."""
+@router.post("/{project_id}/files/bulk")
+async def bulk_upload_code_files(
+    project_id: int,
+    request: Request,
+    format: Optional[str] = None,
+    strip_components: int = 0,
+    db: Session = Depends(get_db)
+):
+    """
+    Bulk-load code files from a streamed tar/zip archive or NDJSON body.
+
+    The body is parsed as it arrives and files are upserted by path in
+    batched multi-row statements inside one transaction. The format comes
+    from ?format=tar|zip|ndjson or the Content-Type header (tar may be
+    gzip/bz2/xz compressed). Use strip_components to drop a leading
+    directory such as the one added by git archive --prefix.
+    """
+    project = await run_in_threadpool(ProjectRepository(db).get_by_id, project_id)
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+
+    upload_format = CodeIngestionService.detect_format(request.headers.get("content-type"), format)
+    if not upload_format:
+        raise HTTPException(
+            status_code=415,
+            detail="Unsupported upload format. Send a tar, zip or NDJSON body, or pass ?format=tar|zip|ndjson"
+        )
+
+    reader = StreamingBodyReader()
+
+    def ingest():
+        try:
+            return CodeIngestionService.ingest(
+                db,
+                project_id,
+                io.BufferedReader(reader),
+                upload_format,
+                strip_components=max(0, strip_components)
+            )
+        finally:
+            # Unblock the body feeder if parsing stopped before the end
+            reader.abort()
+
+    ingest_task = asyncio.ensure_future(run_in_threadpool(ingest))
+    try:
+        async for chunk in request.stream():
+            if chunk and not await run_in_threadpool(reader.feed, chunk):
+                break
+        await run_in_threadpool(reader.feed_eof)
+    except Exception:
+        await run_in_threadpool(reader.fail)
+        try:
+            await ingest_task
+        except Exception:
+            pass
+        raise
+
+    try:
+        return await ingest_task
+    except (tarfile.TarError, zipfile.BadZipFile, ValueError, OSError) as e:
+        raise HTTPException(status_code=400, detail=f"Could not read {upload_format} upload: {str(e)}")
+
+
+@router.get("/{project_id}/files/changed", response_model=List[CodeFileChangeResponse])
+def list_changed_code_files(
+    project_id: int,
+    since: Optional[datetime] = None,
+    agent_run_id: Optional[int] = None,
+    agent_type: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    List code files changed since a timestamp, since an agent run started,
+    or since a given agent last analyzed them (by content hash). Content is
+    not included.
+
+    Exactly one of since, agent_run_id or agent_type is required.
+    """
+    if sum(value is not None for value in (since, agent_run_id, agent_type)) != 1:
+        raise HTTPException(status_code=400, detail="Provide exactly one of since, agent_run_id or agent_type")
+
     file_repo = CodeFileRepository(db)
-    files = file_repo.get_by_project(project_id)
+    if agent_type is not None:
+        try:
+            agent_enum = AgentType(agent_type)
+        except ValueError:
+            raise HTTPException(status_code=400, detail=f"Invalid agent type: {agent_type}")
+        summaries = file_repo.get_change_summaries(project_id)
+        last_hashes = CodeFileAnalysisRepository(db).get_hashes(agent_enum, [f.id for f in summaries])
+        files = [
+            f for f in summaries
+            if f.content_hash is None or last_hashes.get(f.id, (None,))[0] != f.content_hash
+        ]
+    else:
+        if agent_run_id is not None:
+            agent_run = AgentRunRepository(db).get_by_id(agent_run_id)
+            if not agent_run or agent_run.project_id != project_id:
+                raise HTTPException(status_code=404, detail="Agent run not found")
+            since = agent_run.started_at or agent_run.created_at
+        files = file_repo.get_change_summaries(project_id, since)
+
+    return [
+        CodeFileChangeResponse(
+            id=f.id,
+            file_path=f.file_path,
+            language=f.language or "",
+            content_hash=f.content_hash or "",
+            updated_at=f.updated_at.isoformat() if f.updated_at else ""
+        )
+        for f in files
+    ]
+
+
+@router.get("/{project_id}/files", response_model=List[Union[CodeFileResponse, CodeFileSummaryResponse]])
+def list_code_files(
+    project_id: int,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None,
+    view: str = "full",
+    db: Session = Depends(get_db)
+):
+    """
+    List code files for a project, newest first.
+
+    All rows unless ?limit= or ?cursor= is given; then paginated by
+    (created_at, id): pass the X-Next-Cursor response header back as
+    ?cursor= to get the next page. view=summary leaves out content
+    and returns content_preview/content_size instead.
+    """
+    summary = view == "summary"
+    if summary:
+        query = db.query(
+            CodeFile.id,
+            CodeFile.project_id,
+            CodeFile.file_path,
+            func.substr(CodeFile.content, 1, PREVIEW_CHARS).label("content_preview"),
+            func.length(CodeFile.content).label("content_size"),
+            CodeFile.content_hash,
+            CodeFile.language,
+            CodeFile.created_at,
+            CodeFile.updated_at
+        )
+    else:
+        query = db.query(CodeFile)
+    files, next_cursor = paginate(query.filter(CodeFile.project_id == project_id), CodeFile, cursor, limit)
+    set_next_cursor(response, next_cursor)
+
     result = []
     for file in files:
         file_dict = {
             "id": file.id,
             "project_id": file.project_id,
             "file_path": file.file_path,
-            "content": file.content,
             "language": file.language or "",
             "created_at": file.created_at.isoformat() if file.created_at else "",
             "updated_at": file.updated_at.isoformat() if file.updated_at else ""
         }
-        result.append(CodeFileResponse(**file_dict))
+        if summary:
+            file_dict["content_preview"] = file.content_preview or ""
+            file_dict["content_size"] = file.content_size or 0
+            file_dict["content_hash"] = file.content_hash or ""
+            result.append(CodeFileSummaryResponse(**file_dict))
+        else:
+            file_dict["content"] = file.content
+            result.append(CodeFileResponse(**file_dict))
     return result
 
 
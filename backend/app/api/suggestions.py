@@ -1,11 +1,13 @@
 """Suggestions API routes."""
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlalchemy import func
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import List, Optional, Union
 from datetime import datetime
 from pydantic import BaseModel, model_validator
 from ..database import get_db
 from ..tables import Suggestion, SuggestionStatus, AgentType, SuggestionRepository
+from ..utils.pagination import paginate, set_next_cursor, PREVIEW_CHARS
 
 router = APIRouter(prefix="/api/suggestions", tags=["suggestions"])
 
@@ -33,15 +35,55 @@ class SuggestionResponse(BaseModel):
         from_attributes = True
 
 
-@router.get("/", response_model=List[SuggestionResponse])
+class SuggestionSummaryResponse(BaseModel):
+    """Suggestion without its content (list views)."""
+    id: int
+    agent_type: str
+    project_id: int
+    code_file_id: Optional[int]
+    issue_id: Optional[int]
+    content_preview: str
+    content_size: int
+    status: str
+    created_at: str
+    updated_at: str
+
+
+@router.get("/", response_model=List[Union[SuggestionResponse, SuggestionSummaryResponse]])
 def list_suggestions(
+    response: Response,
     project_id: Optional[int] = None,
     agent_type: Optional[str] = None,
     status: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None,
+    view: str = "full",
     db: Session = Depends(get_db)
 ):
-    """List all suggestions with optional filters."""
-    query = db.query(Suggestion)
+    """
+    List suggestions with optional filters, newest first.
+
+    All rows unless ?limit= or ?cursor= is given; then paginated by
+    (created_at, id): pass the X-Next-Cursor response header back as
+    ?cursor= to get the next page. view=summary leaves out content
+    and returns content_preview/content_size instead.
+    """
+    summary = view == "summary"
+    if summary:
+        query = db.query(
+            Suggestion.id,
+            Suggestion.agent_type,
+            Suggestion.project_id,
+            Suggestion.code_file_id,
+            Suggestion.issue_id,
+            func.substr(Suggestion.content, 1, PREVIEW_CHARS).label("content_preview"),
+            func.length(Suggestion.content).label("content_size"),
+            Suggestion.status,
+            Suggestion.created_at,
+            Suggestion.updated_at
+        )
+    else:
+        query = db.query(Suggestion)
 
     if project_id:
         query = query.filter(Suggestion.project_id == project_id)
@@ -58,7 +100,9 @@ def list_suggestions(
         except ValueError:
             raise HTTPException(status_code=400, detail="Invalid status")
 
-    suggestions = query.order_by(Suggestion.created_at.desc()).all()
+    suggestions, next_cursor = paginate(query, Suggestion, cursor, limit)
+    set_next_cursor(response, next_cursor)
+
     # Convert datetime fields to strings
     result = []
     for suggestion in suggestions:
@@ -68,12 +112,17 @@ def list_suggestions(
             "project_id": suggestion.project_id,
             "code_file_id": suggestion.code_file_id,
             "issue_id": suggestion.issue_id,
-            "content": suggestion.content,
             "status": suggestion.status.value,
             "created_at": suggestion.created_at.isoformat() if suggestion.created_at else "",
             "updated_at": suggestion.updated_at.isoformat() if suggestion.updated_at else ""
         }
-        result.append(SuggestionResponse(**suggestion_dict))
+        if summary:
+            suggestion_dict["content_preview"] = suggestion.content_preview or ""
+            suggestion_dict["content_size"] = suggestion.content_size or 0
+            result.append(SuggestionSummaryResponse(**suggestion_dict))
+        else:
+            suggestion_dict["content"] = suggestion.content
+            result.append(SuggestionResponse(**suggestion_dict))
     return result
 
 
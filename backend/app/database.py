@@ -1,9 +1,16 @@
 """Database configuration and session management."""
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, exc
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import sessionmaker, raiseload, configure_mappers
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
 from dotenv import load_dotenv
+from typing import Any, AsyncIterator, Callable, Dict, Optional
+import asyncio
+import importlib.util
 import os
+import threading
+import time
 
 load_dotenv()
 
@@ -26,16 +33,167 @@ if MYSQL_PASSWORD_ENCODED:
 else:
     DATABASE_URL = f"mysql+pymysql://{MYSQL_USER_ENCODED}@{MYSQL_HOST}:{MYSQL_PORT}/{MYSQL_DATABASE}?charset=utf8mb4"
 
+# Connection pool settings from environment variables (per engine, per process)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))  # Seconds to wait for a free connection
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "3600"))  # Recycle connections after this many seconds
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+
+# Optional async engine for async routes: "auto" enables it when an async
+# driver (aiomysql or asyncmy) and greenlet are installed. ASYNC_DATABASE_URL
+# overrides the URL (e.g. to set driver options) but must point at the same
+# MySQL database as the sync engine: background jobs are queued through one
+# engine and picked up by workers on the other.
+DB_ASYNC_ENGINE = os.getenv("DB_ASYNC_ENGINE", "auto").lower()
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL")
+
+
+class PoolMetrics:
+    """Checkout counters and wait times of one connection pool."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def record(self, wait: float, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.total_wait_seconds += wait
+            self.max_wait_seconds = max(self.max_wait_seconds, wait)
+
+    def stats(self, pool) -> Dict[str, Any]:
+        """Counters plus the pool's current occupancy."""
+        with self._lock:
+            attempts = self.checkouts + self.timeouts
+            return {
+                "pool_size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "checked_in": pool.checkedin(),
+                "overflow": pool.overflow(),
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "avg_wait_ms": round(self.total_wait_seconds / attempts * 1000, 3) if attempts else 0.0,
+                "max_wait_ms": round(self.max_wait_seconds * 1000, 3),
+            }
+
+
+class _MeteredPool:
+    """Pool mixin timing each checkout (waiting for a free slot, connecting, pre-ping)."""
+
+    metrics: PoolMetrics
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self.metrics.record(time.perf_counter() - start, timed_out=True)
+            raise
+        self.metrics.record(time.perf_counter() - start)
+        return connection
+
+
+# Metrics live on the class because the engine recreates its pool on dispose
+class MeteredQueuePool(_MeteredPool, QueuePool):
+    metrics = PoolMetrics()
+
+
+class MeteredAsyncQueuePool(_MeteredPool, AsyncAdaptedQueuePool):
+    metrics = PoolMetrics()
+
+
+def _pool_options(poolclass) -> Dict[str, Any]:
+    return {
+        "poolclass": poolclass,
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+    }
+
+
 # Create engine with MySQL-specific settings
 engine = create_engine(
     DATABASE_URL,
-    pool_pre_ping=True,  # Verify connections before using
-    pool_recycle=3600,  # Recycle connections after 1 hour
-    echo=False  # Set to True for SQL query logging
+    echo=False,  # Set to True for SQL query logging
+    **_pool_options(MeteredQueuePool)
 )
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+
+def _same_database(url: str) -> bool:
+    """True if a URL targets the same MySQL server, database and user as DATABASE_URL."""
+    sync_url, other = make_url(DATABASE_URL), make_url(url)
+    return other.get_backend_name() == "mysql" and all(
+        getattr(other, part) == getattr(sync_url, part)
+        for part in ("host", "port", "database", "username")
+    )
+
+
+def _async_database_url() -> Optional[str]:
+    """URL for the async engine, or None when it is disabled or no driver is installed."""
+    if DB_ASYNC_ENGINE == "false" or importlib.util.find_spec("greenlet") is None:
+        return None
+    if ASYNC_DATABASE_URL:
+        if not _same_database(ASYNC_DATABASE_URL):
+            raise RuntimeError(
+                "ASYNC_DATABASE_URL must point at the same MySQL database as the "
+                f"MYSQL_* settings ({make_url(DATABASE_URL).render_as_string(hide_password=True)})"
+            )
+        return ASYNC_DATABASE_URL
+    for driver in ("aiomysql", "asyncmy"):
+        if importlib.util.find_spec(driver) is not None:
+            return DATABASE_URL.replace("mysql+pymysql://", f"mysql+{driver}://", 1)
+    return None
+
+
+async_engine = None
+AsyncSessionLocal = None
+_async_url = _async_database_url()
+if _async_url:
+    from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+
+    async_engine = create_async_engine(
+        _async_url,
+        echo=False,
+        **_pool_options(MeteredAsyncQueuePool)
+    )
+    # Objects stay readable after commit without an implicit (blocking) refresh
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+# Test/development guard: relationships a query did not load explicitly raise
+# on access instead of lazy loading (surfaces N+1 access patterns)
+DB_RAISE_ON_LAZY_LOAD = os.getenv("DB_RAISE_ON_LAZY_LOAD", "false").lower() == "true"
+
+
+def _raise_on_lazy_load(orm_execute_state):
+    """Add raiseload('*') to top-level ORM selects (not to the loads it guards)."""
+    if (
+        orm_execute_state.is_select
+        and not orm_execute_state.is_relationship_load
+        and not orm_execute_state.is_column_load
+    ):
+        # sql_only: many-to-one targets already in the session are still allowed
+        orm_execute_state.statement = orm_execute_state.statement.options(raiseload("*", sql_only=True))
+
+
+def install_lazy_load_guard(session_factory=SessionLocal) -> None:
+    """Make sessions from a factory raise on unexpected lazy loads."""
+    event.listen(session_factory, "do_orm_execute", _raise_on_lazy_load)
+
+
+if DB_RAISE_ON_LAZY_LOAD:
+    install_lazy_load_guard()
+
 Base = declarative_base()
 
 
@@ -48,12 +206,62 @@ def get_db():
         db.close()
 
 
+async def get_async_db() -> AsyncIterator["AsyncSession"]:
+    """Dependency for getting an async database session (requires the async engine)."""
+    if AsyncSessionLocal is None:
+        raise RuntimeError("Async database engine is not configured (install aiomysql or asyncmy)")
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def run_db(fn: Callable[..., Any], *args: Any) -> Any:
+    """
+    Run synchronous repository code from an async route without blocking the event loop.
+
+    With the async engine, fn runs on an AsyncSession's sync facade, so its
+    queries are awaited on the event loop and interleave with other I/O
+    (e.g. LLM calls). Otherwise it runs in a worker thread on a SessionLocal
+    session. The session is closed afterwards, so return plain data rather
+    than ORM objects.
+
+    Args:
+        fn: Callable taking (session, *args)
+        *args: Extra arguments for fn
+
+    Returns:
+        fn's return value
+    """
+    if AsyncSessionLocal is not None:
+        async with AsyncSessionLocal() as db:
+            return await db.run_sync(fn, *args)
+
+    def run_in_thread():
+        db = SessionLocal()
+        try:
+            return fn(db, *args)
+        finally:
+            db.close()
+
+    return await asyncio.to_thread(run_in_thread)
+
+
+def pool_stats() -> Dict[str, Any]:
+    """Connection pool occupancy, checkout counts and wait times per engine."""
+    stats = {"sync": MeteredQueuePool.metrics.stats(engine.pool), "async": None}
+    if async_engine is not None and isinstance(async_engine.sync_engine.pool, MeteredAsyncQueuePool):
+        stats["async"] = MeteredAsyncQueuePool.metrics.stats(async_engine.sync_engine.pool)
+    return stats
+
+
 def init_db():
     """Initialize database tables."""
     # Import all table models to ensure they're registered with SQLAlchemy
     from .tables import (
         Project, CodeFile, Issue, Suggestion, Approval,
         AgentRun, BusinessRule, RuleVersion, ChangeImpact,
-        AgentDependency, ReleaseChecklist
+        AgentDependency, ReleaseChecklist, LLMCacheEntry, DashboardMetric,
+        CodeFileAnalysis, RuleTerm, RuleIdSequence, CodeSymbol
     )
+    # Fail at startup, not on the first query, if a relationship cannot resolve
+    configure_mappers()
     Base.metadata.create_all(bind=engine)
@@ -6,8 +6,9 @@ from fastapi import FastAPI, Request, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse, HTMLResponse
-from .database import init_db
-from .api import projects, agents, suggestions, approvals, issues, business_rules, change_impact, orchestration, dashboard, chat
+from .database import init_db, pool_stats
+from .api import projects, agents, suggestions, approvals, issues, business_rules, change_impact, orchestration, dashboard, chat, jobs
+from .services.job_queue import job_queue
 
 # Load environment variables from .env file
 env_path = Path(__file__).parent.parent / '.env'
@@ -30,6 +31,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 # Include API routers (all already have /api prefix)
@@ -43,6 +45,19 @@ app.include_router(change_impact.router)
 app.include_router(orchestration.router)
 app.include_router(dashboard.router)
 app.include_router(chat.router)
+app.include_router(jobs.router)
+
+
+@app.on_event("startup")
+def start_job_workers():
+    """Start background agent job workers."""
+    job_queue.start()
+
+
+@app.on_event("shutdown")
+def stop_job_workers():
+    """Stop background agent job workers."""
+    job_queue.stop()
 
 # Path to frontend dist folder
 FRONTEND_DIST = Path(__file__).parent.parent.parent / "frontend" / "dist"
@@ -62,6 +77,12 @@ def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/health/db")
+def database_pool_stats():
+    """Connection pool occupancy, checkout counts and wait times."""
+    return pool_stats()
+
+
 @app.get("/api")
 def api_info():
     """API info endpoint."""
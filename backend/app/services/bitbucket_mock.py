@@ -3,7 +3,7 @@ import uuid
 from typing import Dict, Any, Optional
 from datetime import datetime
 from sqlalchemy.orm import Session
-from ..tables import Issue, IssueStatus
+from ..tables import Issue, IssueStatus, DashboardMetricRepository
 
 
 class BitbucketMockService:
@@ -42,6 +42,7 @@ class BitbucketMockService:
             bitbucket_issue_id=bitbucket_id
         )
         db.add(issue)
+        DashboardMetricRepository(db).record_issue_created(issue)
         db.commit()
         db.refresh(issue)
 
@@ -103,8 +104,10 @@ class BitbucketMockService:
         if not issue:
             return None
 
+        old_status, old_updated_at = issue.status, issue.updated_at
         issue.status = status
         issue.updated_at = datetime.utcnow()
+        DashboardMetricRepository(db).record_issue_update(issue, old_status, old_updated_at)
         db.commit()
         db.refresh(issue)
 
@@ -0,0 +1,375 @@
+"""Bulk code-file ingestion from streamed archives."""
+import io
+import json
+import os
+import queue
+import tarfile
+import tempfile
+import zipfile
+from pathlib import PurePosixPath
+from typing import Dict, Any, Iterator, Optional, Tuple, List
+from sqlalchemy.orm import Session
+from ..tables import CodeFileRepository
+
+# Ingestion settings from environment variables
+CODE_INGEST_BATCH_SIZE = int(os.getenv("CODE_INGEST_BATCH_SIZE", "200"))
+# code_files.content is a TEXT column (64 KB on MySQL); larger files are skipped
+CODE_INGEST_MAX_FILE_BYTES = int(os.getenv("CODE_INGEST_MAX_FILE_BYTES", "65535"))
+# Zip archives need random access; they are spooled to disk past this size
+CODE_INGEST_ZIP_SPOOL_BYTES = int(os.getenv("CODE_INGEST_ZIP_SPOOL_BYTES", str(8 * 1024 * 1024)))
+
+IGNORED_DIRECTORIES = {".git", ".hg", ".svn", "node_modules", "__pycache__", ".venv", "venv", ".idea", ".vscode"}
+
+EXTENSION_LANGUAGES = {
+    ".py": "python",
+    ".js": "javascript",
+    ".jsx": "javascript",
+    ".mjs": "javascript",
+    ".cjs": "javascript",
+    ".ts": "typescript",
+    ".tsx": "typescript",
+    ".vue": "vue",
+    ".java": "java",
+    ".kt": "kotlin",
+    ".kts": "kotlin",
+    ".scala": "scala",
+    ".go": "go",
+    ".rs": "rust",
+    ".rb": "ruby",
+    ".php": "php",
+    ".cs": "csharp",
+    ".c": "c",
+    ".h": "c",
+    ".cpp": "cpp",
+    ".cc": "cpp",
+    ".hpp": "cpp",
+    ".swift": "swift",
+    ".m": "objective-c",
+    ".sql": "sql",
+    ".sh": "bash",
+    ".bash": "bash",
+    ".ps1": "powershell",
+    ".html": "html",
+    ".htm": "html",
+    ".css": "css",
+    ".scss": "scss",
+    ".less": "less",
+    ".json": "json",
+    ".yaml": "yaml",
+    ".yml": "yaml",
+    ".toml": "toml",
+    ".xml": "xml",
+    ".md": "markdown",
+    ".proto": "protobuf",
+    ".graphql": "graphql",
+    ".gql": "graphql",
+    ".tf": "terraform",
+}
+
+FILENAME_LANGUAGES = {
+    "dockerfile": "dockerfile",
+    "makefile": "makefile",
+    "jenkinsfile": "groovy",
+}
+
+SHEBANG_LANGUAGES = {
+    "python": "python",
+    "node": "javascript",
+    "bash": "bash",
+    "sh": "bash",
+    "ruby": "ruby",
+    "perl": "perl",
+}
+
+
+def detect_language(file_path: str, content: str = "") -> Optional[str]:
+    """
+    Detect a file's language from its name, falling back to a shebang line.
+
+    Args:
+        file_path: File path
+        content: File content (only the first line is inspected)
+
+    Returns:
+        Language name, or None if unknown
+    """
+    path = PurePosixPath(file_path)
+    language = EXTENSION_LANGUAGES.get(path.suffix.lower()) or FILENAME_LANGUAGES.get(path.name.lower())
+    if language:
+        return language
+    if content.startswith("#!"):
+        first_line = content.split("\n", 1)[0]
+        for token in reversed(first_line[2:].replace("/", " ").split()):
+            token = token.rstrip("0123456789.")  # python3, python3.11
+            if token in SHEBANG_LANGUAGES:
+                return SHEBANG_LANGUAGES[token]
+    return None
+
+
+class StreamingBodyReader(io.RawIOBase):
+    """
+    Blocking file-like reader fed with chunks from another thread.
+
+    The async request handler feeds body chunks while a worker thread parses
+    them, so the upload is processed as it arrives. The queue is bounded,
+    which applies backpressure to the upload instead of buffering it.
+    """
+
+    def __init__(self, max_chunks: int = 16):
+        super().__init__()
+        self._queue: "queue.Queue[Optional[bytes]]" = queue.Queue(maxsize=max_chunks)
+        self._buffer = b""
+        self._eof = False
+        self._aborted = False
+        self._failed = False
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        while not self._buffer and not self._eof:
+            chunk = self._queue.get()
+            if chunk is None:
+                if self._failed:
+                    raise OSError("Upload interrupted")
+                self._eof = True
+            else:
+                self._buffer = chunk
+        n = min(len(b), len(self._buffer))
+        b[:n] = self._buffer[:n]
+        self._buffer = self._buffer[n:]
+        return n
+
+    def feed(self, chunk: bytes) -> bool:
+        """Add a chunk (blocks while the parser is behind). Returns False once the parser has stopped."""
+        while not self._aborted:
+            try:
+                self._queue.put(chunk, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def feed_eof(self) -> None:
+        """Signal the end of the body."""
+        self.feed(None)
+
+    def fail(self) -> None:
+        """Signal that the upload broke off; the parser's next read raises."""
+        self._failed = True
+        self.feed(None)
+
+    def abort(self) -> None:
+        """Called by the parser when it stops early; unblocks the feeder."""
+        self._aborted = True
+
+
+def _normalize_path(name: str, strip_components: int) -> Optional[str]:
+    """Normalize an archive member name; None if it should be skipped."""
+    parts = [p for p in PurePosixPath(name.replace("\\", "/")).parts if p not in ("", ".", "/")]
+    if any(p == ".." for p in parts):
+        return None
+    parts = parts[strip_components:]
+    if not parts or any(p in IGNORED_DIRECTORIES for p in parts[:-1]):
+        return None
+    return "/".join(parts)
+
+
+def _decode(data: bytes) -> Optional[str]:
+    """Decode file bytes as UTF-8 text; None for binary files."""
+    if b"\x00" in data[:8192]:
+        return None
+    try:
+        return data.decode("utf-8")
+    except UnicodeDecodeError:
+        return None
+
+
+Entry = Tuple[str, Optional[bytes], Optional[str], Optional[str]]
+
+
+def iter_tar_entries(fileobj, strip_components: int = 0) -> Iterator[Entry]:
+    """
+    Yield (path, data, language, skip_reason) for regular files in a tar stream.
+
+    Reads the archive sequentially (gzip/bz2/xz detected automatically), so
+    it never needs the whole archive in memory or on disk.
+    """
+    with tarfile.open(fileobj=fileobj, mode="r|*") as archive:
+        for member in archive:
+            if not member.isfile():
+                continue
+            path = _normalize_path(member.name, strip_components)
+            if path is None:
+                continue
+            if member.size > CODE_INGEST_MAX_FILE_BYTES:
+                yield path, None, None, "too large"
+                continue
+            yield path, archive.extractfile(member).read(), None, None
+
+
+def iter_zip_entries(fileobj, strip_components: int = 0) -> Iterator[Entry]:
+    """
+    Yield (path, data, language, skip_reason) for files in a zip stream.
+
+    Zip keeps its index at the end of the archive, so the stream is first
+    spooled to a temporary file (in memory up to CODE_INGEST_ZIP_SPOOL_BYTES).
+    """
+    with tempfile.SpooledTemporaryFile(max_size=CODE_INGEST_ZIP_SPOOL_BYTES) as spool:
+        while True:
+            chunk = fileobj.read(1024 * 1024)
+            if not chunk:
+                break
+            spool.write(chunk)
+        spool.seek(0)
+        with zipfile.ZipFile(spool) as archive:
+            for info in archive.infolist():
+                if info.is_dir():
+                    continue
+                path = _normalize_path(info.filename, strip_components)
+                if path is None:
+                    continue
+                if info.file_size > CODE_INGEST_MAX_FILE_BYTES:
+                    yield path, None, None, "too large"
+                    continue
+                yield path, archive.read(info), None, None
+
+
+def iter_ndjson_entries(fileobj, strip_components: int = 0) -> Iterator[Entry]:
+    """
+    Yield (path, data, language, skip_reason) from NDJSON lines.
+
+    Each line is an object with file_path, content and optional language.
+    """
+    for line_number, line in enumerate(fileobj, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            entry = json.loads(line)
+            path = _normalize_path(entry["file_path"], strip_components)
+            content = entry["content"]
+        except (ValueError, KeyError, TypeError):
+            yield f"<line {line_number}>", None, None, "invalid NDJSON entry"
+            continue
+        if path is None:
+            continue
+        data = content.encode("utf-8") if isinstance(content, str) else None
+        if data is None:
+            yield path, None, None, "content must be a string"
+        elif len(data) > CODE_INGEST_MAX_FILE_BYTES:
+            yield path, None, None, "too large"
+        else:
+            yield path, data, entry.get("language"), None
+
+
+ARCHIVE_READERS = {
+    "tar": iter_tar_entries,
+    "zip": iter_zip_entries,
+    "ndjson": iter_ndjson_entries,
+}
+
+CONTENT_TYPE_FORMATS = {
+    "application/x-ndjson": "ndjson",
+    "application/ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+    "application/zip": "zip",
+    "application/x-zip-compressed": "zip",
+    "application/x-tar": "tar",
+    "application/x-gtar": "tar",
+    "application/gzip": "tar",
+    "application/x-gzip": "tar",
+    "application/octet-stream": "tar",
+}
+
+
+class CodeIngestionService:
+    """Service for bulk-loading code files into a project."""
+
+    @staticmethod
+    def detect_format(content_type: Optional[str], requested: Optional[str] = None) -> Optional[str]:
+        """
+        Resolve the upload format from an explicit value or the Content-Type header.
+
+        Returns:
+            "tar", "zip" or "ndjson", or None if unsupported
+        """
+        if requested:
+            return requested if requested in ARCHIVE_READERS else None
+        media_type = (content_type or "").split(";", 1)[0].strip().lower()
+        return CONTENT_TYPE_FORMATS.get(media_type)
+
+    @staticmethod
+    def ingest(
+        db: Session,
+        project_id: int,
+        fileobj,
+        upload_format: str,
+        strip_components: int = 0,
+        batch_size: int = CODE_INGEST_BATCH_SIZE
+    ) -> Dict[str, Any]:
+        """
+        Parse an archive stream and upsert its files in one transaction.
+
+        Args:
+            db: Database session
+            project_id: Project ID
+            fileobj: Buffered binary file-like object with the upload body
+            upload_format: "tar", "zip" or "ndjson"
+            strip_components: Leading path components to drop (like tar --strip-components)
+            batch_size: Files per multi-row INSERT/UPDATE
+
+        Returns:
+            Summary with created/updated/unchanged/skipped counts
+        """
+        repo = CodeFileRepository(db)
+        summary = {"created": 0, "updated": 0, "unchanged": 0, "skipped": 0}
+        skipped_files: List[Dict[str, str]] = []
+        files_seen = 0
+        batches = 0
+        batch: List[Dict[str, Any]] = []
+
+        def flush_batch() -> None:
+            nonlocal batches, batch
+            if not batch:
+                return
+            counts = repo.upsert_batch(project_id, batch)
+            for key, value in counts.items():
+                summary[key] += value
+            batches += 1
+            batch = []
+
+        def skip(path: str, reason: str) -> None:
+            summary["skipped"] += 1
+            if len(skipped_files) < 100:
+                skipped_files.append({"file_path": path, "reason": reason})
+
+        try:
+            for path, data, language, skip_reason in ARCHIVE_READERS[upload_format](fileobj, strip_components):
+                files_seen += 1
+                if skip_reason:
+                    skip(path, skip_reason)
+                    continue
+                content = _decode(data)
+                if content is None:
+                    skip(path, "binary or non-UTF-8")
+                    continue
+                # NDJSON entries may carry their own language
+                language = language or detect_language(path, content)
+                batch.append({"file_path": path, "content": content, "language": language})
+                if len(batch) >= batch_size:
+                    flush_batch()
+            flush_batch()
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+
+        return {
+            "project_id": project_id,
+            "format": upload_format,
+            "files_seen": files_seen,
+            **summary,
+            "batches": batches,
+            "skipped_files": skipped_files
+        }
@@ -0,0 +1,205 @@
+"""In-memory BM25 index over project code files for issue-driven retrieval."""
+import math
+import os
+import re
+import threading
+from array import array
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy.orm import Session
+from ..tables import CodeFile
+
+# Retrieval settings from environment variables
+CODE_SEARCH_TOP_K = int(os.getenv("CODE_SEARCH_TOP_K", "5"))
+CODE_SEARCH_BM25_K1 = float(os.getenv("CODE_SEARCH_BM25_K1", "1.2"))
+CODE_SEARCH_BM25_B = float(os.getenv("CODE_SEARCH_BM25_B", "0.75"))
+# Path terms are counted this many times: a file named after the feature is
+# usually the right place to look
+CODE_SEARCH_PATH_WEIGHT = int(os.getenv("CODE_SEARCH_PATH_WEIGHT", "3"))
+# Rebuild a project's postings once this share of its rows are stale
+CODE_SEARCH_COMPACT_RATIO = float(os.getenv("CODE_SEARCH_COMPACT_RATIO", "0.25"))
+
+_IDENTIFIER_RE = re.compile(r'[A-Za-z_][A-Za-z0-9_]*')
+_PART_RE = re.compile(r'[A-Z]+(?![a-z])|[A-Z]?[a-z]+|[0-9]+')
+MAX_TERM_LENGTH = 64
+MAX_QUERY_TERMS = 64
+
+
+def tokenize_code(text: str) -> Counter:
+    """
+    BM25 terms of code or prose, with their frequencies.
+
+    Identifiers are lowercased and also split on underscores and case
+    changes, so "refundOrder", "refund_order" and the words "refund order"
+    in an issue all share the terms "refund" and "order".
+
+    Args:
+        text: Code, file path or issue text
+
+    Returns:
+        term -> frequency
+    """
+    terms: Counter = Counter()
+    for identifier in _IDENTIFIER_RE.findall(text or ""):
+        if len(identifier) > MAX_TERM_LENGTH:
+            continue
+        lowered = identifier.lower()
+        if len(lowered) > 1:
+            terms[lowered] += 1
+        parts = _PART_RE.findall(identifier)
+        if len(parts) > 1:
+            for part in parts:
+                if len(part) > 1:
+                    terms[part.lower()] += 1
+    return terms
+
+
+class _ProjectPostings:
+    """
+    BM25 postings of one project's files.
+
+    Each term maps to two parallel arrays (row numbers and term
+    frequencies). A changed or deleted file only marks its row inactive and
+    a new row is appended; postings are rebuilt once enough rows are stale.
+    """
+
+    def __init__(self):
+        self.postings: Dict[str, Tuple[array, array]] = {}
+        self.file_ids = array('l')
+        self.lengths = array('l')
+        self.active = bytearray()
+        self.row_of: Dict[int, int] = {}
+        self.hash_of: Dict[int, Optional[str]] = {}
+        self.active_length = 0
+
+    def __len__(self) -> int:
+        return len(self.row_of)
+
+    @property
+    def stale_rows(self) -> int:
+        return len(self.file_ids) - len(self.row_of)
+
+    def add(self, code_file_id: int, content_hash: Optional[str], terms: Counter) -> None:
+        self.remove(code_file_id)
+        row = len(self.file_ids)
+        length = sum(terms.values())
+        self.file_ids.append(code_file_id)
+        self.lengths.append(length)
+        self.active.append(1)
+        self.row_of[code_file_id] = row
+        self.hash_of[code_file_id] = content_hash
+        self.active_length += length
+        for term, count in terms.items():
+            posting = self.postings.get(term)
+            if posting is None:
+                posting = self.postings[term] = (array('l'), array('l'))
+            posting[0].append(row)
+            posting[1].append(count)
+
+    def remove(self, code_file_id: int) -> None:
+        row = self.row_of.pop(code_file_id, None)
+        if row is None:
+            return
+        self.hash_of.pop(code_file_id, None)
+        self.active[row] = 0
+        self.active_length -= self.lengths[row]
+
+    def search(self, terms: List[str], k: int) -> List[Tuple[int, float]]:
+        """Top-k (code file ID, BM25 score) for the query terms, best first."""
+        count = len(self.row_of)
+        if not count:
+            return []
+        k1, b = CODE_SEARCH_BM25_K1, CODE_SEARCH_BM25_B
+        average_length = max(self.active_length / count, 1.0)
+        check_active = self.stale_rows > 0
+        active, lengths = self.active, self.lengths
+        scores: Dict[int, float] = {}
+        for term in terms:
+            posting = self.postings.get(term)
+            if posting is None:
+                continue
+            rows, frequencies = posting
+            if check_active:
+                pairs = [(row, tf) for row, tf in zip(rows, frequencies) if active[row]]
+            else:
+                pairs = list(zip(rows, frequencies))
+            if not pairs:
+                continue
+            idf = math.log(1 + (count - len(pairs) + 0.5) / (len(pairs) + 0.5))
+            for row, tf in pairs:
+                norm = k1 * (1 - b + b * lengths[row] / average_length)
+                scores[row] = scores.get(row, 0.0) + idf * tf * (k1 + 1) / (tf + norm)
+        best = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:k]
+        return [(self.file_ids[row], score) for row, score in best]
+
+
+class CodeSearchIndex:
+    """
+    Per-project BM25 indexes, kept in sync with code_files.
+
+    Each search first reads the project's (id, content_hash) pairs, without
+    content, and re-tokenizes only new and changed files; files that are
+    gone are dropped from the index.
+    """
+
+    def __init__(self):
+        self._projects: Dict[int, _ProjectPostings] = {}
+        self._lock = threading.Lock()
+
+    def search(self, db: Session, project_id: int, text: str, k: int = CODE_SEARCH_TOP_K) -> List[Tuple[int, float]]:
+        """
+        Rank a project's code files against a text.
+
+        Args:
+            db: Database session
+            project_id: Project ID
+            text: Issue title and description (or any query)
+            k: Maximum number of results
+
+        Returns:
+            (code file ID, BM25 score) pairs, best first
+        """
+        terms = [term for term, _ in tokenize_code(text).most_common(MAX_QUERY_TERMS)]
+        if not terms:
+            return []
+        with self._lock:
+            postings = self._refresh(db, project_id)
+            return postings.search(terms, k)
+
+    def _refresh(self, db: Session, project_id: int) -> _ProjectPostings:
+        """Bring a project's postings up to date with code_files."""
+        current = dict(db.query(CodeFile.id, CodeFile.content_hash).filter(CodeFile.project_id == project_id).all())
+        postings = self._projects.get(project_id)
+        if postings is None or postings.stale_rows > CODE_SEARCH_COMPACT_RATIO * max(len(current), 1):
+            postings = self._projects[project_id] = _ProjectPostings()
+
+        for code_file_id in [file_id for file_id in postings.row_of if file_id not in current]:
+            postings.remove(code_file_id)
+        changed = [
+            file_id for file_id, content_hash in current.items()
+            if file_id not in postings.row_of or postings.hash_of[file_id] != content_hash
+        ]
+        for start in range(0, len(changed), 500):
+            rows = db.query(CodeFile.id, CodeFile.file_path, CodeFile.content, CodeFile.content_hash).filter(
+                CodeFile.id.in_(changed[start:start + 500])
+            )
+            for code_file_id, file_path, content, content_hash in rows:
+                terms = tokenize_code(content)
+                for term, count in tokenize_code(file_path).items():
+                    terms[term] += count * CODE_SEARCH_PATH_WEIGHT
+                postings.add(code_file_id, content_hash, terms)
+        return postings
+
+
+_index: Optional[CodeSearchIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_code_search_index() -> CodeSearchIndex:
+    """Get the process-wide code search index."""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = CodeSearchIndex()
+    return _index
@@ -1,7 +1,101 @@
 """Groq API service wrapper."""
+import asyncio
+import importlib.util
+import json
 import os
-from groq import Groq
-from typing import Optional, Dict, Any
+import queue
+import threading
+from groq import AsyncGroq
+import httpx
+from typing import Optional, Dict, Any, AsyncIterator, Iterator, List, Tuple
+from .llm_cache import get_llm_cache, make_cache_key
+from ..utils.incremental_json import IncrementalJSONParser
+
+DEFAULT_MODEL = "llama-3.3-70b-versatile"
+
+# Connection pool settings for the process-wide HTTP client
+GROQ_MAX_CONNECTIONS = int(os.getenv("GROQ_MAX_CONNECTIONS", "100"))
+GROQ_MAX_KEEPALIVE = int(os.getenv("GROQ_MAX_KEEPALIVE", "20"))
+GROQ_KEEPALIVE_EXPIRY = float(os.getenv("GROQ_KEEPALIVE_EXPIRY", "30"))
+GROQ_TIMEOUT = float(os.getenv("GROQ_TIMEOUT", "120"))
+
+# Share one in-flight completion between concurrent identical requests
+GROQ_COALESCE_REQUESTS = os.getenv("GROQ_COALESCE_REQUESTS", "true").lower() == "true"
+
+# HTTP/2 needs the optional 'h2' package; fall back to HTTP/1.1 keep-alive without it
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+_lock = threading.Lock()
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_client: Optional[AsyncGroq] = None
+
+
+class _Flight:
+    """A completion in progress and the number of callers waiting for it."""
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+# Request fingerprint -> flight; only touched from the background loop
+_in_flight: Dict[str, _Flight] = {}
+_coalesce_counters = {"requests": 0, "coalesced": 0}
+
+
+def _get_loop() -> asyncio.AbstractEventLoop:
+    """
+    Get the background event loop that owns the shared Groq client.
+
+    All LLM network I/O runs on this one loop, so every caller in the
+    process (sync agents in worker threads, async routes) shares a single
+    keep-alive connection pool.
+    """
+    global _loop
+    if _loop is None:
+        with _lock:
+            if _loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(
+                    target=loop.run_forever,
+                    name="groq-event-loop",
+                    daemon=True
+                )
+                thread.start()
+                _loop = loop
+    return _loop
+
+
+def _get_client(api_key: str) -> AsyncGroq:
+    """Get the process-wide AsyncGroq client (must be used on the background loop)."""
+    global _client
+    if _client is None:
+        with _lock:
+            if _client is None:
+                http_client = httpx.AsyncClient(
+                    http2=HTTP2_AVAILABLE,
+                    limits=httpx.Limits(
+                        max_connections=GROQ_MAX_CONNECTIONS,
+                        max_keepalive_connections=GROQ_MAX_KEEPALIVE,
+                        keepalive_expiry=GROQ_KEEPALIVE_EXPIRY
+                    ),
+                    timeout=httpx.Timeout(GROQ_TIMEOUT, connect=10.0)
+                )
+                _client = AsyncGroq(api_key=api_key, http_client=http_client)
+    return _client
+
+
+def coalesce_stats() -> Dict[str, Any]:
+    """Counters of the in-flight request coalescing."""
+    requests = _coalesce_counters["requests"]
+    coalesced = _coalesce_counters["coalesced"]
+    return {
+        "enabled": GROQ_COALESCE_REQUESTS,
+        "requests": requests,
+        "coalesced": coalesced,
+        "coalesced_rate": round(coalesced / requests * 100, 1) if requests else 0,
+        "in_flight": len(_in_flight)
+    }
 
 
 class GroqService:
@@ -11,51 +105,397 @@ class GroqService:
         api_key = os.environ.get("GROQ_API_KEY")
         if not api_key:
             raise ValueError("GROQ_API_KEY environment variable is not set")
-        # Initialize Groq client
-        # The 'proxies' error typically occurs due to httpx version conflicts
-        # Ensure httpx>=0.24.0 is installed
-        self.client = Groq(api_key=api_key)
-        self.model = "llama-3.3-70b-versatile"
+        # The underlying client and connection pool are shared process-wide,
+        # so constructing a GroqService per agent or per request is cheap.
+        self.api_key = api_key
+        self.model = DEFAULT_MODEL
+
+    def _build_params(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float,
+        max_tokens: Optional[int]
+    ) -> Dict[str, Any]:
+        """Build chat completion parameters."""
+        messages = [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt}
+        ]
+
+        params = {
+            "model": self.model,
+            "messages": messages,
+            "temperature": temperature
+        }
+
+        if max_tokens:
+            params["max_tokens"] = max_tokens
+
+        return params
+
+    async def _complete(self, params: Dict[str, Any]) -> str:
+        """Run a chat completion on the background loop."""
+        try:
+            response = await _get_client(self.api_key).chat.completions.create(**params)
+            return response.choices[0].message.content
+        except Exception as e:
+            raise Exception(f"Groq API error: {str(e)}")
+
+    async def _complete_once(self, key: str, params: Dict[str, Any]) -> str:
+        """
+        Run a chat completion, joining an identical one already in flight.
+
+        Must run on the background loop. Every caller with the same request
+        fingerprint awaits the same task and gets its result or error. A
+        cancelled caller only stops waiting; the request is cancelled when
+        its last waiter goes away.
+        """
+        if not GROQ_COALESCE_REQUESTS:
+            return await self._complete(params)
+
+        _coalesce_counters["requests"] += 1
+        flight = _in_flight.get(key)
+        if flight is None:
+            flight = _Flight(asyncio.ensure_future(self._complete(params)))
+            _in_flight[key] = flight
+            flight.task.add_done_callback(
+                lambda task: _in_flight.pop(key, None) if _in_flight.get(key) is flight else None
+            )
+        else:
+            _coalesce_counters["coalesced"] += 1
+
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        except asyncio.CancelledError:
+            if flight.waiters == 1 and not flight.task.done():
+                flight.task.cancel()
+            raise
+        finally:
+            flight.waiters -= 1
+
+    def _submit(self, coro):
+        """Schedule a coroutine on the background loop and return a concurrent future."""
+        return asyncio.run_coroutine_threadsafe(coro, _get_loop())
+
+    def run_coroutine(self, coro):
+        """
+        Run a coroutine on the shared background loop and wait for its result.
+
+        Lets synchronous code (e.g. agents running in worker threads) drive
+        many concurrent agenerate calls over the shared connection pool.
+        """
+        return self._submit(coro).result()
+
+    def _cache_key(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float,
+        max_tokens: Optional[int],
+        variant: Optional[str] = None
+    ) -> str:
+        """Content-addressed cache key for a completion request."""
+        return make_cache_key(self.model, system_prompt, user_prompt, temperature, max_tokens, variant)
+
+    async def agenerate(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float = 0.2,
+        max_tokens: Optional[int] = None,
+        use_cache: bool = False
+    ) -> str:
+        """
+        Generate response from Groq API without blocking the event loop.
+
+        Args:
+            system_prompt: System message for the AI
+            user_prompt: User message/prompt
+            temperature: Temperature for generation (default: 0.2)
+            max_tokens: Maximum tokens to generate
+            use_cache: Serve/store the response through the LLM response cache
+
+        Returns:
+            Generated text response
+        """
+        key = self._cache_key(system_prompt, user_prompt, temperature, max_tokens)
+        cache = get_llm_cache() if use_cache else None
+        if cache:
+            if cache.blocking:
+                cached = await asyncio.to_thread(cache.get, key)
+            else:
+                cached = cache.get(key)
+            if cached is not None:
+                return cached
+
+        params = self._build_params(system_prompt, user_prompt, temperature, max_tokens)
+        coro = self._complete_once(key, params)
+        if asyncio.get_running_loop() is _get_loop():
+            response = await coro
+        else:
+            response = await asyncio.wrap_future(self._submit(coro))
+
+        if cache:
+            if cache.blocking:
+                await asyncio.to_thread(cache.set, key, response, self.model)
+            else:
+                cache.set(key, response, self.model)
+        return response
 
     def generate(
         self,
         system_prompt: str,
         user_prompt: str,
         temperature: float = 0.2,
-        max_tokens: Optional[int] = None
+        max_tokens: Optional[int] = None,
+        use_cache: bool = False
     ) -> str:
         """
         Generate response from Groq API.
 
+        Blocks the calling thread only; the request itself runs on the shared
+        background loop, so many threads can have calls in flight at once.
+
         Args:
             system_prompt: System message for the AI
             user_prompt: User message/prompt
             temperature: Temperature for generation (default: 0.2)
             max_tokens: Maximum tokens to generate
+            use_cache: Serve/store the response through the LLM response cache
 
         Returns:
             Generated text response
         """
-        messages = [
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_prompt}
-        ]
+        key = self._cache_key(system_prompt, user_prompt, temperature, max_tokens)
+        cache = get_llm_cache() if use_cache else None
+        if cache:
+            cached = cache.get(key)
+            if cached is not None:
+                return cached
 
-        params = {
-            "model": self.model,
-            "messages": messages,
-            "temperature": temperature
-        }
+        params = self._build_params(system_prompt, user_prompt, temperature, max_tokens)
+        response = self._submit(self._complete_once(key, params)).result()
 
-        if max_tokens:
-            params["max_tokens"] = max_tokens
+        if cache:
+            cache.set(key, response, self.model)
+        return response
 
+    async def _stream_chunks(self, params: Dict[str, Any]) -> AsyncIterator[str]:
+        """Stream a chat completion on the background loop, yielding content deltas."""
         try:
-            response = self.client.chat.completions.create(**params)
-            return response.choices[0].message.content
+            stream = await _get_client(self.api_key).chat.completions.create(**params, stream=True)
+            try:
+                async for chunk in stream:
+                    if not chunk.choices:
+                        continue
+                    delta = chunk.choices[0].delta.content
+                    if delta:
+                        yield delta
+            finally:
+                # Release the connection now if the consumer stopped early
+                await stream.close()
         except Exception as e:
             raise Exception(f"Groq API error: {str(e)}")
 
+    async def astream(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float = 0.2,
+        max_tokens: Optional[int] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream response tokens from Groq API as they are generated.
+
+        The request runs on the shared background loop; tokens are handed over
+        to the caller's loop as they arrive. Closing the iterator early (e.g.
+        the client disconnected) cancels the upstream request.
+
+        Args:
+            system_prompt: System message for the AI
+            user_prompt: User message/prompt
+            temperature: Temperature for generation (default: 0.2)
+            max_tokens: Maximum tokens to generate
+
+        Yields:
+            Text deltas in generation order
+        """
+        params = self._build_params(system_prompt, user_prompt, temperature, max_tokens)
+        caller_loop = asyncio.get_running_loop()
+        if caller_loop is _get_loop():
+            chunks = self._stream_chunks(params)
+            try:
+                async for delta in chunks:
+                    yield delta
+            finally:
+                await chunks.aclose()
+            return
+
+        queue: asyncio.Queue = asyncio.Queue()
+
+        def put(item) -> None:
+            caller_loop.call_soon_threadsafe(queue.put_nowait, item)
+
+        async def produce() -> None:
+            try:
+                async for delta in self._stream_chunks(params):
+                    put((delta, None))
+                put((None, None))
+            except Exception as e:
+                put((None, e))
+
+        future = self._submit(produce())
+        try:
+            while True:
+                delta, error = await queue.get()
+                if error is not None:
+                    raise error
+                if delta is None:
+                    break
+                yield delta
+        finally:
+            future.cancel()
+
+    async def astream_json(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float = 0.2,
+        max_tokens: Optional[int] = None,
+        required_keys: Optional[List[str]] = None,
+        use_cache: bool = False,
+        parser: Optional[IncrementalJSONParser] = None
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Stream a JSON object response, yielding top-level members as they complete.
+
+        Generation stops as soon as the object closes or all required_keys
+        have arrived, so trailing chatter is never generated. Members the
+        incremental parse could not read (YAML, malformed JSON) are recovered
+        from the full text once the stream ends.
+
+        Args:
+            system_prompt: System message for the AI
+            user_prompt: User message/prompt
+            temperature: Temperature for generation (default: 0.2)
+            max_tokens: Maximum tokens to generate
+            required_keys: Stop generating once all of these keys are present
+            use_cache: Serve/store the response through the LLM response cache
+            parser: Parser to feed; pass one to read its raw text afterwards
+
+        Yields:
+            (key, value) pairs for top-level members, in completion order
+        """
+        if parser is None:
+            parser = IncrementalJSONParser(required_keys)
+
+        cache = get_llm_cache() if use_cache else None
+        if cache:
+            # The stored text ends where the stream stopped, which depends on
+            # the required keys, so it is kept apart from full completions
+            stop_keys = json.dumps(sorted(parser.required_keys))
+            key = self._cache_key(system_prompt, user_prompt, temperature, max_tokens, "json-stream:" + stop_keys)
+            if cache.blocking:
+                cached = await asyncio.to_thread(cache.get, key)
+            else:
+                cached = cache.get(key)
+            if cached is not None:
+                for member in parser.feed(cached) + parser.finish():
+                    yield member
+                return
+
+        stream = self.astream(system_prompt, user_prompt, temperature, max_tokens)
+        try:
+            async for delta in stream:
+                for member in parser.feed(delta):
+                    yield member
+                if parser.satisfied:
+                    break
+        finally:
+            # Cancels the upstream request when stopping early
+            await stream.aclose()
+
+        for member in parser.finish():
+            yield member
+
+        if cache:
+            # A response cut off at the stopping point replays to the same members
+            # for the same required keys
+            if cache.blocking:
+                await asyncio.to_thread(cache.set, key, parser.text, self.model)
+            else:
+                cache.set(key, parser.text, self.model)
+
+    def stream_json(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float = 0.2,
+        max_tokens: Optional[int] = None,
+        required_keys: Optional[List[str]] = None,
+        use_cache: bool = False,
+        parser: Optional[IncrementalJSONParser] = None
+    ) -> Iterator[Tuple[str, Any]]:
+        """
+        Blocking counterpart of astream_json for synchronous callers.
+
+        The stream runs on the shared background loop; members are handed to
+        the calling thread as they complete. Closing the iterator early
+        cancels the upstream request.
+
+        Args:
+            system_prompt: System message for the AI
+            user_prompt: User message/prompt
+            temperature: Temperature for generation (default: 0.2)
+            max_tokens: Maximum tokens to generate
+            required_keys: Stop generating once all of these keys are present
+            use_cache: Serve/store the response through the LLM response cache
+            parser: Parser to feed; pass one to read its raw text afterwards
+
+        Yields:
+            (key, value) pairs for top-level members, in completion order
+        """
+        members: queue.Queue = queue.Queue()
+
+        async def produce() -> None:
+            try:
+                async for member in self.astream_json(
+                    system_prompt, user_prompt, temperature, max_tokens,
+                    required_keys=required_keys, use_cache=use_cache, parser=parser
+                ):
+                    members.put((member, None))
+                members.put((None, None))
+            except Exception as e:
+                members.put((None, e))
+
+        future = self._submit(produce())
+        try:
+            while True:
+                member, error = members.get()
+                if error is not None:
+                    raise error
+                if member is None:
+                    break
+                yield member
+        finally:
+            future.cancel()
+
+    @staticmethod
+    def _parse_structured(response: str) -> Dict[str, Any]:
+        """Parse a structured (JSON) response into a dict."""
+        from ..utils.json_extractor import extract_json_from_text
+
+        # Use robust JSON extractor
+        extracted = extract_json_from_text(response, fallback_to_text=True)
+
+        # If extraction returned a dict, use it; otherwise wrap in content
+        if isinstance(extracted, dict):
+            return extracted
+        else:
+            return {"content": extracted if isinstance(extracted, str) else str(extracted)}
+
     def generate_structured(
         self,
         system_prompt: str,
@@ -73,16 +513,27 @@ class GroqService:
         Returns:
             Parsed JSON response as dict
         """
-        from ..utils.json_extractor import extract_json_from_text
-        
         prompt = f"{user_prompt}\n\nPlease respond in valid JSON format only."
         response = self.generate(system_prompt, prompt, temperature)
-        
-        # Use robust JSON extractor
-        extracted = extract_json_from_text(response, fallback_to_text=True)
-        
-        # If extraction returned a dict, use it; otherwise wrap in content
-        if isinstance(extracted, dict):
-            return extracted
-        else:
-            return {"content": extracted if isinstance(extracted, str) else str(extracted)}
+        return self._parse_structured(response)
+
+    async def agenerate_structured(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float = 0.2
+    ) -> Dict[str, Any]:
+        """
+        Generate structured response (JSON format) without blocking the event loop.
+
+        Args:
+            system_prompt: System message
+            user_prompt: User prompt with JSON format instructions
+            temperature: Temperature for generation
+
+        Returns:
+            Parsed JSON response as dict
+        """
+        prompt = f"{user_prompt}\n\nPlease respond in valid JSON format only."
+        response = await self.agenerate(system_prompt, prompt, temperature)
+        return self._parse_structured(response)
@@ -0,0 +1,191 @@
+"""SQL-backed background job queue for agent runs."""
+import json
+import logging
+import os
+import socket
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional
+from sqlalchemy.orm import Session
+from ..database import SessionLocal
+from ..tables import AgentType, AgentRun, AgentRunStatus, AgentRunRepository
+
+# Worker pool settings from environment variables
+AGENT_JOB_WORKERS = int(os.getenv("AGENT_JOB_WORKERS", "4"))
+AGENT_JOB_POLL_SECONDS = float(os.getenv("AGENT_JOB_POLL_SECONDS", "2"))
+# Workers renew the lease of their running jobs every AGENT_JOB_HEARTBEAT_SECONDS;
+# a job whose lease is older than AGENT_JOB_LEASE_SECONDS is assumed orphaned
+# (e.g. process restarted) and re-queued, up to AGENT_JOB_MAX_ATTEMPTS claims
+AGENT_JOB_HEARTBEAT_SECONDS = float(os.getenv("AGENT_JOB_HEARTBEAT_SECONDS", "30"))
+AGENT_JOB_LEASE_SECONDS = int(os.getenv("AGENT_JOB_LEASE_SECONDS", "300"))
+AGENT_JOB_MAX_ATTEMPTS = int(os.getenv("AGENT_JOB_MAX_ATTEMPTS", "3"))
+
+logger = logging.getLogger(__name__)
+
+
+class AgentJobQueue:
+    """
+    In-process worker pool draining a queue stored in the agent_runs table.
+
+    Jobs are AgentRun rows in the "queued" state. Because the queue lives in
+    the database, queued jobs survive restarts, and several processes can
+    share it (workers claim jobs with SELECT ... FOR UPDATE SKIP LOCKED).
+    A heartbeat thread renews the lease of every job running in this
+    process, so only jobs of dead workers are ever re-queued.
+    """
+
+    def __init__(self, num_workers: int = AGENT_JOB_WORKERS):
+        self.num_workers = num_workers
+        self._threads: List[threading.Thread] = []
+        self._stop = threading.Event()
+        self._wakeup = threading.Event()
+        self._worker_prefix = f"{socket.gethostname()}:{os.getpid()}"
+        # Jobs running in this process: job id -> worker id
+        self._leases: Dict[int, str] = {}
+        self._leases_lock = threading.Lock()
+
+    def enqueue(self, db: Session, agent_type: AgentType, project_id: int, params: Dict[str, Any]) -> AgentRun:
+        """
+        Queue an agent run.
+
+        Args:
+            db: Database session
+            agent_type: Agent to run
+            project_id: Project ID
+            params: Keyword arguments for the agent's analyze() (JSON-serializable)
+
+        Returns:
+            The queued AgentRun (its id is the job id)
+        """
+        job = AgentRunRepository(db).enqueue(
+            agent_type=agent_type,
+            project_id=project_id,
+            job_params=json.dumps(params)
+        )
+        self._wakeup.set()
+        return job
+
+    def start(self) -> None:
+        """Start the worker threads."""
+        if self._threads:
+            return
+        self._stop.clear()
+        for i in range(self.num_workers):
+            thread = threading.Thread(
+                target=self._worker_loop,
+                args=(f"{self._worker_prefix}:{i}",),
+                name=f"agent-job-worker-{i}",
+                daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+        heartbeat = threading.Thread(target=self._heartbeat_loop, name="agent-job-heartbeat", daemon=True)
+        heartbeat.start()
+        self._threads.append(heartbeat)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Signal workers to stop after their current job."""
+        self._stop.set()
+        self._wakeup.set()
+        for thread in self._threads:
+            thread.join(timeout=timeout)
+        self._threads = []
+
+    def _worker_loop(self, worker_id: str) -> None:
+        while not self._stop.is_set():
+            try:
+                job_id = self._claim(worker_id)
+            except Exception:
+                logger.exception("Claiming an agent job failed")
+                job_id = None
+            if job_id is None:
+                self._requeue_expired()
+                self._wakeup.wait(timeout=AGENT_JOB_POLL_SECONDS)
+                self._wakeup.clear()
+                continue
+            self._run(job_id, worker_id)
+
+    def _heartbeat_loop(self) -> None:
+        while not self._stop.wait(timeout=AGENT_JOB_HEARTBEAT_SECONDS):
+            with self._leases_lock:
+                leases = dict(self._leases)
+            if not leases:
+                continue
+            db = SessionLocal()
+            try:
+                AgentRunRepository(db).heartbeat(leases)
+            except Exception:
+                logger.exception("Renewing agent job leases failed")
+            finally:
+                db.close()
+
+    def _claim(self, worker_id: str) -> Optional[int]:
+        db = SessionLocal()
+        try:
+            job = AgentRunRepository(db).claim_next_queued(worker_id)
+            return job.id if job else None
+        finally:
+            db.close()
+
+    def _requeue_expired(self) -> None:
+        db = SessionLocal()
+        try:
+            cutoff = datetime.utcnow() - timedelta(seconds=AGENT_JOB_LEASE_SECONDS)
+            counts = AgentRunRepository(db).requeue_expired(cutoff, AGENT_JOB_MAX_ATTEMPTS)
+            if counts["requeued"] or counts["failed"]:
+                logger.warning(
+                    "Recovered agent jobs with expired leases: %d requeued, %d failed after %d attempts",
+                    counts["requeued"], counts["failed"], AGENT_JOB_MAX_ATTEMPTS
+                )
+        except Exception:
+            db.rollback()
+            logger.exception("Re-queuing agent jobs with expired leases failed")
+        finally:
+            db.close()
+
+    def _run(self, job_id: int, worker_id: str) -> None:
+        from ..agents.registry import get_agent_class
+
+        with self._leases_lock:
+            self._leases[job_id] = worker_id
+        db = SessionLocal()
+        repo = AgentRunRepository(db)
+        try:
+            job = repo.get_by_id(job_id)
+            agent_class = get_agent_class(job.agent_type)
+            if not agent_class:
+                repo.finish(
+                    job_id,
+                    AgentRunStatus.ERROR.value,
+                    error_message=f"Agent type {job.agent_type.value} not implemented",
+                    worker_id=worker_id
+                )
+                return
+
+            params = json.loads(job.job_params or "{}")
+            agent = agent_class(db)
+            agent.job_run_id = job_id
+            result = agent.run(**params)
+
+            status = AgentRunStatus.ERROR if result.get("status") == "error" else AgentRunStatus.SUCCESS
+            repo.finish(
+                job_id,
+                status.value,
+                result=json.dumps(result, default=str),
+                error_message=result.get("error") if status == AgentRunStatus.ERROR else None,
+                worker_id=worker_id
+            )
+        except Exception as e:
+            try:
+                db.rollback()
+                repo.finish(job_id, AgentRunStatus.ERROR.value, error_message=str(e), worker_id=worker_id)
+            except Exception:
+                # Keep the worker alive; the lease expires and the job is re-queued
+                logger.exception("Recording the failure of agent job %s failed", job_id)
+        finally:
+            with self._leases_lock:
+                self._leases.pop(job_id, None)
+            db.close()
+
+
+job_queue = AgentJobQueue()
@@ -0,0 +1,320 @@
+"""Content-addressed cache for LLM responses."""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Optional, Dict, Any, Tuple
+
+# Cache configuration from environment variables
+LLM_CACHE_BACKEND = os.getenv("LLM_CACHE_BACKEND", "memory")  # memory, sqlite, mysql, none
+LLM_CACHE_TTL_SECONDS = int(os.getenv("LLM_CACHE_TTL_SECONDS", "86400"))  # 0 disables expiry
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "1000"))
+LLM_CACHE_SQLITE_PATH = os.getenv("LLM_CACHE_SQLITE_PATH", "llm_cache.sqlite3")
+# Comma-separated agent types (e.g. "code_template_agent,prompt_amplifier_agent") that bypass the cache
+LLM_CACHE_DISABLED_AGENTS = {
+    a.strip() for a in os.getenv("LLM_CACHE_DISABLED_AGENTS", "").split(",") if a.strip()
+}
+
+
+def make_cache_key(
+    model: str,
+    system_prompt: str,
+    user_prompt: str,
+    temperature: float,
+    max_tokens: Optional[int],
+    variant: Optional[str] = None
+) -> str:
+    """
+    Build a content-addressed cache key for a completion request.
+
+    Args:
+        model: Model name
+        system_prompt: System message
+        user_prompt: User message
+        temperature: Sampling temperature
+        max_tokens: Maximum tokens (None if unset)
+        variant: Marks responses that are not the full completion (e.g. a
+            stream stopped early), so they never answer a plain request
+
+    Returns:
+        SHA-256 hex digest of the request fingerprint
+    """
+    request = [model, system_prompt, user_prompt, float(temperature), max_tokens]
+    if variant is not None:
+        request.append(variant)
+    fingerprint = json.dumps(request, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(fingerprint.encode("utf-8")).hexdigest()
+
+
+class MemoryCacheBackend:
+    """In-process LRU cache backend."""
+
+    # Lookups never touch disk or network, so they are safe on the event loop
+    blocking = False
+
+    def __init__(self, max_entries: int, ttl_seconds: int):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            created_at, value = item
+            if self.ttl_seconds and time.time() - created_at > self.ttl_seconds:
+                del self._entries[key]
+                self.evictions += 1
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str, model: Optional[str] = None) -> None:
+        with self._lock:
+            self._entries[key] = (time.time(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def size(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteCacheBackend:
+    """On-disk SQLite cache backend (survives restarts, shared by workers on one host)."""
+
+    blocking = True
+
+    def __init__(self, path: str, max_entries: int, ttl_seconds: int):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS llm_cache (
+                cache_key TEXT PRIMARY KEY,
+                model TEXT,
+                response TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_accessed_at REAL NOT NULL
+            )"""
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS ix_llm_cache_last_accessed ON llm_cache (last_accessed_at)"
+        )
+        self._conn.commit()
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, created_at FROM llm_cache WHERE cache_key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            response, created_at = row
+            now = time.time()
+            if self.ttl_seconds and now - created_at > self.ttl_seconds:
+                self._conn.execute("DELETE FROM llm_cache WHERE cache_key = ?", (key,))
+                self._conn.commit()
+                self.evictions += 1
+                return None
+            self._conn.execute(
+                "UPDATE llm_cache SET last_accessed_at = ? WHERE cache_key = ?", (now, key)
+            )
+            self._conn.commit()
+            return response
+
+    def set(self, key: str, value: str, model: Optional[str] = None) -> None:
+        with self._lock:
+            now = time.time()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (cache_key, model, response, created_at, last_accessed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, model, value, now, now)
+            )
+            count = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+            excess = count - self.max_entries
+            if excess > 0:
+                self._conn.execute(
+                    "DELETE FROM llm_cache WHERE cache_key IN ("
+                    "SELECT cache_key FROM llm_cache ORDER BY last_accessed_at ASC LIMIT ?)",
+                    (excess,)
+                )
+                self.evictions += excess
+            self._conn.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_cache")
+            self._conn.commit()
+
+    def size(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+
+
+class MySQLCacheBackend:
+    """Cache backend stored in the application database (llm_cache_entries table)."""
+
+    blocking = True
+
+    def __init__(self, max_entries: int, ttl_seconds: int):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.evictions = 0
+
+    def _session(self):
+        from ..database import SessionLocal
+        return SessionLocal()
+
+    def get(self, key: str) -> Optional[str]:
+        from ..tables import LLMCacheEntryRepository
+        db = self._session()
+        try:
+            repo = LLMCacheEntryRepository(db)
+            entry = repo.get_by_key(key)
+            if not entry:
+                return None
+            if self.ttl_seconds and entry.created_at < datetime.utcnow() - timedelta(seconds=self.ttl_seconds):
+                repo.delete_by_key(key)
+                self.evictions += 1
+                return None
+            response = entry.response
+            repo.touch(entry)
+            return response
+        finally:
+            db.close()
+
+    def set(self, key: str, value: str, model: Optional[str] = None) -> None:
+        from ..tables import LLMCacheEntryRepository
+        db = self._session()
+        try:
+            repo = LLMCacheEntryRepository(db)
+            repo.upsert(key, value, model=model)
+            if self.ttl_seconds:
+                self.evictions += repo.delete_older_than(
+                    datetime.utcnow() - timedelta(seconds=self.ttl_seconds)
+                )
+            self.evictions += repo.trim_to_size(self.max_entries)
+        finally:
+            db.close()
+
+    def clear(self) -> None:
+        from ..tables import LLMCacheEntryRepository
+        db = self._session()
+        try:
+            LLMCacheEntryRepository(db).clear()
+        finally:
+            db.close()
+
+    def size(self) -> int:
+        from ..tables import LLMCacheEntry
+        db = self._session()
+        try:
+            return db.query(LLMCacheEntry).count()
+        finally:
+            db.close()
+
+
+class LLMResponseCache:
+    """LLM response cache with hit/miss counters over a pluggable backend."""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    @property
+    def blocking(self) -> bool:
+        """Whether lookups do disk/network I/O and should be kept off the event loop."""
+        return self.backend.blocking
+
+    def get(self, key: str) -> Optional[str]:
+        """Look up a cached response. Backend failures count as misses."""
+        try:
+            value = self.backend.get(key)
+        except Exception:
+            value = None
+            with self._lock:
+                self.errors += 1
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, key: str, value: str, model: Optional[str] = None) -> None:
+        """Store a response. Backend failures are counted and otherwise ignored."""
+        try:
+            self.backend.set(key, value, model=model)
+        except Exception:
+            with self._lock:
+                self.errors += 1
+
+    def clear(self) -> None:
+        """Remove all cached responses."""
+        self.backend.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and backend size."""
+        lookups = self.hits + self.misses
+        try:
+            size = self.backend.size()
+        except Exception:
+            size = None
+        return {
+            "backend": type(self.backend).__name__,
+            "hits": self.hits,
+            "misses": self.misses,
+            "errors": self.errors,
+            "evictions": self.backend.evictions,
+            "hit_rate": round(self.hits / lookups * 100, 1) if lookups else 0,
+            "size": size,
+            "max_entries": self.backend.max_entries,
+            "ttl_seconds": self.backend.ttl_seconds
+        }
+
+
+_cache: Optional[LLMResponseCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> Optional[LLMResponseCache]:
+    """
+    Get the process-wide LLM response cache.
+
+    Returns:
+        Configured cache, or None if LLM_CACHE_BACKEND is "none"
+    """
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                backend_name = LLM_CACHE_BACKEND.lower()
+                if backend_name == "none":
+                    return None
+                if backend_name == "sqlite":
+                    backend = SQLiteCacheBackend(LLM_CACHE_SQLITE_PATH, LLM_CACHE_MAX_ENTRIES, LLM_CACHE_TTL_SECONDS)
+                elif backend_name == "mysql":
+                    backend = MySQLCacheBackend(LLM_CACHE_MAX_ENTRIES, LLM_CACHE_TTL_SECONDS)
+                else:
+                    backend = MemoryCacheBackend(LLM_CACHE_MAX_ENTRIES, LLM_CACHE_TTL_SECONDS)
+                _cache = LLMResponseCache(backend)
+    return _cache
@@ -1,7 +1,14 @@
 """Agent orchestration service for managing agent execution flow."""
-from typing import List, Dict, Any
+import asyncio
+import os
+import time
+from datetime import datetime
+from typing import List, Dict, Any, Callable, Awaitable
 from ..tables import AgentType, ChangeType, ChangeImpact
 
+# Default number of agents allowed to run at the same time in a DAG run
+ORCHESTRATION_MAX_CONCURRENCY = int(os.getenv("ORCHESTRATION_MAX_CONCURRENCY", "4"))
+
 
 class OrchestrationService:
     """Service for orchestrating agent execution based on changes."""
@@ -83,6 +90,87 @@ class OrchestrationService:
 
         return ordered
 
+    @staticmethod
+    def get_dependency_graph(agent_types: List[AgentType]) -> Dict[AgentType, List[AgentType]]:
+        """
+        Get the dependencies of each agent restricted to the selected agents.
+
+        Dependencies are followed transitively, so if A depends on B and B on C,
+        selecting only A and C still makes A wait for C.
+
+        Args:
+            agent_types: List of agent types to execute
+
+        Returns:
+            Mapping of agent type to the selected agent types it must wait for
+        """
+        selected = set(agent_types)
+        graph = {}
+        for agent_type in agent_types:
+            ancestors = set()
+            stack = list(OrchestrationService.AGENT_DEPENDENCIES.get(agent_type, []))
+            while stack:
+                dep = stack.pop()
+                if dep in ancestors:
+                    continue
+                ancestors.add(dep)
+                stack.extend(OrchestrationService.AGENT_DEPENDENCIES.get(dep, []))
+            graph[agent_type] = [dep for dep in agent_types if dep in ancestors and dep in selected]
+        return graph
+
+    @staticmethod
+    async def run_dag(
+        agent_types: List[AgentType],
+        run_agent: Callable[[AgentType, Dict[AgentType, Dict[str, Any]]], Awaitable[Dict[str, Any]]],
+        max_concurrency: int = ORCHESTRATION_MAX_CONCURRENCY
+    ) -> Dict[AgentType, Dict[str, Any]]:
+        """
+        Run agents concurrently, starting each one as soon as its dependencies finish.
+
+        Args:
+            agent_types: List of agent types to execute
+            run_agent: Coroutine function called with (agent_type, dependency_results)
+                that returns the agent's result dict
+            max_concurrency: Maximum number of agents running at the same time
+
+        Returns:
+            Mapping of agent type to its result, each annotated with
+            started_at/finished_at timestamps and duration_ms
+        """
+        execution_order = OrchestrationService.get_execution_order(agent_types)
+        graph = OrchestrationService.get_dependency_graph(execution_order)
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        tasks: Dict[AgentType, asyncio.Task] = {}
+        results: Dict[AgentType, Dict[str, Any]] = {}
+
+        async def run(agent_type: AgentType):
+            deps = graph[agent_type]
+            if deps:
+                await asyncio.gather(*(tasks[dep] for dep in deps))
+
+            async with semaphore:
+                started_at = datetime.utcnow()
+                start = time.perf_counter()
+                try:
+                    result = await run_agent(agent_type, {dep: results[dep] for dep in deps})
+                except Exception as e:
+                    result = {"status": "error", "error": str(e)}
+                finished_at = datetime.utcnow()
+
+            result["agent_type"] = agent_type.value
+            result["started_at"] = started_at.isoformat()
+            result["finished_at"] = finished_at.isoformat()
+            result["duration_ms"] = round((time.perf_counter() - start) * 1000, 1)
+            results[agent_type] = result
+
+        # Tasks only start running once we await, so every task is registered
+        # before any of them looks up its dependencies
+        for agent_type in execution_order:
+            tasks[agent_type] = asyncio.ensure_future(run(agent_type))
+        await asyncio.gather(*tasks.values())
+
+        return {agent_type: results[agent_type] for agent_type in execution_order}
+
     @staticmethod
     def get_affected_agents(change_type: ChangeType) -> List[AgentType]:
         """
@@ -1,8 +1,23 @@
 """Business rule service for Rule ID generation and versioning."""
 from sqlalchemy.orm import Session
-from typing import Optional
-from ..tables import BusinessRule, RuleVersion, Project
-import re
+from typing import List, Optional
+from ..tables import BusinessRule, RuleVersion, Project, RuleStatus, RuleTermRepository, RuleIdSequenceRepository
+from ..tables.rule_terms import tokenize_rule_content
+from .rule_similarity import get_rule_similarity_index, RULE_CONFLICT_TOP_K, RULE_CONFLICT_MIN_SIMILARITY
+import math
+import os
+
+# Conflict candidates must share at least this many index terms with the new
+# rule, and cover at least this share of its TF-IDF term weight
+RULE_CONFLICT_MIN_SHARED_TERMS = int(os.getenv("RULE_CONFLICT_MIN_SHARED_TERMS", "3"))
+RULE_CONFLICT_MIN_SCORE = float(os.getenv("RULE_CONFLICT_MIN_SCORE", "0.3"))
+# Conflict engine: "terms" (inverted term index) or "embeddings" (local vectors, needs numpy)
+RULE_CONFLICT_ENGINE = os.getenv("RULE_CONFLICT_ENGINE", "terms")
+
+
+def format_rule_id(number: int) -> str:
+    """Rule ID for a sequence number (BL-001, ..., BL-999, BL-1000)."""
+    return f"BL-{number:03d}"
 
 
 class RuleService:
@@ -13,6 +28,9 @@ class RuleService:
         """
         Generate next Rule ID (BL-001, BL-002, etc.).
 
+        The ID is reserved from the project's sequence, which stays locked
+        until the caller commits; commit (or roll back) promptly.
+
         Args:
             db: Database session
             project_id: Project ID
@@ -20,26 +38,25 @@ class RuleService:
         Returns:
             Next available Rule ID
         """
-        # Get the highest existing rule number for this project
-        existing_rules = db.query(BusinessRule).filter(
-            BusinessRule.project_id == project_id
-        ).all()
-
-        if not existing_rules:
-            return "BL-001"
+        return RuleService.generate_rule_ids(db, project_id, 1)[0]
 
-        # Extract numbers from existing rule IDs
-        numbers = []
-        for rule in existing_rules:
-            match = re.search(r'BL-(\d+)', rule.rule_id)
-            if match:
-                numbers.append(int(match.group(1)))
+    @staticmethod
+    def generate_rule_ids(db: Session, project_id: int, count: int) -> List[str]:
+        """
+        Reserve several consecutive Rule IDs at once (bulk rule creation).
 
-        if not numbers:
-            return "BL-001"
+        Args:
+            db: Database session
+            project_id: Project ID
+            count: Number of Rule IDs needed
 
-        next_num = max(numbers) + 1
-        return f"BL-{next_num:03d}"
+        Returns:
+            Rule IDs in ascending order
+        """
+        return [
+            format_rule_id(number)
+            for number in RuleIdSequenceRepository(db).allocate(project_id, count)
+        ]
 
     @staticmethod
     def create_rule_version(
@@ -101,43 +118,135 @@ class RuleService:
         """
         Detect potential conflicts with existing rules.
 
+        Candidates come from the project's term index (posting lists of the
+        new rule's terms), so only rules sharing vocabulary are looked at.
+        Each candidate is scored by TF-IDF-weighted overlap: the share of the
+        new rule's term weight it covers, where rare terms weigh more than
+        terms most rules use.
+
+        With RULE_CONFLICT_ENGINE=embeddings (requires numpy), candidates
+        instead come from a top-k query against the project's rule vector
+        matrix; see detect_conflicts_by_similarity.
+
         Args:
             db: Database session
             project_id: Project ID
             new_content: New rule content to check
 
         Returns:
-            List of potential conflicts
+            List of potential conflicts, highest overlap first
+        """
+        if RULE_CONFLICT_ENGINE == "embeddings" and get_rule_similarity_index():
+            return RuleService.detect_conflicts_by_similarity(db, project_id, new_content)
+
+        new_terms = tokenize_rule_content(new_content)
+        if not new_terms:
+            return []
+
+        terms = RuleTermRepository(db)
+        postings = terms.get_postings(
+            project_id, new_terms, statuses=[RuleStatus.APPROVED, RuleStatus.PENDING_APPROVAL]
+        )
+        postings = {
+            rule_pk: shared for rule_pk, shared in postings.items()
+            if len(shared) >= RULE_CONFLICT_MIN_SHARED_TERMS
+        }
+        if not postings:
+            return []
+
+        rule_count, document_frequencies = terms.get_document_frequencies(project_id, new_terms)
+        idf = {
+            term: math.log((rule_count + 1) / (document_frequencies.get(term, 0) + 1)) + 1
+            for term in new_terms
+        }
+        total_weight = sum(count * idf[term] for term, count in new_terms.items())
+
+        scored = []
+        for rule_pk, shared in postings.items():
+            weight = sum(min(count, new_terms[term]) * idf[term] for term, count in shared.items())
+            score = weight / total_weight
+            if score >= RULE_CONFLICT_MIN_SCORE:
+                scored.append((score, rule_pk, shared))
+        if not scored:
+            return []
+
+        rules = {
+            rule.id: rule for rule in db.query(BusinessRule).filter(
+                BusinessRule.id.in_([rule_pk for _, rule_pk, _ in scored])
+            )
+        }
+        scored.sort(key=lambda item: item[0], reverse=True)
+        return [
+            {
+                "rule_id": rules[rule_pk].rule_id,
+                "version": rules[rule_pk].version,
+                "score": round(score, 3),
+                # Most distinctive shared terms first
+                "overlap_keywords": sorted(shared, key=lambda term: idf[term], reverse=True)
+            }
+            for score, rule_pk, shared in scored
+            if rule_pk in rules
+        ]
+
+    @staticmethod
+    def detect_conflicts_by_similarity(
+        db: Session,
+        project_id: int,
+        new_content: str,
+        k: int = RULE_CONFLICT_TOP_K,
+        min_similarity: float = RULE_CONFLICT_MIN_SIMILARITY
+    ) -> list:
+        """
+        Detect potential conflicts by embedding similarity.
+
+        Rules are embedded locally with a hashed n-gram vectorizer; the
+        closest approved/pending rules come from one vectorized top-k query.
+
+        Args:
+            db: Database session
+            project_id: Project ID
+            new_content: New rule content to check
+            k: Maximum number of conflicts to report
+            min_similarity: Cosine similarity threshold (0-1)
+
+        Returns:
+            List of potential conflicts, most similar first (empty without numpy)
+        """
+        index = get_rule_similarity_index()
+        if index is None:
+            return []
+        similar = index.similar_rules(db, project_id, new_content, k=k, min_similarity=min_similarity)
+        if not similar:
+            return []
+
+        rules = {
+            rule.id: rule for rule in db.query(BusinessRule).filter(
+                BusinessRule.id.in_([rule_pk for rule_pk, _ in similar]),
+                BusinessRule.status.in_([RuleStatus.APPROVED, RuleStatus.PENDING_APPROVAL])
+            )
+        }
+        new_terms = tokenize_rule_content(new_content)
+        return [
+            {
+                "rule_id": rules[rule_pk].rule_id,
+                "version": rules[rule_pk].version,
+                "score": round(similarity, 3),
+                "overlap_keywords": sorted(set(new_terms) & set(tokenize_rule_content(rules[rule_pk].content)))
+            }
+            for rule_pk, similarity in similar
+            if rule_pk in rules
+        ]
+
+    @staticmethod
+    def index_rule(db: Session, rule: BusinessRule) -> None:
+        """
+        Stage a rule's term index update after its content was set or changed.
+
+        Flushes so a new rule has its primary key; commit afterwards.
+
+        Args:
+            db: Database session
+            rule: Created or edited business rule
         """
-        existing_rules = db.query(BusinessRule).filter(
-            BusinessRule.project_id == project_id,
-            BusinessRule.status.in_(["approved", "pending_approval"])
-        ).all()
-
-        conflicts = []
-        # Simple keyword-based conflict detection
-        # In production, this would use more sophisticated NLP
-        # Ensure new_content is a string
-        if not isinstance(new_content, str):
-            if isinstance(new_content, dict):
-                new_content = str(new_content)
-            else:
-                new_content = str(new_content) if new_content else ""
-        
-        new_keywords = set(re.findall(r'\b\w+\b', new_content.lower()))
-
-        for rule in existing_rules:
-            # Ensure rule.content is a string
-            rule_content = rule.content
-            if not isinstance(rule_content, str):
-                rule_content = str(rule_content) if rule_content else ""
-            rule_keywords = set(re.findall(r'\b\w+\b', rule_content.lower()))
-            overlap = new_keywords.intersection(rule_keywords)
-            if len(overlap) > 5:  # Threshold for potential conflict
-                conflicts.append({
-                    "rule_id": rule.rule_id,
-                    "version": rule.version,
-                    "overlap_keywords": list(overlap)
-                })
-
-        return conflicts
+        db.flush()
+        RuleTermRepository(db).index_rule(rule)
@@ -0,0 +1,265 @@
+"""Local embedding similarity index for business rule conflict detection."""
+import importlib.util
+import math
+import os
+import re
+import threading
+import zlib
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import func, or_
+from sqlalchemy.orm import Session
+from ..tables import BusinessRule, RuleStatus
+from ..tables.rule_terms import tokenize_rule_content
+
+# Vector engine settings from environment variables
+RULE_EMBEDDING_DIM = int(os.getenv("RULE_EMBEDDING_DIM", "256"))
+RULE_CONFLICT_TOP_K = int(os.getenv("RULE_CONFLICT_TOP_K", "10"))
+RULE_CONFLICT_MIN_SIMILARITY = float(os.getenv("RULE_CONFLICT_MIN_SIMILARITY", "0.5"))
+# Projects with fewer rules are scanned exactly (one matrix-vector product);
+# larger ones go through the random-hyperplane LSH tables first
+RULE_ANN_MIN_ROWS = int(os.getenv("RULE_ANN_MIN_ROWS", "20000"))
+RULE_ANN_TABLES = int(os.getenv("RULE_ANN_TABLES", "8"))
+RULE_ANN_BITS = int(os.getenv("RULE_ANN_BITS", "10"))
+
+# The vector engine needs the optional 'numpy' package
+NUMPY_AVAILABLE = importlib.util.find_spec("numpy") is not None
+if NUMPY_AVAILABLE:
+    import numpy as np
+
+# Rule statuses conflicts are checked against
+CONFLICT_STATUSES = (RuleStatus.APPROVED, RuleStatus.PENDING_APPROVAL)
+
+_WORD_RE = re.compile(r'\w+')
+
+
+def _bucket(feature: str) -> Tuple[int, float]:
+    """Hashed vector position and sign of a feature (stable across processes)."""
+    digest = zlib.crc32(feature.encode("utf-8"))
+    return digest % RULE_EMBEDDING_DIM, 1.0 if digest & 0x80000000 else -1.0
+
+
+def embed_rule_text(text) -> "np.ndarray":
+    """
+    Embed rule text with a hashed n-gram vectorizer.
+
+    Features are content terms (sublinear TF), adjacent word pairs and
+    character trigrams of each term, so "refund"/"refunds"/"refunded" land
+    close together. No model download; the vector is L2-normalized, so a
+    dot product is the cosine similarity.
+
+    Args:
+        text: Rule content
+
+    Returns:
+        float32 vector of RULE_EMBEDDING_DIM
+    """
+    vector = np.zeros(RULE_EMBEDDING_DIM, dtype=np.float32)
+    terms = tokenize_rule_content(text)
+    for term, count in terms.items():
+        index, sign = _bucket(term)
+        vector[index] += sign * (1.0 + math.log(count))
+        padded = f"<{term}>"
+        for start in range(len(padded) - 2):
+            index, sign = _bucket(padded[start:start + 3])
+            vector[index] += sign * 0.5
+
+    words = [word for word in _WORD_RE.findall(str(text or "").lower()) if word in terms]
+    for first, second in zip(words, words[1:]):
+        index, sign = _bucket(f"{first} {second}")
+        vector[index] += sign * 0.7
+
+    norm = float(np.linalg.norm(vector))
+    if norm:
+        vector /= norm
+    return vector
+
+
+class _ProjectVectors:
+    """Rule vectors of one project as a growable matrix, plus LSH tables."""
+
+    def __init__(self):
+        self.matrix = np.zeros((16, RULE_EMBEDDING_DIM), dtype=np.float32)
+        self.active = np.zeros(16, dtype=bool)
+        self.rule_pks: List[int] = []
+        self.row_of: Dict[int, int] = {}
+        # (rule count, latest updated_at, highest id) of the rows this index reflects
+        self.stamp: Optional[Tuple[int, object, int]] = None
+        self._tables: Optional[List[Dict[int, List[int]]]] = None
+
+    def __len__(self) -> int:
+        return len(self.rule_pks)
+
+    def upsert(self, rule_pk: int, vector: "np.ndarray", active: bool) -> None:
+        row = self.row_of.get(rule_pk)
+        if row is None:
+            row = len(self.rule_pks)
+            if row == len(self.matrix):
+                self.matrix = np.concatenate([self.matrix, np.zeros_like(self.matrix)])
+                self.active = np.concatenate([self.active, np.zeros_like(self.active)])
+            self.rule_pks.append(rule_pk)
+            self.row_of[rule_pk] = row
+        self.matrix[row] = vector
+        self.active[row] = active
+        self._tables = None
+
+    def top_k(self, vector: "np.ndarray", k: int, min_similarity: float) -> List[Tuple[int, float]]:
+        """Most similar active rules as (rule pk, cosine similarity), best first."""
+        count = len(self.rule_pks)
+        if not count:
+            return []
+        if count >= RULE_ANN_MIN_ROWS:
+            rows = self._candidate_rows(vector)
+            if not len(rows):
+                return []
+            scores = self.matrix[rows] @ vector
+        else:
+            rows = np.arange(count)
+            scores = self.matrix[:count] @ vector
+        scores = np.where(self.active[rows] & (scores >= min_similarity), scores, -np.inf)
+
+        k = min(k, len(rows))
+        best = np.argpartition(-scores, k - 1)[:k]
+        best = best[np.argsort(-scores[best])]
+        return [
+            (self.rule_pks[rows[i]], float(scores[i]))
+            for i in best
+            if scores[i] != -np.inf
+        ]
+
+    def _candidate_rows(self, vector: "np.ndarray") -> "np.ndarray":
+        """Rows sharing an LSH bucket with the vector in any table."""
+        planes = _hyperplanes()
+        if self._tables is None:
+            codes = self._codes(self.matrix[:len(self.rule_pks)], planes)
+            self._tables = []
+            for table_codes in codes:
+                table: Dict[int, List[int]] = {}
+                for row, code in enumerate(table_codes.tolist()):
+                    table.setdefault(code, []).append(row)
+                self._tables.append(table)
+        query_codes = self._codes(vector[None, :], planes)
+        rows = set()
+        for table, code in zip(self._tables, query_codes[:, 0].tolist()):
+            rows.update(table.get(code, ()))
+        return np.fromiter(rows, dtype=np.int64, count=len(rows))
+
+    @staticmethod
+    def _codes(vectors: "np.ndarray", planes: "np.ndarray") -> "np.ndarray":
+        """Bucket code of each vector in each table, shape (tables, n)."""
+        bits = np.einsum("tbd,nd->tnb", planes, vectors) > 0
+        return bits @ (1 << np.arange(RULE_ANN_BITS, dtype=np.int64))
+
+
+_planes: Optional["np.ndarray"] = None
+
+
+def _hyperplanes() -> "np.ndarray":
+    """Random hyperplanes for the LSH tables (fixed seed, shared by all projects)."""
+    global _planes
+    if _planes is None:
+        rng = np.random.default_rng(0)
+        _planes = rng.standard_normal((RULE_ANN_TABLES, RULE_ANN_BITS, RULE_EMBEDDING_DIM)).astype(np.float32)
+    return _planes
+
+
+class RuleSimilarityIndex:
+    """
+    Per-project rule vector matrices, kept in sync with business_rules.
+
+    Each query first compares the project's (rule count, latest updated_at,
+    highest id) with the stamp of its matrix and re-embeds only rules changed
+    or added since. updated_at is set when a statement runs, not at commit,
+    so a rule from a long transaction can commit with a timestamp older than
+    the stamp; such rows are caught by id, and if the matrix still holds a
+    different number of rules than the table (e.g. ids committed out of
+    order, deleted rules), it is rebuilt.
+    Candidates are re-read from the database, so a stale row can never
+    surface as a conflict.
+    """
+
+    def __init__(self):
+        self._projects: Dict[int, _ProjectVectors] = {}
+        self._lock = threading.Lock()
+
+    def similar_rules(
+        self,
+        db: Session,
+        project_id: int,
+        text,
+        k: int = RULE_CONFLICT_TOP_K,
+        min_similarity: float = RULE_CONFLICT_MIN_SIMILARITY
+    ) -> List[Tuple[int, float]]:
+        """
+        Top-k approved/pending rules most similar to a text.
+
+        Args:
+            db: Database session
+            project_id: Project ID
+            text: Rule text to compare
+            k: Maximum number of results
+            min_similarity: Cosine similarity threshold (0-1)
+
+        Returns:
+            (business rule pk, similarity) pairs, best first
+        """
+        vector = embed_rule_text(text)
+        if not vector.any():
+            return []
+        with self._lock:
+            vectors = self._refresh(db, project_id)
+            return vectors.top_k(vector, k, min_similarity)
+
+    def _refresh(self, db: Session, project_id: int) -> _ProjectVectors:
+        """Bring a project's vectors up to date with business_rules."""
+        count, latest, max_id = db.query(
+            func.count(BusinessRule.id), func.max(BusinessRule.updated_at), func.max(BusinessRule.id)
+        ).filter(BusinessRule.project_id == project_id).one()
+        stamp = (count, latest, max_id)
+
+        vectors = self._projects.get(project_id)
+        if vectors is not None and vectors.stamp == stamp:
+            return vectors
+
+        query = db.query(BusinessRule.id, BusinessRule.content, BusinessRule.status).filter(
+            BusinessRule.project_id == project_id
+        )
+        if vectors is None or count < len(vectors) or vectors.stamp is None or vectors.stamp[1] is None:
+            return self._rebuild(query, project_id, stamp)
+
+        # Same-second updates share a timestamp, so include the boundary
+        changed = query.filter(or_(
+            BusinessRule.updated_at >= vectors.stamp[1],
+            BusinessRule.id > vectors.stamp[2]
+        ))
+        for rule_pk, content, status in changed.yield_per(500):
+            vectors.upsert(rule_pk, embed_rule_text(content), status in CONFLICT_STATUSES)
+        if len(vectors) != count:
+            # A committed rule neither filter saw
+            return self._rebuild(query, project_id, stamp)
+        vectors.stamp = stamp
+        return vectors
+
+    def _rebuild(self, query, project_id: int, stamp: Tuple[int, object, int]) -> _ProjectVectors:
+        """Embed every rule of a project into a new matrix."""
+        vectors = _ProjectVectors()
+        for rule_pk, content, status in query.yield_per(500):
+            vectors.upsert(rule_pk, embed_rule_text(content), status in CONFLICT_STATUSES)
+        vectors.stamp = stamp
+        self._projects[project_id] = vectors
+        return vectors
+
+
+_index: Optional[RuleSimilarityIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_rule_similarity_index() -> Optional[RuleSimilarityIndex]:
+    """Get the process-wide rule similarity index (None without numpy)."""
+    global _index
+    if not NUMPY_AVAILABLE:
+        return None
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = RuleSimilarityIndex()
+    return _index
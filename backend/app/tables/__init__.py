@@ -4,12 +4,18 @@ from .code_files import CodeFile, CodeFileRepository
 from .issues import Issue, IssueStatus, IssueRepository
 from .suggestions import Suggestion, SuggestionStatus, AgentType, SuggestionRepository
 from .approvals import Approval, ApprovalRepository
-from .agent_runs import AgentRun, AgentRunRepository
+from .agent_runs import AgentRun, AgentRunStatus, AgentRunRepository
 from .business_rules import BusinessRule, RuleStatus, BusinessRuleRepository
 from .rule_versions import RuleVersion, RuleVersionRepository
 from .change_impacts import ChangeImpact, ChangeType, RiskLevel, ChangeImpactRepository
 from .agent_dependencies import AgentDependency, AgentDependencyRepository
 from .release_checklists import ReleaseChecklist, ReleaseChecklistRepository
+from .llm_cache_entries import LLMCacheEntry, LLMCacheEntryRepository
+from .dashboard_metrics import DashboardMetric, DashboardMetricRepository
+from .code_file_analyses import CodeFileAnalysis, CodeFileAnalysisRepository
+from .rule_terms import RuleTerm, RuleTermRepository
+from .rule_id_sequences import RuleIdSequence, RuleIdSequenceRepository
+from .code_symbols import CodeSymbol, CodeSymbolRepository
 
 __all__ = [
     # Models
@@ -24,10 +30,17 @@ __all__ = [
     "ChangeImpact",
     "AgentDependency",
     "ReleaseChecklist",
+    "LLMCacheEntry",
+    "DashboardMetric",
+    "CodeFileAnalysis",
+    "RuleTerm",
+    "RuleIdSequence",
+    "CodeSymbol",
     # Enums
     "AgentType",
     "SuggestionStatus",
     "IssueStatus",
+    "AgentRunStatus",
     "RuleStatus",
     "ChangeType",
     "RiskLevel",
@@ -43,4 +56,10 @@ __all__ = [
     "ChangeImpactRepository",
     "AgentDependencyRepository",
     "ReleaseChecklistRepository",
+    "LLMCacheEntryRepository",
+    "DashboardMetricRepository",
+    "CodeFileAnalysisRepository",
+    "RuleTermRepository",
+    "RuleIdSequenceRepository",
+    "CodeSymbolRepository",
 ]
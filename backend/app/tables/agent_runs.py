@@ -1,25 +1,50 @@
 """Agent runs table schema, types, and repository methods."""
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum as SQLEnum
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index, Enum as SQLEnum, or_, and_
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
-from typing import Optional, List
+from datetime import datetime
+from typing import Optional, List, Dict
+import enum
 from ..database import Base
+from .dashboard_metrics import DashboardMetricRepository
 
 # Import AgentType from suggestions module
 from .suggestions import AgentType
 
 
+class AgentRunStatus(str, enum.Enum):
+    """Agent run status enumeration."""
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCESS = "success"
+    ERROR = "error"
+
+
 class AgentRun(Base):
-    """Agent execution history model."""
+    """Agent execution history model (also the record for background jobs)."""
     __tablename__ = "agent_runs"
+    __table_args__ = (
+        # Latest/all runs of one agent for a project (get_latest_by_project_and_agent)
+        Index("ix_agent_runs_project_agent_created", "project_id", "agent_type", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     agent_type = Column(SQLEnum(AgentType, native_enum=True), nullable=False, index=True)
     project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False, index=True)
-    status = Column(String(50), nullable=False)
+    status = Column(String(50), nullable=False, index=True)
     result_summary = Column(Text, nullable=True)
     error_message = Column(Text, nullable=True)
     triggered_by_rule_id = Column(String(50), nullable=True)
+    # Background job fields (unused for synchronous runs)
+    job_params = Column(Text, nullable=True)  # JSON analyze() kwargs
+    result = Column(Text, nullable=True)  # JSON analyze() result
+    progress = Column(Integer, default=0, nullable=False)
+    worker_id = Column(String(255), nullable=True)
+    started_at = Column(DateTime, nullable=True)
+    # Lease of the claiming worker: renewed while the job runs, re-queued once it expires
+    heartbeat_at = Column(DateTime, nullable=True)
+    attempts = Column(Integer, default=0, nullable=False)
+    finished_at = Column(DateTime, nullable=True)
     created_at = Column(DateTime, default=func.now(), nullable=False)
 
     # Relationships
@@ -51,10 +76,169 @@ class AgentRunRepository:
             triggered_by_rule_id=triggered_by_rule_id
         )
         self.db.add(agent_run)
+        DashboardMetricRepository(self.db).record_agent_run_created(agent_run)
+        self.db.commit()
+        self.db.refresh(agent_run)
+        return agent_run
+
+    def enqueue(
+        self,
+        agent_type: AgentType,
+        project_id: int,
+        job_params: str
+    ) -> AgentRun:
+        """Create a queued background job."""
+        agent_run = AgentRun(
+            agent_type=agent_type,
+            project_id=project_id,
+            status=AgentRunStatus.QUEUED.value,
+            job_params=job_params,
+            progress=0
+        )
+        self.db.add(agent_run)
+        DashboardMetricRepository(self.db).record_agent_run_created(agent_run)
+        self.db.commit()
+        self.db.refresh(agent_run)
+        return agent_run
+
+    def claim_next_queued(self, worker_id: str) -> Optional[AgentRun]:
+        """
+        Atomically claim the oldest queued job and mark it running.
+
+        Uses SELECT ... FOR UPDATE SKIP LOCKED so concurrent workers (threads
+        or processes) never claim the same job.
+        """
+        agent_run = self.db.query(AgentRun).filter(
+            AgentRun.status == AgentRunStatus.QUEUED.value
+        ).order_by(AgentRun.id.asc()).with_for_update(skip_locked=True).first()
+        if not agent_run:
+            self.db.rollback()
+            return None
+
+        now = datetime.utcnow()
+        agent_run.status = AgentRunStatus.RUNNING.value
+        agent_run.worker_id = worker_id
+        agent_run.started_at = now
+        agent_run.heartbeat_at = now
+        agent_run.attempts = (agent_run.attempts or 0) + 1
+        agent_run.progress = 0
         self.db.commit()
         self.db.refresh(agent_run)
         return agent_run
 
+    def update_progress(self, run_id: int, progress: int) -> None:
+        """Update job progress (0-100)."""
+        self.db.query(AgentRun).filter(AgentRun.id == run_id).update(
+            {AgentRun.progress: max(0, min(100, progress))},
+            synchronize_session=False
+        )
+        self.db.commit()
+
+    def heartbeat(self, leases: Dict[int, str]) -> None:
+        """
+        Renew the leases of running jobs (job id -> worker id).
+
+        A job is only renewed while it is still running under that worker,
+        so a lease that already expired and was re-queued stays lost.
+        """
+        if not leases:
+            return
+        now = datetime.utcnow()
+        for run_id, worker_id in leases.items():
+            self.db.query(AgentRun).filter(
+                AgentRun.id == run_id,
+                AgentRun.worker_id == worker_id,
+                AgentRun.status == AgentRunStatus.RUNNING.value
+            ).update({AgentRun.heartbeat_at: now}, synchronize_session=False)
+        self.db.commit()
+
+    def finish(
+        self,
+        run_id: int,
+        status: str,
+        result: Optional[str] = None,
+        result_summary: Optional[str] = None,
+        error_message: Optional[str] = None,
+        worker_id: Optional[str] = None
+    ) -> Optional[AgentRun]:
+        """
+        Mark a job as finished with its result.
+
+        With worker_id, only a job still running under that worker is
+        finished: a worker whose lease expired must not overwrite the
+        status of the retry.
+        """
+        agent_run = self.get_by_id(run_id)
+        if not agent_run:
+            return None
+        if worker_id is not None and (
+            agent_run.worker_id != worker_id or agent_run.status != AgentRunStatus.RUNNING.value
+        ):
+            self.db.rollback()
+            return None
+
+        old_status = agent_run.status
+        agent_run.status = status
+        agent_run.progress = 100
+        agent_run.finished_at = datetime.utcnow()
+        if result is not None:
+            agent_run.result = result
+        if result_summary is not None:
+            agent_run.result_summary = result_summary
+        if error_message is not None:
+            agent_run.error_message = error_message
+        DashboardMetricRepository(self.db).record_agent_run_status_change(agent_run, old_status)
+        self.db.commit()
+        self.db.refresh(agent_run)
+        return agent_run
+
+    def requeue_expired(self, lease_expired_before: datetime, max_attempts: int) -> Dict[str, int]:
+        """
+        Recover running jobs whose worker stopped renewing its lease (e.g. after a crash).
+
+        Jobs with attempts left go back to the queue; jobs that already
+        used max_attempts are marked as errors, so a job that kills its
+        worker is not retried forever.
+
+        Args:
+            lease_expired_before: Jobs whose last heartbeat is older than this
+            max_attempts: Claims allowed per job
+
+        Returns:
+            Counts of requeued and failed jobs
+        """
+        expired = self.db.query(AgentRun).filter(
+            AgentRun.status == AgentRunStatus.RUNNING.value,
+            or_(
+                AgentRun.heartbeat_at < lease_expired_before,
+                # Rows claimed before heartbeats existed
+                and_(AgentRun.heartbeat_at.is_(None), AgentRun.started_at < lease_expired_before)
+            )
+        ).with_for_update(skip_locked=True).all()
+
+        counts = {"requeued": 0, "failed": 0}
+        metrics = DashboardMetricRepository(self.db)
+        for agent_run in expired:
+            if (agent_run.attempts or 0) >= max_attempts:
+                old_status = agent_run.status
+                agent_run.status = AgentRunStatus.ERROR.value
+                agent_run.progress = 100
+                agent_run.finished_at = datetime.utcnow()
+                agent_run.error_message = (
+                    f"Worker {agent_run.worker_id} stopped responding; giving up after {agent_run.attempts} attempts"
+                )
+                metrics.record_agent_run_status_change(agent_run, old_status)
+                counts["failed"] += 1
+            else:
+                agent_run.status = AgentRunStatus.QUEUED.value
+                agent_run.worker_id = None
+                agent_run.started_at = None
+                agent_run.heartbeat_at = None
+                agent_run.progress = 0
+                counts["requeued"] += 1
+        self.db.commit()
+        return counts
+
     def get_by_id(self, run_id: int) -> Optional[AgentRun]:
         """Get agent run by ID."""
         return self.db.query(AgentRun).filter(AgentRun.id == run_id).first()
@@ -87,6 +271,7 @@ class AgentRunRepository:
         if not agent_run:
             return False
         
+        DashboardMetricRepository(self.db).record_agent_run_deleted(agent_run)
         self.db.delete(agent_run)
         self.db.commit()
         return True
@@ -1,5 +1,5 @@
 """Business rules table schema, types, and repository methods."""
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum as SQLEnum
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index, Enum as SQLEnum
 from sqlalchemy.orm import relationship, foreign
 from sqlalchemy.sql import func
 from typing import Optional, List
@@ -18,6 +18,10 @@ class RuleStatus(str, enum.Enum):
 class BusinessRule(Base):
     """Business Logic & Policy Rule model."""
     __tablename__ = "business_rules"
+    __table_args__ = (
+        # Approved/pending rules of a project (agents, conflict detection)
+        Index("ix_business_rules_project_status", "project_id", "status"),
+    )
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     rule_id = Column(String(50), nullable=False, unique=True, index=True)
@@ -58,6 +62,8 @@ class BusinessRuleRepository:
         created_by: Optional[str] = None
     ) -> BusinessRule:
         """Create a new business rule."""
+        from .rule_terms import RuleTermRepository
+
         rule = BusinessRule(
             rule_id=rule_id,
             project_id=project_id,
@@ -67,6 +73,8 @@ class BusinessRuleRepository:
             created_by=created_by
         )
         self.db.add(rule)
+        self.db.flush()
+        RuleTermRepository(self.db).index_rule(rule)
         self.db.commit()
         self.db.refresh(rule)
         return rule
@@ -121,6 +129,9 @@ class BusinessRuleRepository:
         for key, value in kwargs.items():
             if hasattr(rule, key):
                 setattr(rule, key, value)
+        if "content" in kwargs:
+            from .rule_terms import RuleTermRepository
+            RuleTermRepository(self.db).index_rule(rule)
         
         self.db.commit()
         self.db.refresh(rule)
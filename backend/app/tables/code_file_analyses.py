@@ -0,0 +1,84 @@
+"""Code file analyses table schema and repository methods."""
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, UniqueConstraint, Enum as SQLEnum
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from ..database import Base
+from .suggestions import AgentType
+
+
+class CodeFileAnalysis(Base):
+    """Content hash of a code file when an agent last analyzed it (drives incremental runs)."""
+    __tablename__ = "code_file_analyses"
+    __table_args__ = (
+        UniqueConstraint("code_file_id", "agent_type", name="uq_code_file_analyses_file_agent"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    code_file_id = Column(Integer, ForeignKey("code_files.id", ondelete="CASCADE"), nullable=False, index=True)
+    agent_type = Column(SQLEnum(AgentType, native_enum=True), nullable=False)
+    content_hash = Column(String(64), nullable=False)
+    # Fingerprint of other prompt inputs (e.g. business rules); None if the agent uses none
+    context_hash = Column(String(64), nullable=True)
+    analyzed_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+class CodeFileAnalysisRepository:
+    """Repository methods for CodeFileAnalysis table."""
+
+    def __init__(self, db):
+        self.db = db
+
+    def get_hashes(
+        self,
+        agent_type: AgentType,
+        code_file_ids: Optional[List[int]] = None
+    ) -> Dict[int, Tuple[str, Optional[str]]]:
+        """Get (content_hash, context_hash) of each code file's last analysis by an agent."""
+        query = self.db.query(
+            CodeFileAnalysis.code_file_id, CodeFileAnalysis.content_hash, CodeFileAnalysis.context_hash
+        ).filter(CodeFileAnalysis.agent_type == agent_type)
+        if code_file_ids is not None:
+            if not code_file_ids:
+                return {}
+            query = query.filter(CodeFileAnalysis.code_file_id.in_(code_file_ids))
+        return {
+            code_file_id: (content_hash, context_hash)
+            for code_file_id, content_hash, context_hash in query.all()
+        }
+
+    def record(
+        self,
+        agent_type: AgentType,
+        hashes: Dict[int, str],
+        context_hash: Optional[str] = None
+    ) -> None:
+        """
+        Store the analyzed content hash for each code file (code_file_id -> hash).
+
+        Only flushes: the caller commits, so an agent run records its
+        baseline in the same transaction as its suggestions.
+        """
+        if not hashes:
+            return
+        now = datetime.utcnow()
+        existing = {
+            analysis.code_file_id: analysis for analysis in self.db.query(CodeFileAnalysis).filter(
+                CodeFileAnalysis.agent_type == agent_type,
+                CodeFileAnalysis.code_file_id.in_(list(hashes))
+            )
+        }
+        for code_file_id, content_hash in hashes.items():
+            analysis = existing.get(code_file_id)
+            if analysis:
+                analysis.content_hash = content_hash
+                analysis.context_hash = context_hash
+                analysis.analyzed_at = now
+            else:
+                self.db.add(CodeFileAnalysis(
+                    code_file_id=code_file_id,
+                    agent_type=agent_type,
+                    content_hash=content_hash,
+                    context_hash=context_hash,
+                    analyzed_at=now
+                ))
+        self.db.flush()
@@ -1,20 +1,32 @@
 """Code files table schema, types, and repository methods."""
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index, insert, update
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
-from typing import Optional, List
+from typing import Optional, List, Dict, Any
+import hashlib
+from datetime import datetime
 from ..database import Base
 
 
+def compute_content_hash(content: str) -> str:
+    """SHA-256 hex digest of file content (matches MySQL SHA2(content, 256) on utf8mb4)."""
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
 class CodeFile(Base):
     """Code file model."""
     __tablename__ = "code_files"
+    __table_args__ = (
+        # get_by_project_and_path; also covers upsert_batch's existing-row lookup
+        Index("ix_code_files_project_path", "project_id", "file_path", "content_hash", "language"),
+    )
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False, index=True)
     file_path = Column(String(512), nullable=False)
     content = Column(Text, nullable=False)
     language = Column(String(50), nullable=True)
+    content_hash = Column(String(64), nullable=True, index=True)
     created_at = Column(DateTime, default=func.now(), nullable=False)
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), nullable=False)
 
@@ -35,7 +47,8 @@ class CodeFileRepository:
             project_id=project_id,
             file_path=file_path,
             content=content,
-            language=language
+            language=language,
+            content_hash=compute_content_hash(content)
         )
         self.db.add(code_file)
         self.db.commit()
@@ -50,6 +63,21 @@ class CodeFileRepository:
         """Get all code files for a project."""
         return self.db.query(CodeFile).filter(CodeFile.project_id == project_id).order_by(CodeFile.created_at.desc()).all()
 
+    def get_change_summaries(self, project_id: int, since: Optional[datetime] = None) -> List[Any]:
+        """
+        Get lightweight rows (id, file_path, language, content_hash, updated_at) without content.
+
+        Args:
+            project_id: Project ID
+            since: Only files created or modified after this time
+        """
+        query = self.db.query(
+            CodeFile.id, CodeFile.file_path, CodeFile.language, CodeFile.content_hash, CodeFile.updated_at
+        ).filter(CodeFile.project_id == project_id)
+        if since is not None:
+            query = query.filter(CodeFile.updated_at > since)
+        return query.order_by(CodeFile.updated_at.asc()).all()
+
     def get_by_project_and_path(self, project_id: int, file_path: str) -> Optional[CodeFile]:
         """Get code file by project ID and file path."""
         return self.db.query(CodeFile).filter(
@@ -57,6 +85,66 @@ class CodeFileRepository:
             CodeFile.file_path == file_path
         ).first()
 
+    def upsert_batch(self, project_id: int, files: List[Dict[str, Any]]) -> Dict[str, int]:
+        """
+        Insert or update a batch of code files by path without committing.
+
+        Existing rows are looked up with one SELECT; new files go in one
+        multi-row INSERT and changed files in one executemany UPDATE. The
+        caller commits, so many batches can share a single transaction.
+
+        Args:
+            project_id: Project ID
+            files: Dicts with file_path, content and optional language
+
+        Returns:
+            Counts of created, updated and unchanged files
+        """
+        # Last occurrence of a path wins
+        by_path = {f["file_path"]: f for f in files}
+        if not by_path:
+            return {"created": 0, "updated": 0, "unchanged": 0}
+
+        existing = {
+            row.file_path: row for row in self.db.query(
+                CodeFile.id, CodeFile.file_path, CodeFile.content_hash, CodeFile.language
+            ).filter(
+                CodeFile.project_id == project_id,
+                CodeFile.file_path.in_(list(by_path))
+            )
+        }
+
+        new_rows = []
+        changed_rows = []
+        unchanged = 0
+        for file_path, f in by_path.items():
+            language = f.get("language") or None
+            content_hash = compute_content_hash(f["content"])
+            row = existing.get(file_path)
+            if row is None:
+                new_rows.append({
+                    "project_id": project_id,
+                    "file_path": file_path,
+                    "content": f["content"],
+                    "language": language,
+                    "content_hash": content_hash
+                })
+            elif row.content_hash != content_hash or (language and row.language != language):
+                changed_rows.append({
+                    "id": row.id,
+                    "content": f["content"],
+                    "language": language or row.language,
+                    "content_hash": content_hash
+                })
+            else:
+                unchanged += 1
+
+        if new_rows:
+            self.db.execute(insert(CodeFile), new_rows)
+        if changed_rows:
+            self.db.execute(update(CodeFile), changed_rows)
+        return {"created": len(new_rows), "updated": len(changed_rows), "unchanged": unchanged}
+
     def update(self, file_id: int, **kwargs) -> Optional[CodeFile]:
         """Update code file fields."""
         code_file = self.get_by_id(file_id)
@@ -66,6 +154,8 @@ class CodeFileRepository:
         for key, value in kwargs.items():
             if hasattr(code_file, key):
                 setattr(code_file, key, value)
+        if "content" in kwargs:
+            code_file.content_hash = compute_content_hash(code_file.content)
         
         self.db.commit()
         self.db.refresh(code_file)
@@ -0,0 +1,229 @@
+"""Code symbol index table schema and repository methods."""
+import math
+import re
+from sqlalchemy import Column, Integer, String, ForeignKey, Index, insert, update
+from typing import Dict, Iterable, List, Optional, Tuple
+from ..database import Base
+from ..utils.symbol_extractor import DEFINITION, IMPORT, REFERENCE, MAX_NAME_LENGTH, extract_symbols
+from .code_files import CodeFile, compute_content_hash
+
+# Files re-extracted per SELECT/DELETE/INSERT round trip during a refresh
+REFRESH_BATCH_SIZE = 100
+
+# Relevance of a name match by symbol kind: defining a name says more about a
+# file than importing or calling it
+KIND_WEIGHTS = {DEFINITION: 3.0, IMPORT: 1.0, REFERENCE: 1.0}
+
+_IDENTIFIER_RE = re.compile(r'[A-Za-z_$][\w$]*(?:\.[A-Za-z_$][\w$]*)*')
+
+
+class CodeSymbol(Base):
+    """A definition, import or call reference found in a code file."""
+    __tablename__ = "code_symbols"
+    __table_args__ = (
+        # Lookups by name within a project
+        Index("ix_code_symbols_project_name", "project_id", "name"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False)
+    code_file_id = Column(Integer, ForeignKey("code_files.id", ondelete="CASCADE"), nullable=False, index=True)
+    name = Column(String(MAX_NAME_LENGTH), nullable=False)
+    qualified_name = Column(String(512), nullable=True)
+    kind = Column(String(20), nullable=False)  # definition, import, reference
+    symbol_type = Column(String(20), nullable=True)  # module, class, function, method, variable, call, ...
+    line = Column(Integer, nullable=True)
+    # Set on the file's module row only: the CodeFile content_hash these symbols reflect
+    content_hash = Column(String(64), nullable=True)
+
+
+def name_terms(text: str, limit: int = 200) -> List[str]:
+    """
+    Candidate symbol names mentioned in free text (issue, rule, prompt).
+
+    Dotted names contribute every part ("orders.refund_total" ->
+    "orders.refund_total", "orders", "refund_total").
+    """
+    names = []
+    seen = set()
+    for match in _IDENTIFIER_RE.finditer(text or ""):
+        dotted = match.group(0)
+        for name in [dotted] + dotted.split("."):
+            if len(name) > 2 and len(name) <= MAX_NAME_LENGTH and name not in seen:
+                seen.add(name)
+                names.append(name)
+    return names[:limit]
+
+
+class CodeSymbolRepository:
+    """
+    Repository methods for CodeSymbol table.
+
+    The index follows code_files lazily: refresh compares each file's
+    content_hash with the hash its symbols were extracted from and
+    re-extracts only the files that changed. Rows of deleted files go with
+    the ON DELETE CASCADE.
+    """
+
+    def __init__(self, db):
+        self.db = db
+
+    def refresh(self, project_id: int) -> int:
+        """
+        Re-extract symbols of new and changed files of a project without committing.
+
+        The caller commits, so an agent's index refresh lands in the same
+        transaction as its suggestions.
+
+        Args:
+            project_id: Project ID
+
+        Returns:
+            Number of files (re)indexed
+        """
+        indexed_hashes = dict(self.db.query(CodeSymbol.code_file_id, CodeSymbol.content_hash).filter(
+            CodeSymbol.project_id == project_id,
+            CodeSymbol.kind == DEFINITION,
+            CodeSymbol.symbol_type == "module"
+        ).all())
+        stale = [
+            file_id for file_id, content_hash in self.db.query(CodeFile.id, CodeFile.content_hash).filter(
+                CodeFile.project_id == project_id
+            )
+            if content_hash is None or indexed_hashes.get(file_id) != content_hash
+        ]
+        if not stale:
+            return 0
+
+        for start in range(0, len(stale), REFRESH_BATCH_SIZE):
+            self._index_files(project_id, stale[start:start + REFRESH_BATCH_SIZE])
+        self.db.flush()
+        return len(stale)
+
+    def _index_files(self, project_id: int, file_ids: List[int]) -> None:
+        """Replace the symbols of a batch of files."""
+        files = self.db.query(
+            CodeFile.id, CodeFile.file_path, CodeFile.language, CodeFile.content, CodeFile.content_hash
+        ).filter(CodeFile.id.in_(file_ids)).all()
+
+        rows = []
+        backfilled = []
+        for file in files:
+            content_hash = file.content_hash
+            if content_hash is None:
+                # Rows written before content_hash existed
+                content_hash = compute_content_hash(file.content or "")
+                backfilled.append({"id": file.id, "content_hash": content_hash})
+            for i, symbol in enumerate(extract_symbols(file.content, file.file_path, file.language)):
+                rows.append({
+                    "project_id": project_id,
+                    "code_file_id": file.id,
+                    "name": symbol.name,
+                    "qualified_name": (symbol.qualified_name or "")[:512] or None,
+                    "kind": symbol.kind,
+                    "symbol_type": symbol.symbol_type,
+                    "line": symbol.line,
+                    "content_hash": content_hash if i == 0 else None
+                })
+
+        self.db.query(CodeSymbol).filter(
+            CodeSymbol.code_file_id.in_(file_ids)
+        ).delete(synchronize_session=False)
+        if backfilled:
+            self.db.execute(update(CodeFile), backfilled)
+        if rows:
+            self.db.execute(insert(CodeSymbol), rows)
+
+    def find(
+        self,
+        project_id: int,
+        names: Iterable[str],
+        kinds: Optional[List[str]] = None
+    ) -> List[CodeSymbol]:
+        """
+        Symbols of a project with one of the given names.
+
+        Args:
+            project_id: Project ID
+            names: Exact symbol names
+            kinds: Only these kinds (definition, import, reference; all if None)
+
+        Returns:
+            Matching symbols ordered by file and line
+        """
+        names = list(names)
+        if not names:
+            return []
+        query = self.db.query(CodeSymbol).filter(
+            CodeSymbol.project_id == project_id,
+            CodeSymbol.name.in_(names)
+        )
+        if kinds is not None:
+            query = query.filter(CodeSymbol.kind.in_(kinds))
+        return query.order_by(CodeSymbol.code_file_id, CodeSymbol.line).all()
+
+    def related_files(self, project_id: int, text: str, limit: int = 5) -> List[Tuple[int, float]]:
+        """
+        Rank a project's files by the symbol names a text mentions.
+
+        Each matching name scores its kind weight (definitions count more
+        than imports and calls) times an IDF factor, so a name used all over
+        the project counts less than one found in a single file.
+
+        Args:
+            project_id: Project ID
+            text: Issue, rule or prompt text
+            limit: Maximum number of files
+
+        Returns:
+            (code file ID, score) pairs, best first
+        """
+        names = name_terms(text)
+        if not names:
+            return []
+        rows = self.db.query(CodeSymbol.code_file_id, CodeSymbol.name, CodeSymbol.kind).filter(
+            CodeSymbol.project_id == project_id,
+            CodeSymbol.name.in_(names)
+        ).all()
+        if not rows:
+            return []
+        file_count = self.db.query(CodeSymbol.code_file_id).filter(
+            CodeSymbol.project_id == project_id,
+            CodeSymbol.kind == DEFINITION,
+            CodeSymbol.symbol_type == "module"
+        ).count()
+
+        files_per_name: Dict[str, set] = {}
+        best_kind: Dict[Tuple[int, str], float] = {}
+        for code_file_id, name, kind in rows:
+            files_per_name.setdefault(name, set()).add(code_file_id)
+            key = (code_file_id, name)
+            best_kind[key] = max(best_kind.get(key, 0.0), KIND_WEIGHTS.get(kind, 1.0))
+
+        scores: Dict[int, float] = {}
+        for (code_file_id, name), weight in best_kind.items():
+            idf = math.log(1 + max(file_count, 1) / len(files_per_name[name]))
+            scores[code_file_id] = scores.get(code_file_id, 0.0) + weight * idf
+        return sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:limit]
+
+    def rebuild(self, project_id: Optional[int] = None) -> int:
+        """
+        Drop and re-extract the index (backfill or repair).
+
+        Args:
+            project_id: Only this project (all projects if None)
+
+        Returns:
+            Number of files indexed
+        """
+        symbols = self.db.query(CodeSymbol)
+        if project_id is not None:
+            symbols = symbols.filter(CodeSymbol.project_id == project_id)
+        symbols.delete(synchronize_session=False)
+
+        project_ids = [project_id] if project_id is not None else [
+            pid for (pid,) in self.db.query(CodeFile.project_id).distinct()
+        ]
+        indexed = sum(self.refresh(pid) for pid in project_ids)
+        self.db.commit()
+        return indexed
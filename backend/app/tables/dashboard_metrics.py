@@ -0,0 +1,335 @@
+"""Dashboard daily metrics rollup table schema and repository methods."""
+from sqlalchemy import Column, Integer, String, Date, ForeignKey, UniqueConstraint, func
+from datetime import date, datetime
+from typing import Optional, List, Dict, Iterable
+from ..database import Base
+
+# agent_type value for counters that are not tied to an agent (issues)
+NO_AGENT = ""
+
+COUNTER_COLUMNS = (
+    # Suggestions, bucketed by the suggestion's creation day
+    "suggestions_created",
+    "suggestions_pending",
+    "suggestions_approved",
+    "suggestions_rejected",
+    # Agent runs, bucketed by the run's creation day
+    "runs_total",
+    "runs_success",
+    "runs_error",
+    # Issues by current status, bucketed by the issue's creation day
+    "issues_created",
+    "issues_open",
+    "issues_in_progress",
+    "issues_resolved",
+    "issues_closed",
+    # Currently resolved issues (and their approved suggestions), bucketed by
+    # the issue's last update day, like the dashboard's original queries
+    "issues_resolved_on",
+    "auto_fixed",
+)
+
+
+class DashboardMetric(Base):
+    """Per-day, per-project, per-agent-type counters behind the dashboard."""
+    __tablename__ = "dashboard_daily_metrics"
+    __table_args__ = (
+        UniqueConstraint("day", "project_id", "agent_type", name="uq_dashboard_daily_metrics_key"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    day = Column(Date, nullable=False, index=True)
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False, index=True)
+    agent_type = Column(String(50), nullable=False, default=NO_AGENT)
+    suggestions_created = Column(Integer, default=0, nullable=False)
+    suggestions_pending = Column(Integer, default=0, nullable=False)
+    suggestions_approved = Column(Integer, default=0, nullable=False)
+    suggestions_rejected = Column(Integer, default=0, nullable=False)
+    runs_total = Column(Integer, default=0, nullable=False)
+    runs_success = Column(Integer, default=0, nullable=False)
+    runs_error = Column(Integer, default=0, nullable=False)
+    issues_created = Column(Integer, default=0, nullable=False)
+    issues_open = Column(Integer, default=0, nullable=False)
+    issues_in_progress = Column(Integer, default=0, nullable=False)
+    issues_resolved = Column(Integer, default=0, nullable=False)
+    issues_closed = Column(Integer, default=0, nullable=False)
+    issues_resolved_on = Column(Integer, default=0, nullable=False)
+    auto_fixed = Column(Integer, default=0, nullable=False)
+
+
+def _value(enum_or_str) -> Optional[str]:
+    """Plain string value of an enum member (or string)."""
+    if enum_or_str is None:
+        return None
+    return getattr(enum_or_str, "value", enum_or_str)
+
+
+def _day(value: Optional[datetime]) -> date:
+    """Rollup day for a timestamp (today if not yet populated)."""
+    return value.date() if value else date.today()
+
+
+class DashboardMetricRepository:
+    """
+    Repository methods for DashboardMetric table.
+
+    The record_* methods only stage counter updates; they are meant to be
+    called just before the caller's own commit so the rollup changes in the
+    same transaction as the rows it counts. Every create, update and delete
+    path of suggestions, agent runs and issues calls one, so the rollup
+    always matches what rebuild() would compute.
+    """
+
+    def __init__(self, db):
+        self.db = db
+
+    def increment(self, day: date, project_id: int, agent_type: str = NO_AGENT, **deltas: int) -> None:
+        """
+        Add deltas to the counters of one (day, project, agent type) row, creating it if needed.
+
+        Args:
+            day: Rollup day
+            project_id: Project ID
+            agent_type: Agent type value, or NO_AGENT
+            **deltas: Counter column name -> amount to add (may be negative)
+        """
+        deltas = {name: amount for name, amount in deltas.items() if amount}
+        if not deltas:
+            return
+        unknown = set(deltas) - set(COUNTER_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown dashboard counters: {', '.join(sorted(unknown))}")
+
+        values = {"day": day, "project_id": project_id, "agent_type": agent_type, **deltas}
+        table = DashboardMetric.__table__
+        dialect = self.db.get_bind().dialect.name
+
+        # Atomic upsert so concurrent writers never race on row creation
+        if dialect == "mysql":
+            from sqlalchemy.dialects.mysql import insert
+            stmt = insert(table).values(**values)
+            stmt = stmt.on_duplicate_key_update(
+                **{name: table.c[name] + stmt.inserted[name] for name in deltas}
+            )
+            self.db.execute(stmt)
+            return
+        if dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert
+            stmt = insert(table).values(**values)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["day", "project_id", "agent_type"],
+                set_={name: table.c[name] + stmt.excluded[name] for name in deltas}
+            )
+            self.db.execute(stmt)
+            return
+
+        metric = self.db.query(DashboardMetric).filter(
+            DashboardMetric.day == day,
+            DashboardMetric.project_id == project_id,
+            DashboardMetric.agent_type == agent_type
+        ).with_for_update().first()
+        if not metric:
+            metric = DashboardMetric(day=day, project_id=project_id, agent_type=agent_type)
+            for name in COUNTER_COLUMNS:
+                setattr(metric, name, 0)
+            self.db.add(metric)
+        for name, amount in deltas.items():
+            setattr(metric, name, getattr(metric, name) + amount)
+
+    def record_suggestions_created(self, suggestions: Iterable) -> None:
+        """Count newly added suggestions (one upsert per day/project/agent type)."""
+        grouped: Dict[tuple, Dict[str, int]] = {}
+        for suggestion in suggestions:
+            status = _value(suggestion.status) or "pending"
+            key = (_day(suggestion.created_at), suggestion.project_id, _value(suggestion.agent_type))
+            deltas = grouped.setdefault(key, {})
+            for name in ("suggestions_created", f"suggestions_{status}"):
+                deltas[name] = deltas.get(name, 0) + 1
+        for (day, project_id, agent_type), deltas in grouped.items():
+            self.increment(day, project_id, agent_type, **deltas)
+
+    def record_suggestion_status_change(self, suggestion, old_status) -> None:
+        """Move a suggestion between status counters (and update auto-fixed bugs)."""
+        old_value, new_value = _value(old_status), _value(suggestion.status)
+        if old_value == new_value:
+            return
+        deltas: Dict[str, int] = {f"suggestions_{new_value}": 1}
+        deltas[f"suggestions_{old_value}"] = deltas.get(f"suggestions_{old_value}", 0) - 1
+        self.increment(_day(suggestion.created_at), suggestion.project_id, _value(suggestion.agent_type), **deltas)
+
+        # An approved suggestion on a resolved issue counts as an auto-fixed bug
+        if "approved" in (old_value, new_value):
+            self._record_auto_fixed(suggestion, 1 if new_value == "approved" else -1)
+
+    def record_suggestion_deleted(self, suggestion) -> None:
+        """Remove a deleted suggestion from the counters."""
+        status = _value(suggestion.status) or "pending"
+        self.increment(
+            _day(suggestion.created_at), suggestion.project_id, _value(suggestion.agent_type),
+            **{"suggestions_created": -1, f"suggestions_{status}": -1}
+        )
+        if status == "approved":
+            self._record_auto_fixed(suggestion, -1)
+
+    def _record_auto_fixed(self, suggestion, sign: int) -> None:
+        """Add/remove an approved suggestion's auto-fixed count if its issue is resolved."""
+        if not suggestion.issue_id:
+            return
+        from .issues import Issue, IssueStatus
+        issue = self.db.query(Issue.status, Issue.updated_at).filter(Issue.id == suggestion.issue_id).first()
+        if issue and issue.status == IssueStatus.RESOLVED:
+            self.increment(_day(issue.updated_at), suggestion.project_id, auto_fixed=sign)
+
+    def record_agent_run_created(self, agent_run) -> None:
+        """Count a new agent run (queued jobs count towards runs_total only)."""
+        status = _value(agent_run.status)
+        deltas = {"runs_total": 1}
+        if status in ("success", "error"):
+            deltas[f"runs_{status}"] = 1
+        self.increment(_day(agent_run.created_at), agent_run.project_id, _value(agent_run.agent_type), **deltas)
+
+    def record_agent_run_status_change(self, agent_run, old_status) -> None:
+        """Update run outcome counters when a job finishes."""
+        old_value, new_value = _value(old_status), _value(agent_run.status)
+        if old_value == new_value:
+            return
+        deltas: Dict[str, int] = {}
+        if new_value in ("success", "error"):
+            deltas[f"runs_{new_value}"] = 1
+        if old_value in ("success", "error"):
+            deltas[f"runs_{old_value}"] = deltas.get(f"runs_{old_value}", 0) - 1
+        self.increment(_day(agent_run.created_at), agent_run.project_id, _value(agent_run.agent_type), **deltas)
+
+    def record_agent_run_deleted(self, agent_run) -> None:
+        """Remove a deleted agent run from the counters."""
+        status = _value(agent_run.status)
+        deltas = {"runs_total": -1}
+        if status in ("success", "error"):
+            deltas[f"runs_{status}"] = -1
+        self.increment(_day(agent_run.created_at), agent_run.project_id, _value(agent_run.agent_type), **deltas)
+
+    def record_issue_created(self, issue) -> None:
+        """Count a newly added issue."""
+        status = _value(issue.status) or "open"
+        self.increment(_day(issue.created_at), issue.project_id, issues_created=1, **{f"issues_{status}": 1})
+
+    def record_issue_update(self, issue, old_status, old_updated_at: Optional[datetime]) -> None:
+        """
+        Update issue counters for a pending change to an issue.
+
+        Call after setting the new values and before the commit. Status
+        counters move between statuses; a resolved issue (with the auto-fixed
+        count of its approved suggestions) moves from the day of its old
+        updated_at to today, as the commit bumps updated_at.
+
+        Args:
+            issue: Issue with the new values set
+            old_status: Status before the change
+            old_updated_at: updated_at before the change
+        """
+        if not self.db.is_modified(issue):
+            return  # Nothing is written, so updated_at stays put
+        old_value, new_value = _value(old_status), _value(issue.status)
+        if old_value != new_value:
+            self.increment(
+                _day(issue.created_at), issue.project_id,
+                **{f"issues_{new_value}": 1, f"issues_{old_value}": -1}
+            )
+        if "resolved" not in (old_value, new_value):
+            return
+
+        approved = self._approved_suggestion_count(issue)
+        if old_value == "resolved":
+            self.increment(_day(old_updated_at), issue.project_id, issues_resolved_on=-1, auto_fixed=-approved)
+        if new_value == "resolved":
+            self.increment(date.today(), issue.project_id, issues_resolved_on=1, auto_fixed=approved)
+
+    def record_issue_deleted(self, issue) -> None:
+        """Remove a deleted issue from the counters."""
+        status = _value(issue.status) or "open"
+        self.increment(_day(issue.created_at), issue.project_id, issues_created=-1, **{f"issues_{status}": -1})
+        if status == "resolved":
+            self.increment(
+                _day(issue.updated_at), issue.project_id,
+                issues_resolved_on=-1, auto_fixed=-self._approved_suggestion_count(issue)
+            )
+
+    def _approved_suggestion_count(self, issue) -> int:
+        from .suggestions import Suggestion, SuggestionStatus
+        return self.db.query(func.count(Suggestion.id)).filter(
+            Suggestion.issue_id == issue.id,
+            Suggestion.status == SuggestionStatus.APPROVED
+        ).scalar() or 0
+
+    def get_since(self, start_day: Optional[date] = None) -> List[DashboardMetric]:
+        """Get rollup rows, optionally from a given day on."""
+        query = self.db.query(DashboardMetric)
+        if start_day:
+            query = query.filter(DashboardMetric.day >= start_day)
+        return query.order_by(DashboardMetric.day.asc()).all()
+
+    def rebuild(self) -> int:
+        """
+        Recompute every counter from the source tables (backfill / repair).
+
+        Resolved issues and their approved suggestions (issues_resolved_on,
+        auto_fixed) are bucketed by the issue's last update day.
+
+        Returns:
+            Number of rollup rows written
+        """
+        from .suggestions import Suggestion, SuggestionStatus
+        from .agent_runs import AgentRun
+        from .issues import Issue, IssueStatus
+
+        counters: Dict[tuple, Dict[str, int]] = {}
+
+        def add(key: tuple, **deltas: int) -> None:
+            row = counters.setdefault(key, {name: 0 for name in COUNTER_COLUMNS})
+            for name, amount in deltas.items():
+                row[name] += int(amount or 0)
+
+        suggestion_day = func.date(Suggestion.created_at)
+        for day, project_id, agent_type, status, count in self.db.query(
+            suggestion_day, Suggestion.project_id, Suggestion.agent_type, Suggestion.status, func.count(Suggestion.id)
+        ).group_by(suggestion_day, Suggestion.project_id, Suggestion.agent_type, Suggestion.status):
+            add((day, project_id, _value(agent_type)), suggestions_created=count, **{f"suggestions_{_value(status)}": count})
+
+        run_day = func.date(AgentRun.created_at)
+        for day, project_id, agent_type, status, count in self.db.query(
+            run_day, AgentRun.project_id, AgentRun.agent_type, AgentRun.status, func.count(AgentRun.id)
+        ).group_by(run_day, AgentRun.project_id, AgentRun.agent_type, AgentRun.status):
+            deltas = {"runs_total": count}
+            if status in ("success", "error"):
+                deltas[f"runs_{status}"] = count
+            add((day, project_id, _value(agent_type)), **deltas)
+
+        issue_day = func.date(Issue.created_at)
+        for day, project_id, status, count in self.db.query(
+            issue_day, Issue.project_id, Issue.status, func.count(Issue.id)
+        ).group_by(issue_day, Issue.project_id, Issue.status):
+            add((day, project_id, NO_AGENT), issues_created=count, **{f"issues_{_value(status)}": count})
+
+        resolved_day = func.date(Issue.updated_at)
+        for day, project_id, count in self.db.query(
+            resolved_day, Issue.project_id, func.count(Issue.id)
+        ).filter(Issue.status == IssueStatus.RESOLVED).group_by(resolved_day, Issue.project_id):
+            add((day, project_id, NO_AGENT), issues_resolved_on=count)
+
+        for day, project_id, count in self.db.query(
+            resolved_day, Issue.project_id, func.count(Issue.id)
+        ).join(Suggestion, Issue.id == Suggestion.issue_id).filter(
+            Issue.status == IssueStatus.RESOLVED,
+            Suggestion.status == SuggestionStatus.APPROVED
+        ).group_by(resolved_day, Issue.project_id):
+            add((day, project_id, NO_AGENT), auto_fixed=count)
+
+        self.db.query(DashboardMetric).delete(synchronize_session=False)
+        rows = []
+        for (day, project_id, agent_type), values in counters.items():
+            if isinstance(day, str):  # SQLite returns DATE() as text
+                day = date.fromisoformat(day)
+            rows.append(DashboardMetric(day=day, project_id=project_id, agent_type=agent_type, **values))
+        self.db.add_all(rows)
+        self.db.commit()
+        return len(rows)
@@ -5,6 +5,7 @@ from sqlalchemy.sql import func
 from typing import Optional, List
 import enum
 from ..database import Base
+from .dashboard_metrics import DashboardMetricRepository
 
 
 class IssueStatus(str, enum.Enum):
@@ -51,9 +52,11 @@ class IssueRepository:
             project_id=project_id,
             title=title,
             description=description,
-            bitbucket_issue_id=bitbucket_issue_id
+            bitbucket_issue_id=bitbucket_issue_id,
+            status=IssueStatus.OPEN
         )
         self.db.add(issue)
+        DashboardMetricRepository(self.db).record_issue_created(issue)
         self.db.commit()
         self.db.refresh(issue)
         return issue
@@ -75,7 +78,9 @@ class IssueRepository:
         if not issue:
             return None
         
+        old_status, old_updated_at = issue.status, issue.updated_at
         issue.status = status
+        DashboardMetricRepository(self.db).record_issue_update(issue, old_status, old_updated_at)
         self.db.commit()
         self.db.refresh(issue)
         return issue
@@ -86,9 +91,11 @@ class IssueRepository:
         if not issue:
             return None
         
+        old_status, old_updated_at = issue.status, issue.updated_at
         for key, value in kwargs.items():
             if hasattr(issue, key):
                 setattr(issue, key, value)
+        DashboardMetricRepository(self.db).record_issue_update(issue, old_status, old_updated_at)
         
         self.db.commit()
         self.db.refresh(issue)
@@ -100,6 +107,7 @@ class IssueRepository:
         if not issue:
             return False
         
+        DashboardMetricRepository(self.db).record_issue_deleted(issue)
         self.db.delete(issue)
         self.db.commit()
         return True
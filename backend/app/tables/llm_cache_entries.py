@@ -0,0 +1,92 @@
+"""LLM response cache table schema and repository methods."""
+from sqlalchemy import Column, Integer, String, Text, DateTime
+from sqlalchemy.dialects.mysql import LONGTEXT
+from sqlalchemy.sql import func
+from datetime import datetime
+from typing import Optional
+from ..database import Base
+
+
+class LLMCacheEntry(Base):
+    """Cached LLM response keyed by a hash of the prompt and generation settings."""
+    __tablename__ = "llm_cache_entries"
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    cache_key = Column(String(64), nullable=False, unique=True, index=True)
+    model = Column(String(100), nullable=True)
+    response = Column(Text().with_variant(LONGTEXT, "mysql"), nullable=False)
+    created_at = Column(DateTime, default=func.now(), nullable=False, index=True)
+    last_accessed_at = Column(DateTime, default=func.now(), nullable=False, index=True)
+
+
+class LLMCacheEntryRepository:
+    """Repository methods for LLMCacheEntry table."""
+
+    def __init__(self, db):
+        self.db = db
+
+    def get_by_key(self, cache_key: str) -> Optional[LLMCacheEntry]:
+        """Get cache entry by key."""
+        return self.db.query(LLMCacheEntry).filter(LLMCacheEntry.cache_key == cache_key).first()
+
+    def upsert(self, cache_key: str, response: str, model: Optional[str] = None) -> LLMCacheEntry:
+        """Create or replace a cache entry."""
+        entry = self.get_by_key(cache_key)
+        now = datetime.utcnow()
+        if entry:
+            entry.response = response
+            entry.model = model
+            entry.created_at = now
+            entry.last_accessed_at = now
+        else:
+            entry = LLMCacheEntry(
+                cache_key=cache_key,
+                model=model,
+                response=response,
+                created_at=now,
+                last_accessed_at=now
+            )
+            self.db.add(entry)
+        self.db.commit()
+        return entry
+
+    def touch(self, entry: LLMCacheEntry) -> None:
+        """Mark an entry as recently used."""
+        entry.last_accessed_at = datetime.utcnow()
+        self.db.commit()
+
+    def delete_by_key(self, cache_key: str) -> bool:
+        """Delete a cache entry by key."""
+        deleted = self.db.query(LLMCacheEntry).filter(LLMCacheEntry.cache_key == cache_key).delete()
+        self.db.commit()
+        return deleted > 0
+
+    def delete_older_than(self, cutoff: datetime) -> int:
+        """Delete entries created before the cutoff. Returns number of rows deleted."""
+        deleted = self.db.query(LLMCacheEntry).filter(LLMCacheEntry.created_at < cutoff).delete()
+        self.db.commit()
+        return deleted
+
+    def trim_to_size(self, max_entries: int) -> int:
+        """Delete least recently used entries beyond max_entries. Returns number of rows deleted."""
+        total = self.db.query(LLMCacheEntry).count()
+        excess = total - max_entries
+        if excess <= 0:
+            return 0
+        stale_ids = [
+            row.id for row in self.db.query(LLMCacheEntry.id)
+            .order_by(LLMCacheEntry.last_accessed_at.asc())
+            .limit(excess)
+            .all()
+        ]
+        deleted = self.db.query(LLMCacheEntry).filter(
+            LLMCacheEntry.id.in_(stale_ids)
+        ).delete(synchronize_session=False)
+        self.db.commit()
+        return deleted
+
+    def clear(self) -> int:
+        """Delete all cache entries."""
+        deleted = self.db.query(LLMCacheEntry).delete()
+        self.db.commit()
+        return deleted
@@ -0,0 +1,83 @@
+"""Per-project Rule ID sequence table schema and repository methods."""
+from sqlalchemy import Column, Integer, ForeignKey
+from typing import List
+import re
+from ..database import Base
+from .business_rules import BusinessRule
+
+_RULE_NUMBER_RE = re.compile(r'BL-(\d+)')
+
+
+class RuleIdSequence(Base):
+    """Next Rule ID number to hand out for a project."""
+    __tablename__ = "rule_id_sequences"
+
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True)
+    next_value = Column(Integer, nullable=False, default=1)
+
+
+class RuleIdSequenceRepository:
+    """
+    Repository methods for RuleIdSequence table.
+
+    allocate locks the project's sequence row until the caller's commit, so
+    concurrent allocations for one project are serialized and a rolled-back
+    transaction returns its numbers to the sequence.
+    """
+
+    def __init__(self, db):
+        self.db = db
+
+    def allocate(self, project_id: int, count: int = 1) -> List[int]:
+        """
+        Reserve the next `count` Rule ID numbers for a project.
+
+        Args:
+            project_id: Project ID
+            count: How many consecutive numbers to reserve
+
+        Returns:
+            Reserved numbers in ascending order
+        """
+        if count < 1:
+            return []
+        self._ensure_sequence(project_id)
+        sequence = self.db.query(RuleIdSequence).filter(
+            RuleIdSequence.project_id == project_id
+        ).with_for_update().one()
+        first = sequence.next_value
+        sequence.next_value = first + count
+        self.db.flush()
+        return list(range(first, first + count))
+
+    def _ensure_sequence(self, project_id: int) -> None:
+        """Create the project's sequence row on first use, continuing after existing rules."""
+        exists = self.db.query(RuleIdSequence.project_id).filter(
+            RuleIdSequence.project_id == project_id
+        ).first()
+        if exists:
+            return
+
+        # One-time scan; afterwards allocation never reads business_rules
+        numbers = []
+        for (rule_id,) in self.db.query(BusinessRule.rule_id).filter(BusinessRule.project_id == project_id):
+            match = _RULE_NUMBER_RE.search(rule_id or "")
+            if match:
+                numbers.append(int(match.group(1)))
+        values = {"project_id": project_id, "next_value": max(numbers, default=0) + 1}
+        table = RuleIdSequence.__table__
+        dialect = self.db.get_bind().dialect.name
+
+        # Insert-if-missing so concurrent first allocations never race on row creation
+        if dialect == "mysql":
+            from sqlalchemy.dialects.mysql import insert
+            stmt = insert(table).values(**values)
+            self.db.execute(stmt.on_duplicate_key_update(project_id=stmt.inserted.project_id))
+            return
+        if dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert
+            self.db.execute(insert(table).values(**values).on_conflict_do_nothing(index_elements=["project_id"]))
+            return
+
+        self.db.add(RuleIdSequence(**values))
+        self.db.flush()
@@ -0,0 +1,179 @@
+"""Business rule term index (inverted index) table schema and repository methods."""
+from collections import Counter
+from sqlalchemy import Column, Integer, String, ForeignKey, Index, func
+from typing import Dict, Iterable, List, Optional, Tuple
+import re
+from ..database import Base
+from .business_rules import BusinessRule
+
+# Longest term kept in the index (longer tokens are identifiers/noise)
+MAX_TERM_LENGTH = 64
+
+_TOKEN_RE = re.compile(r'\b\w+\b')
+
+# Words that carry no meaning for rule overlap: English function words plus
+# the modal verbs every rule statement uses
+STOPWORDS = frozenset("""
+a about above after again against all also am an and any are as at be because been before being below
+between both but by can could did do does doing down during each either else etc few for from further
+had has have having he her here hers him his how i if in into is it its itself just may me might more
+most must my neither no nor not now of off on once only or other our ours out over own per same shall
+she should so some such than that the their theirs them then there these they this those through to
+too under until up upon us very via was we were what when where whether which while who whom why will
+with within without would you your
+""".split())
+
+
+def tokenize_rule_content(content) -> Dict[str, int]:
+    """
+    Index terms of a rule and how often each occurs.
+
+    Lowercased word tokens, minus stopwords and single characters.
+
+    Args:
+        content: Rule content (non-strings are stringified)
+
+    Returns:
+        term -> term frequency
+    """
+    if not isinstance(content, str):
+        content = str(content) if content else ""
+    return dict(Counter(
+        token for token in _TOKEN_RE.findall(content.lower())
+        if len(token) > 1 and len(token) <= MAX_TERM_LENGTH and token not in STOPWORDS
+    ))
+
+
+class RuleTerm(Base):
+    """Posting: a term occurring in a business rule, with its frequency."""
+    __tablename__ = "business_rule_terms"
+    __table_args__ = (
+        # Posting-list lookups: all rules of a project containing a term
+        Index("ix_business_rule_terms_project_term", "project_id", "term"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False)
+    business_rule_id = Column(Integer, ForeignKey("business_rules.id", ondelete="CASCADE"), nullable=False, index=True)
+    term = Column(String(MAX_TERM_LENGTH), nullable=False)
+    term_count = Column(Integer, default=1, nullable=False)
+
+
+def _postings_for(rule) -> List[RuleTerm]:
+    """Postings for the current content of a business rule."""
+    return [
+        RuleTerm(
+            project_id=rule.project_id,
+            business_rule_id=rule.id,
+            term=term,
+            term_count=count
+        )
+        for term, count in tokenize_rule_content(rule.content).items()
+    ]
+
+
+class RuleTermRepository:
+    """
+    Repository methods for RuleTerm table.
+
+    index_rule only stages changes; call it just before the commit that
+    creates or edits the rule so the index changes in the same transaction.
+    """
+
+    def __init__(self, db):
+        self.db = db
+
+    def index_rule(self, rule) -> None:
+        """
+        Replace a rule's postings with the terms of its current content.
+
+        Args:
+            rule: BusinessRule with an assigned primary key (flush first)
+        """
+        self.db.query(RuleTerm).filter(
+            RuleTerm.business_rule_id == rule.id
+        ).delete(synchronize_session=False)
+        self.db.add_all(_postings_for(rule))
+
+    def get_postings(
+        self,
+        project_id: int,
+        terms: Iterable[str],
+        statuses: Optional[List] = None
+    ) -> Dict[int, Dict[str, int]]:
+        """
+        Intersect posting lists with a set of query terms.
+
+        Args:
+            project_id: Project ID
+            terms: Query terms
+            statuses: Only rules in one of these statuses (all if None)
+
+        Returns:
+            business_rule_id -> {shared term: term frequency in that rule}
+        """
+        terms = list(terms)
+        if not terms:
+            return {}
+        query = self.db.query(
+            RuleTerm.business_rule_id, RuleTerm.term, RuleTerm.term_count
+        ).filter(
+            RuleTerm.project_id == project_id,
+            RuleTerm.term.in_(terms)
+        )
+        if statuses is not None:
+            query = query.join(
+                BusinessRule, BusinessRule.id == RuleTerm.business_rule_id
+            ).filter(BusinessRule.status.in_(statuses))
+
+        postings: Dict[int, Dict[str, int]] = {}
+        for business_rule_id, term, term_count in query.all():
+            postings.setdefault(business_rule_id, {})[term] = term_count
+        return postings
+
+    def get_document_frequencies(self, project_id: int, terms: Iterable[str]) -> Tuple[int, Dict[str, int]]:
+        """
+        Document frequencies of terms across a project's indexed rules.
+
+        Args:
+            project_id: Project ID
+            terms: Terms to look up
+
+        Returns:
+            (number of indexed rules in the project, term -> number of rules containing it)
+        """
+        terms = list(terms)
+        rule_count = self.db.query(
+            func.count(func.distinct(RuleTerm.business_rule_id))
+        ).filter(RuleTerm.project_id == project_id).scalar() or 0
+        if not terms:
+            return rule_count, {}
+        rows = self.db.query(RuleTerm.term, func.count(RuleTerm.id)).filter(
+            RuleTerm.project_id == project_id,
+            RuleTerm.term.in_(terms)
+        ).group_by(RuleTerm.term).all()
+        return rule_count, {term: count for term, count in rows}
+
+    def rebuild(self, project_id: Optional[int] = None) -> int:
+        """
+        Rebuild the index from business_rules (backfill or repair).
+
+        Args:
+            project_id: Only this project (all projects if None)
+
+        Returns:
+            Number of rules indexed
+        """
+        postings = self.db.query(RuleTerm)
+        rules = self.db.query(BusinessRule)
+        if project_id is not None:
+            postings = postings.filter(RuleTerm.project_id == project_id)
+            rules = rules.filter(BusinessRule.project_id == project_id)
+        postings.delete(synchronize_session=False)
+
+        indexed = 0
+        for rule in rules.yield_per(500):
+            self.db.add_all(_postings_for(rule))
+            indexed += 1
+        self.db.commit()
+        return indexed
@@ -1,10 +1,11 @@
 """Suggestions table schema, types, and repository methods."""
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum as SQLEnum
-from sqlalchemy.orm import relationship, foreign
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index, Enum as SQLEnum
+from sqlalchemy.orm import relationship, foreign, joinedload, raiseload, selectinload
 from sqlalchemy.sql import func
 from typing import Optional, List, Dict, Any
 import enum
 from ..database import Base
+from .dashboard_metrics import DashboardMetricRepository
 
 
 class AgentType(str, enum.Enum):
@@ -39,6 +40,10 @@ class SuggestionStatus(str, enum.Enum):
 class Suggestion(Base):
     """AI agent suggestion model."""
     __tablename__ = "suggestions"
+    __table_args__ = (
+        # Project lists filtered by status, newest first (keyset on created_at, id)
+        Index("ix_suggestions_project_status_created", "project_id", "status", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     agent_type = Column(SQLEnum(AgentType, native_enum=True), nullable=False, index=True)
@@ -67,6 +72,30 @@ class Suggestion(Base):
     )
 
 
+def suggestion_context_options() -> tuple:
+    """
+    Loading profile for detail/approval views.
+
+    Everything the view walks is loaded up front; any other relationship
+    raises instead of lazy loading. Built on call: creating loader options
+    configures the mappers, which must wait until every table is imported.
+    """
+    return (
+        selectinload(Suggestion.approvals),
+        joinedload(Suggestion.parent_suggestion),
+        joinedload(Suggestion.business_rule),
+        raiseload("*"),
+    )
+
+
+def suggestion_history_options() -> tuple:
+    """Loading profile for the approval history view: approvals only."""
+    return (
+        selectinload(Suggestion.approvals),
+        raiseload("*"),
+    )
+
+
 class SuggestionRepository:
     """Repository methods for Suggestion table."""
 
@@ -93,9 +122,11 @@ class SuggestionRepository:
             issue_id=issue_id,
             rule_id=rule_id,
             version=version,
-            parent_suggestion_id=parent_suggestion_id
+            parent_suggestion_id=parent_suggestion_id,
+            status=SuggestionStatus.PENDING
         )
         self.db.add(suggestion)
+        DashboardMetricRepository(self.db).record_suggestions_created([suggestion])
         self.db.commit()
         self.db.refresh(suggestion)
         return suggestion
@@ -104,6 +135,18 @@ class SuggestionRepository:
         """Get suggestion by ID."""
         return self.db.query(Suggestion).filter(Suggestion.id == suggestion_id).first()
 
+    def get_with_context(self, suggestion_id: int) -> Optional[Suggestion]:
+        """Get suggestion by ID with approvals, parent suggestion and business rule loaded."""
+        return self.db.query(Suggestion).options(*suggestion_context_options()).filter(
+            Suggestion.id == suggestion_id
+        ).first()
+
+    def get_with_approvals(self, suggestion_id: int) -> Optional[Suggestion]:
+        """Get suggestion by ID with only its approvals loaded."""
+        return self.db.query(Suggestion).options(*suggestion_history_options()).filter(
+            Suggestion.id == suggestion_id
+        ).first()
+
     def get_by_project(
         self,
         project_id: int,
@@ -128,7 +171,9 @@ class SuggestionRepository:
         if not suggestion:
             return None
         
+        old_status = suggestion.status
         suggestion.status = status
+        DashboardMetricRepository(self.db).record_suggestion_status_change(suggestion, old_status)
         self.db.commit()
         self.db.refresh(suggestion)
         return suggestion
@@ -139,9 +184,11 @@ class SuggestionRepository:
         if not suggestion:
             return None
         
+        old_status = suggestion.status
         for key, value in kwargs.items():
             if hasattr(suggestion, key):
                 setattr(suggestion, key, value)
+        DashboardMetricRepository(self.db).record_suggestion_status_change(suggestion, old_status)
         
         self.db.commit()
         self.db.refresh(suggestion)
@@ -153,6 +200,7 @@ class SuggestionRepository:
         if not suggestion:
             return False
         
+        DashboardMetricRepository(self.db).record_suggestion_deleted(suggestion)
         self.db.delete(suggestion)
         self.db.commit()
         return True
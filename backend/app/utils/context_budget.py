@@ -0,0 +1,258 @@
+"""Token-budgeted code context for LLM prompts."""
+import math
+import re
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Sequence, Set, Tuple
+
+# Pieces a BPE tokenizer usually keeps apart: words/identifiers and single
+# punctuation characters. Long identifiers cost about one token per 4 chars.
+_TOKEN_PIECE_RE = re.compile(r'\w+|[^\w\s]')
+_LONG_WORD_RE = re.compile(r'\w{5,}')
+
+# Lines that start a top-level (or class-level) definition in common languages
+_BOUNDARY_RE = re.compile(
+    r'^[ \t]{0,4}(?:'
+    r'(?:async\s+)?def\s|class\s|@\w'  # Python
+    r'|(?:export\s+)?(?:default\s+)?(?:async\s+)?function\b'  # JavaScript/TypeScript
+    r'|(?:export\s+)?(?:abstract\s+)?(?:class|interface|enum|type)\s'
+    r'|(?:export\s+)?(?:const|let|var)\s+\w+\s*=\s*(?:async\s*)?(?:\([^)]*\)|\w+)\s*=>'
+    r'|(?:public|private|protected|internal|static|final|override)\s'  # Java/C#/Kotlin
+    r'|func\s|fn\s|pub\s|impl\b|struct\s|trait\s|mod\s'  # Go/Rust
+    r'|(?:module|describe|it|test)\b'
+    r')'
+)
+_DECORATOR_RE = re.compile(r'^[ \t]{0,4}@\w')
+_WORD_RE = re.compile(r'[A-Za-z][a-z0-9]*|[0-9]+')
+
+# Largest chunk produced when splitting a file
+MAX_CHUNK_TOKENS = 600
+# Tokens charged per file for its header line and code fence
+FILE_OVERHEAD_TOKENS = 12
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the token count of text without a tokenizer.
+
+    Counts words and punctuation, plus one token per extra 4 characters of
+    long identifiers. Close enough to BPE counts for source code and prose
+    to keep prompts inside a budget, at regex speed.
+
+    Args:
+        text: Text to measure
+
+    Returns:
+        Estimated number of tokens
+    """
+    if not text:
+        return 0
+    tokens = len(_TOKEN_PIECE_RE.findall(text))
+    for word in _LONG_WORD_RE.findall(text):
+        tokens += (len(word) - 1) // 4
+    return tokens
+
+
+# Estimated cost of one "... [lines a-b omitted] ..." marker (six-digit line numbers)
+OMISSION_MARKER_TOKENS = estimate_tokens("... [lines 100000-100000 omitted] ...")
+
+
+def query_terms(text: str) -> Set[str]:
+    """Lowercased words of a relevance query (identifiers split on case and underscores)."""
+    return {word.lower() for word in _WORD_RE.findall(text or "") if len(word) > 2}
+
+
+@dataclass
+class CodeChunk:
+    """A run of whole lines from one file."""
+    file_index: int
+    start_line: int  # 1-based, inclusive
+    end_line: int
+    text: str
+    tokens: int
+    score: float = 0.0
+
+
+def split_code(content: str, max_tokens: int = MAX_CHUNK_TOKENS, file_index: int = 0) -> List[CodeChunk]:
+    """
+    Split source code into chunks on function/class boundaries.
+
+    Definitions (with their decorators) start new segments; consecutive
+    small segments are merged up to max_tokens, and a segment larger than
+    max_tokens is cut between lines.
+
+    Args:
+        content: File content
+        max_tokens: Largest chunk size
+        file_index: Index stored on the chunks
+
+    Returns:
+        Chunks covering every line, in order
+    """
+    lines = content.splitlines(keepends=True)
+    segments: List[Tuple[int, int]] = []
+    start = 0
+    for i, line in enumerate(lines):
+        if i > start and _BOUNDARY_RE.match(line) and not (i > 0 and _DECORATOR_RE.match(lines[i - 1])):
+            segments.append((start, i))
+            start = i
+    if start < len(lines):
+        segments.append((start, len(lines)))
+
+    chunks: List[CodeChunk] = []
+    current: Optional[List[int]] = None  # [start, end, tokens]
+    for seg_start, seg_end in segments:
+        for piece_start, piece_end, tokens in _cut_segment(lines, seg_start, seg_end, max_tokens):
+            if current is not None and current[2] + tokens <= max_tokens:
+                current[1] = piece_end
+                current[2] += tokens
+                continue
+            if current is not None:
+                chunks.append(_make_chunk(lines, current, file_index))
+            current = [piece_start, piece_end, tokens]
+    if current is not None:
+        chunks.append(_make_chunk(lines, current, file_index))
+    return chunks
+
+
+def _cut_segment(lines: List[str], start: int, end: int, max_tokens: int) -> Iterable[Tuple[int, int, int]]:
+    """Split lines[start:end] into line runs of at most max_tokens (one line may exceed it)."""
+    piece_start, tokens = start, 0
+    for i in range(start, end):
+        line_tokens = estimate_tokens(lines[i])
+        if tokens and tokens + line_tokens > max_tokens:
+            yield piece_start, i, tokens
+            piece_start, tokens = i, 0
+        tokens += line_tokens
+    if piece_start < end:
+        yield piece_start, end, tokens
+
+
+def _make_chunk(lines: List[str], span: List[int], file_index: int) -> CodeChunk:
+    return CodeChunk(
+        file_index=file_index,
+        start_line=span[0] + 1,
+        end_line=span[1],
+        text=''.join(lines[span[0]:span[1]]),
+        tokens=span[2]
+    )
+
+
+def _score(chunk: CodeChunk, terms: Set[str]) -> float:
+    """Relevance of a chunk: distinct query terms it mentions, per sqrt(token)."""
+    if not terms:
+        return 0.0
+    found = query_terms(chunk.text) & terms
+    return len(found) / math.sqrt(max(chunk.tokens, 1))
+
+
+def _select(chunks: List[CodeChunk], budget: int, file_overhead: int = 0) -> List[CodeChunk]:
+    """
+    Greedily keep the best chunks that fit the budget.
+
+    Each chunk is charged its tokens plus an omission marker before it; the
+    first chunk kept from a file also pays file_overhead and the marker
+    after its last chunk. Ties (and the no-query case) favour earlier files
+    and earlier lines, so imports and top-level declarations come first.
+    """
+    chosen = []
+    opened = set()
+    used = 0
+    for chunk in sorted(chunks, key=lambda c: (-c.score, c.file_index, c.start_line)):
+        cost = chunk.tokens + OMISSION_MARKER_TOKENS
+        if chunk.file_index not in opened:
+            cost += file_overhead + OMISSION_MARKER_TOKENS
+        if used + cost > budget:
+            continue
+        chosen.append(chunk)
+        opened.add(chunk.file_index)
+        used += cost
+    return sorted(chosen, key=lambda c: (c.file_index, c.start_line))
+
+
+def _render(chunks: Sequence[CodeChunk], total_lines: int) -> str:
+    """Join selected chunks of one file, marking the omitted line ranges."""
+    parts = []
+    next_line = 1
+    for chunk in chunks:
+        if chunk.start_line > next_line:
+            parts.append(f"... [lines {next_line}-{chunk.start_line - 1} omitted] ...\n")
+        text = chunk.text
+        parts.append(text if text.endswith('\n') else text + '\n')
+        next_line = chunk.end_line + 1
+    if next_line <= total_lines:
+        parts.append(f"... [lines {next_line}-{total_lines} omitted] ...\n")
+    return ''.join(parts)
+
+
+def fit_to_budget(content: str, budget: int, query: str = "") -> str:
+    """
+    Fit one file into a token budget.
+
+    Files that fit are returned unchanged; otherwise the chunks most
+    relevant to the query are kept (in file order) and the rest replaced by
+    "... [lines a-b omitted] ..." markers.
+
+    Args:
+        content: File content
+        budget: Token budget for the returned text
+        query: Text the kept code should be relevant to (rules, issue, prompt)
+
+    Returns:
+        Content, possibly with omitted line ranges
+    """
+    content = content or ""
+    if estimate_tokens(content) <= budget:
+        return content
+    chunks = split_code(content, max_tokens=min(MAX_CHUNK_TOKENS, max(budget // 4, 50)))
+    terms = query_terms(query)
+    for chunk in chunks:
+        chunk.score = _score(chunk, terms)
+    chosen = _select(chunks, budget)
+    return _render(chosen, content.count('\n') + (0 if content.endswith('\n') else 1))
+
+
+def pack_files(files: Sequence[Tuple[str, Optional[str], str]], budget: int, query: str = "") -> str:
+    """
+    Pack several files into one token budget.
+
+    Small files compete as a whole, large ones chunk by chunk, ranked by
+    relevance to the query. Files are rendered in input order as
+    "File: path" plus a fenced block; files with nothing selected are
+    listed at the end as omitted.
+
+    Args:
+        files: (file_path, language, content) in preference order
+        budget: Token budget for the returned text
+        query: Text the kept code should be relevant to
+
+    Returns:
+        Rendered context (empty if no files)
+    """
+    terms = query_terms(query)
+    chunks: List[CodeChunk] = []
+    line_counts = []
+    for index, (file_path, _, content) in enumerate(files):
+        content = content or ""
+        line_counts.append(content.count('\n') + (0 if content.endswith('\n') else 1))
+        file_chunks = split_code(content, file_index=index)
+        path_terms = query_terms(file_path) & terms
+        for chunk in file_chunks:
+            chunk.score = _score(chunk, terms) + (0.05 * len(path_terms))
+        chunks.extend(file_chunks)
+
+    chosen = _select(chunks, budget, file_overhead=FILE_OVERHEAD_TOKENS)
+    by_file: List[List[CodeChunk]] = [[] for _ in files]
+    for chunk in chosen:
+        by_file[chunk.file_index].append(chunk)
+
+    parts = []
+    omitted = []
+    for index, (file_path, language, _) in enumerate(files):
+        if not by_file[index]:
+            omitted.append(file_path)
+            continue
+        parts.append(f"\nFile: {file_path}\n```{language or ''}\n{_render(by_file[index], line_counts[index])}```")
+    if omitted:
+        parts.append(f"\n({len(omitted)} more file(s) omitted to fit the context budget: {', '.join(omitted[:20])}"
+                     f"{', ...' if len(omitted) > 20 else ''})")
+    return '\n'.join(parts)
@@ -0,0 +1,207 @@
+"""Incremental parsing of a JSON object from a streamed LLM response."""
+import json
+import re
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from .json_extractor import extract_json_from_text
+
+# Outside string literals only these characters change the parser state
+_STRUCTURAL_RE = re.compile(r'["{}\[\],]')
+# Run of string-literal characters up to the next quote or escape
+_STRING_BODY_RE = re.compile(r'[^"\\]*')
+# Before the object: a brace, or a quote or newline that opens/ends quoted prose
+_PREAMBLE_RE = re.compile(r'[{"\n]')
+
+
+class IncrementalJSONParser:
+    """
+    Parse the top-level JSON object of a response while it is still streaming.
+
+    Feed text deltas in arrival order; each call returns the top-level
+    (key, value) members completed by that delta. Only the new delta is
+    scanned, so a long member (e.g. a 100 KB ``openapi_spec`` string) costs
+    O(n) overall no matter how finely it is split. Prose or a ```json fence
+    before the object is skipped, including braces quoted in it. A candidate
+    object is only taken once one of its members parses (with
+    ``required_keys``, once it holds one of them); one that closes before
+    that, such as ``{}`` or ``{key: value}`` in the prose, is skipped.
+
+    Once the object closes, or every key in ``required_keys`` has arrived,
+    ``satisfied`` is True and the caller can stop generation. ``finish()``
+    falls back to ``extract_json_from_text`` on the full text when the stream
+    did not contain a well-formed object (YAML, truncated output, ...).
+
+        >>> parser = IncrementalJSONParser()
+        >>> parser.feed('He said "hi {". {"test_code": "x"}')
+        [('test_code', 'x')]
+    """
+
+    def __init__(self, required_keys: Optional[Iterable[str]] = None):
+        self.required_keys = list(required_keys or [])
+        self.result: Dict[str, Any] = {}
+        self.done = False
+        self._chunks: List[str] = []
+        self._started = False
+        # Inside "quoted" prose before the object (reset at each newline)
+        self._quoted = False
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        # Text of the member currently being read, split across deltas
+        self._member: List[str] = []
+        # Members are held back until one parses (with required_keys, until
+        # the object shows one of them), so a stray object is skipped
+        self._accepted = False
+        self._pending: List[Tuple[str, Any]] = []
+        self._malformed = False
+
+    @property
+    def text(self) -> str:
+        """Everything fed so far."""
+        if len(self._chunks) > 1:
+            self._chunks = [''.join(self._chunks)]
+        return self._chunks[0] if self._chunks else ''
+
+    @property
+    def satisfied(self) -> bool:
+        """True once the object has closed or all required keys are present."""
+        if self.done:
+            return True
+        return bool(self.required_keys) and all(key in self.result for key in self.required_keys)
+
+    def feed(self, delta: str) -> List[Tuple[str, Any]]:
+        """
+        Consume the next text delta.
+
+        Args:
+            delta: Next piece of the response
+
+        Returns:
+            (key, value) pairs for top-level members completed by this delta
+        """
+        if not delta:
+            return []
+        self._chunks.append(delta)
+        if self.done:
+            return []
+
+        completed = []
+        pos = 0
+        end = len(delta)
+        member_start = 0
+
+        while pos < end:
+            if not self._started:
+                token = _PREAMBLE_RE.search(delta, pos)
+                if token is None:
+                    return completed
+                pos = token.end()
+                char = token.group()
+                if char == '"':
+                    self._quoted = not self._quoted
+                    continue
+                if char == '\n':
+                    self._quoted = False
+                    continue
+                if self._quoted:
+                    continue
+                self._started = True
+                self._depth = 1
+                member_start = pos
+                continue
+
+            if self._in_string:
+                if self._escaped:
+                    # Escaped character split from its backslash by the delta boundary
+                    self._escaped = False
+                    pos += 1
+                    continue
+                pos = _STRING_BODY_RE.match(delta, pos).end()
+                if pos >= end:
+                    break
+                if delta[pos] == '\\':
+                    if pos + 1 < end:
+                        pos += 2
+                    else:
+                        self._escaped = True
+                        pos += 1
+                else:
+                    self._in_string = False
+                    pos += 1
+                continue
+
+            token = _STRUCTURAL_RE.search(delta, pos)
+            if token is None:
+                break
+            pos = token.end()
+            char = token.group()
+            if char == '"':
+                self._in_string = True
+            elif char == '{' or char == '[':
+                self._depth += 1
+            elif char == '}' or char == ']':
+                self._depth -= 1
+                if self._depth == 0:
+                    completed.extend(self._complete_member(delta[member_start:pos - 1]))
+                    if self._accepted:
+                        self.done = True
+                        return completed
+                    # An empty or unrelated object (e.g. a schema quoted in the preamble)
+                    self._pending = []
+                    self._malformed = False
+                    self._started = False
+            elif self._depth == 1:
+                # Comma between top-level members
+                completed.extend(self._complete_member(delta[member_start:pos - 1]))
+                member_start = pos
+
+        if self._started:
+            self._member.append(delta[member_start:])
+        return completed
+
+    def finish(self, preferred_keys: Optional[List[str]] = None) -> List[Tuple[str, Any]]:
+        """
+        Close the stream, recovering members the incremental parse missed.
+
+        Args:
+            preferred_keys: Keys that identify the right object for the
+                fallback extractor (defaults to required_keys)
+
+        Returns:
+            (key, value) pairs not already returned by feed()
+        """
+        if self.satisfied and self.result and not self._malformed:
+            return []
+        extracted = extract_json_from_text(
+            self.text,
+            fallback_to_text=False,
+            preferred_keys=preferred_keys or self.required_keys or None
+        )
+        if not isinstance(extracted, dict):
+            return []
+        recovered = [(key, value) for key, value in extracted.items() if key not in self.result]
+        self.result.update(recovered)
+        return recovered
+
+    def _complete_member(self, tail: str) -> List[Tuple[str, Any]]:
+        """Decode one finished top-level `"key": value` member."""
+        self._member.append(tail)
+        member = ''.join(self._member).strip()
+        self._member = []
+        if not member:
+            # Empty object or a trailing comma
+            return []
+        try:
+            parsed = json.loads('{' + member + '}')
+        except json.JSONDecodeError:
+            # Leave malformed members to finish()
+            self._malformed = True
+            return []
+        self._pending.extend(parsed.items())
+        if not self._accepted:
+            if self.required_keys and not any(key in self.required_keys for key, _ in self._pending):
+                return []
+            self._accepted = True
+        members = [(key, value) for key, value in self._pending if key not in self.result]
+        self._pending = []
+        self.result.update(members)
+        return members
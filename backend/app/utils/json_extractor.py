@@ -1,10 +1,33 @@
 """Robust JSON extraction utility for parsing AI agent responses."""
 import json
 import re
-from typing import Dict, Any, Optional, List, Union
+from functools import cached_property
+from typing import Dict, Any, Optional, List, Union, Iterator, Tuple
 import yaml
 
 
+# Patterns are compiled once at import time; agent responses can be 50-100 KB
+# (full OpenAPI specs), so every stage below avoids re-scanning the whole text.
+_FENCE_RE = re.compile(r'```([^\n`]*)\n?(.*?)```', re.DOTALL)
+_FENCE_LANG_RE = re.compile(r'[\w+.-]*')
+_JSON_FENCE_LANGS = frozenset(('', 'json', 'yaml', 'yml'))
+_YAML_BLOCK_RE = re.compile(r'```(?:yaml|yml)?\s*\n?(.*?)```', re.DOTALL | re.IGNORECASE)
+_YAML_LINE_RE = re.compile(r'\s*[a-zA-Z_][a-zA-Z0-9_]*\s*:\s*')
+_OPENAPI_RE = re.compile(r'openapi:', re.IGNORECASE)
+_TRAILING_COMMA_RE = re.compile(r',(?=\s*[}\]])')
+# Outside a JSON span only openers matter; inside one, each match skips
+# ahead to the next bracket, consuming string literals whole (a lone quote
+# counts as text) so braces within strings do not affect nesting. The skip
+# sits in an atomic lookahead, and the bracket is empty only at the end of
+# the text, so a scan never backtracks.
+_OPENER_RE = re.compile(r'[{\[]')
+_NEXT_BRACKET_RE = re.compile(r'(?=((?:[^"{}\[\]]+|"[^"\\]*(?:\\.[^"\\]*)*"|")*))\1([{}\[\]]?)')
+# Every string literal matches, but only those containing a brace are captured
+_BRACED_STRING_RE = re.compile(r'"[^"\\{]*(?:\\.[^"\\{]*)*"|("[^"\\]*(?:\\.[^"\\]*)*")')
+_MATCHING_OPENER = {'}': '{', ']': '['}
+_DECODER = json.JSONDecoder()
+
+
 def extract_json_from_text(
     text: str,
     fallback_to_text: bool = True,
@@ -21,6 +44,11 @@ def extract_json_from_text(
     - Be in YAML format
     - Have trailing commas or other minor issues
     
+    Strategies are tried in priority order and candidates are parsed lazily, so
+    extraction stops at the first object that satisfies the request (the first
+    one carrying any of ``preferred_keys`` when those are given). Later
+    strategies only run when every earlier one produced nothing.
+    
     Args:
         text: The text to extract JSON from
         fallback_to_text: If True, return the original text if JSON extraction fails
@@ -39,19 +67,10 @@ def extract_json_from_text(
     if not text:
         return {} if not fallback_to_text else text
     
-    found_objects = []
-    
-    # Strategy 1: Extract from markdown code blocks (```json ... ``` or ```yaml ... ```)
-    # Note: Sometimes YAML is wrapped in ```json blocks, so we need to check both
-    json_block_pattern = r'```(?:json|yaml|yml)?\s*\n?(.*?)```'
-    matches = re.findall(json_block_pattern, text, re.DOTALL | re.IGNORECASE)
-    for match in matches:
-        content_str = match.strip()
-        
-        # First try as JSON
-        result = _try_parse_json(content_str)
-        if result is not None:
-            # If preferred_keys are specified, check if this object has them
+    scan = _TextScan(text, preferred_keys)
+    for strategy in _STRATEGIES:
+        found_objects = []
+        for result in strategy(scan):
             if preferred_keys and _has_preferred_keys(result, preferred_keys):
                 if not allow_multiple:
                     return result
@@ -60,163 +79,12 @@ def extract_json_from_text(
                 if not allow_multiple and not preferred_keys:
                     return result
                 found_objects.append(result)
-        else:
-            # If JSON parsing failed, try as YAML (common for OpenAPI specs)
-            # Check if it looks like YAML (starts with key: or has YAML-like structure)
-            if _looks_like_yaml(content_str):
-                try:
-                    yaml_data = yaml.safe_load(content_str)
-                    if isinstance(yaml_data, dict):
-                        result = yaml_data
-                        if preferred_keys and _has_preferred_keys(result, preferred_keys):
-                            if not allow_multiple:
-                                return result
-                            found_objects.insert(0, result)
-                        else:
-                            if not allow_multiple and not preferred_keys:
-                                return result
-                            found_objects.append(result)
-                except (yaml.YAMLError, Exception):
-                    pass
-    
-    # Strategy 2: Extract from generic code blocks (``` ... ```)
-    # Also handle YAML that might be in code blocks
-    if not found_objects:
-        code_block_pattern = r'```[^\n]*\n?(.*?)```'
-        matches = re.findall(code_block_pattern, text, re.DOTALL)
-        for match in matches:
-            content_str = match.strip()
-            
-            # Try JSON first
-            if _looks_like_json(content_str):
-                result = _try_parse_json(content_str)
-                if result is not None:
-                    if not allow_multiple:
-                        return result
-                    found_objects.append(result)
-                    continue
-            
-            # If JSON parsing failed or doesn't look like JSON, try YAML
-            if _looks_like_yaml(content_str):
-                try:
-                    yaml_data = yaml.safe_load(content_str)
-                    if isinstance(yaml_data, dict):
-                        result = yaml_data
-                        if preferred_keys and _has_preferred_keys(result, preferred_keys):
-                            if not allow_multiple:
-                                return result
-                            found_objects.insert(0, result)
-                        else:
-                            if not allow_multiple and not preferred_keys:
-                                return result
-                            found_objects.append(result)
-                except (yaml.YAMLError, Exception):
-                    pass
-    
-    # Strategy 3: Find JSON object boundaries in plain text (prefer larger/complete objects)
-    if not found_objects:
-        # Look for JSON object patterns: { ... }
-        # Use a more sophisticated approach to find complete JSON objects
-        json_objects = []
-        brace_count = 0
-        start_pos = -1
-        
-        for i, char in enumerate(text):
-            if char == '{':
-                if brace_count == 0:
-                    start_pos = i
-                brace_count += 1
-            elif char == '}':
-                brace_count -= 1
-                if brace_count == 0 and start_pos != -1:
-                    json_candidate = text[start_pos:i+1]
-                    result = _try_parse_json(json_candidate)
-                    if result is not None:
-                        json_objects.append((len(json_candidate), result))
-                    start_pos = -1
-        
-        # Sort by length (prefer larger objects) and try them
-        json_objects.sort(key=lambda x: x[0], reverse=True)
-        for _, result in json_objects:
-            if not allow_multiple:
-                return result
-            found_objects.append(result)
-    
-    # Strategy 4: Try parsing the entire text as JSON
-    if not found_objects:
-        result = _try_parse_json(text)
-        if result is not None:
-            if not allow_multiple:
-                return result
-            found_objects.append(result)
-    
-    # Strategy 5: Try to extract JSON from YAML format
-    if not found_objects:
-        # Check if it looks like YAML
-        if 'openapi:' in text.lower() or text.strip().startswith('---'):
-            try:
-                yaml_data = yaml.safe_load(text)
-                if isinstance(yaml_data, dict):
-                    if not allow_multiple:
-                        return yaml_data
-                    found_objects.append(yaml_data)
-            except (yaml.YAMLError, Exception):
-                pass
-    
-    # Strategy 6: Try to find JSON in escaped string format
-    if not found_objects:
-        # Look for escaped JSON strings like "{\"key\": \"value\"}"
-        escaped_json_pattern = r'"[^"]*\{[^"]*\}[^"]*"'
-        matches = re.findall(escaped_json_pattern, text)
-        for match in matches:
-            try:
-                # Unescape the string
-                unescaped = json.loads(match)
-                if isinstance(unescaped, str):
-                    result = _try_parse_json(unescaped)
-                    if result is not None:
-                        if not allow_multiple:
-                            return result
-                        found_objects.append(result)
-            except (json.JSONDecodeError, Exception):
-                pass
-    
-    # Strategy 7: Try to fix common JSON issues and parse
-    if not found_objects:
-        # Remove trailing commas
-        fixed_text = re.sub(r',(\s*[}\]])', r'\1', text)
-        result = _try_parse_json(fixed_text)
-        if result is not None:
-            if not allow_multiple:
-                return result
-            found_objects.append(result)
-    
-    # Strategy 8: Extract JSON from text with extra content
-    if not found_objects:
-        # Find the first { and last } in the text
-        first_brace = text.find('{')
-        last_brace = text.rfind('}')
-        if first_brace != -1 and last_brace != -1 and last_brace > first_brace:
-            json_candidate = text[first_brace:last_brace + 1]
-            result = _try_parse_json(json_candidate)
-            if result is not None:
-                if not allow_multiple:
-                    return result
-                found_objects.append(result)
-    
-    # Return results - prefer objects with preferred_keys
-    if found_objects:
-        if allow_multiple:
-            return found_objects
-        
-        # If preferred_keys specified, find the best match
-        if preferred_keys:
-            for obj in found_objects:
-                if _has_preferred_keys(obj, preferred_keys):
-                    return obj
         
-        # Return the first (or most preferred) object
-        return found_objects[0]
+        if found_objects:
+            if allow_multiple:
+                return found_objects
+            # No candidate carried preferred_keys; return the first one found
+            return found_objects[0]
     
     # Fallback: return original text or empty dict
     if fallback_to_text:
@@ -224,6 +92,207 @@ def extract_json_from_text(
     return {}
 
 
+class _TextScan:
+    """Per-call view of the response text; each scan over it runs at most once."""
+
+    def __init__(self, text: str, preferred_keys: Optional[List[str]] = None):
+        self.text = text
+        self.preferred_keys = preferred_keys
+
+    @cached_property
+    def fenced_blocks(self) -> List[Tuple[str, str]]:
+        """(language, content) for every markdown code block, in document order."""
+        blocks = []
+        for match in _FENCE_RE.finditer(self.text):
+            lang, body = match.group(1).strip(), match.group(2)
+            if not _FENCE_LANG_RE.fullmatch(lang):
+                # Inline block such as ```{"a": 1}``` - the "language" is content
+                body = match.group(1) + '\n' + body
+                lang = ''
+            blocks.append((lang.lower(), body.strip()))
+        return blocks
+
+    @cached_property
+    def balanced_spans(self) -> List[Tuple[str, Any, bool]]:
+        """(span, decoded value or None, truncated) for balanced {...}/[...] spans, largest first."""
+        spans = [
+            (self.text[start:end], value, truncated)
+            for start, end, value, truncated in _find_balanced_spans(self.text)
+        ]
+        spans.sort(key=lambda span: len(span[0]), reverse=True)
+        return spans
+
+
+def _find_balanced_spans(text: str) -> List[Tuple[int, int, Any, bool]]:
+    """
+    Find the outermost balanced ``{...}``/``[...]`` spans in a single pass.
+    
+    Each opener is first handed to the C JSON decoder, so a valid span is
+    decoded once and skipped in one step. Only invalid spans fall back to a
+    bracket/string state machine, which ignores brackets inside string
+    literals and skips mismatched closers. When the text ends inside an
+    unclosed bracket (a truncated response), the complete spans nested
+    directly inside it are returned instead, flagged as truncated: they are
+    fragments of the response, not the response itself.
+    
+    Args:
+        text: Text to scan
+        
+    Returns:
+        List of (start, end, decoded value or None, truncated) in document order
+    """
+    spans = []
+    pos = 0
+    while True:
+        opener = _OPENER_RE.search(text, pos)
+        if opener is None:
+            return spans
+        start = opener.start()
+        try:
+            value, end = _DECODER.raw_decode(text, start)
+        except json.JSONDecodeError:
+            pass
+        else:
+            spans.append((start, end, value, False))
+            pos = end
+            continue
+        
+        # Each frame is (opener, start offset, completed child spans)
+        stack = [(opener.group(), start, [])]
+        for token in _NEXT_BRACKET_RE.finditer(text, opener.end()):
+            char = token.group(2)
+            if char == '{' or char == '[':
+                stack.append((char, token.end() - 1, []))
+            elif char == '}' or char == ']':
+                if stack[-1][0] != _MATCHING_OPENER[char]:
+                    continue
+                _, child_start, _ = stack.pop()
+                if not stack:
+                    spans.append((start, token.end(), None, False))
+                    pos = token.end()
+                    break
+                stack[-1][2].append((child_start, token.end(), None))
+        else:
+            # Truncated: keep what completed inside the unclosed brackets
+            for _, _, children in stack:
+                for child_start, child_end, _ in children:
+                    try:
+                        value = json.loads(text[child_start:child_end])
+                    except json.JSONDecodeError:
+                        value = None
+                    spans.append((child_start, child_end, value, True))
+            return spans
+
+
+def _fenced_block_candidates(scan: _TextScan) -> Iterator[Dict[str, Any]]:
+    """Strategy 1: markdown code blocks, ```json/```yaml (or untagged) before other languages."""
+    # Note: Sometimes YAML is wrapped in ```json blocks, so we need to check both
+    for lang, content in scan.fenced_blocks:
+        if lang not in _JSON_FENCE_LANGS:
+            continue
+        result = _try_parse_json(content)
+        if result is None:
+            # If JSON parsing failed, try as YAML (common for OpenAPI specs)
+            result = _try_parse_yaml(content)
+        if result is not None:
+            yield result
+    
+    for lang, content in scan.fenced_blocks:
+        if lang in _JSON_FENCE_LANGS:
+            continue
+        result = _try_parse_json(content) if _looks_like_json(content) else None
+        if result is None:
+            result = _try_parse_yaml(content)
+        if result is not None:
+            yield result
+
+
+def _balanced_span_candidates(scan: _TextScan) -> Iterator[Dict[str, Any]]:
+    """
+    Strategy 2: balanced JSON spans in plain text (prefer larger/complete objects).
+
+    Fragments of a truncated response only count when they carry one of the
+    preferred keys; otherwise (and always when no keys were given) a nested
+    item would be returned as the whole analysis, so they are skipped and
+    extraction falls back to the raw text as before.
+    """
+    for _, value, truncated in scan.balanced_spans:
+        result = _as_object(value)
+        if result is None:
+            continue
+        if truncated and not _has_preferred_keys(result, scan.preferred_keys):
+            continue
+        yield result
+
+
+def _whole_text_candidates(scan: _TextScan) -> Iterator[Dict[str, Any]]:
+    """Strategy 3: the entire text as JSON, or as YAML when it looks like a spec."""
+    text = scan.text
+    spans = scan.balanced_spans
+    # A text that is itself one balanced span was already tried above
+    if not (spans and spans[0][0] == text):
+        result = _try_parse_json(text)
+        if result is not None:
+            yield result
+            return
+    
+    if _OPENAPI_RE.search(text) or text.startswith('---'):
+        try:
+            yaml_data = yaml.safe_load(text)
+            if isinstance(yaml_data, dict):
+                yield yaml_data
+        except (yaml.YAMLError, Exception):
+            pass
+
+
+def _escaped_string_candidates(scan: _TextScan) -> Iterator[Dict[str, Any]]:
+    """Strategy 4: JSON escaped inside a string literal, like "{\\"key\\": \\"value\\"}"."""
+    for literal in _BRACED_STRING_RE.findall(scan.text):
+        if not literal or '}' not in literal:
+            continue
+        try:
+            unescaped = json.loads(literal)
+        except (json.JSONDecodeError, Exception):
+            continue
+        if isinstance(unescaped, str):
+            result = _try_parse_json(unescaped)
+            if result is not None:
+                yield result
+
+
+def _repaired_candidates(scan: _TextScan) -> Iterator[Dict[str, Any]]:
+    """Strategy 5: fix common JSON issues (trailing commas) and parse again."""
+    candidates = [span for span, value, _ in scan.balanced_spans if value is None]
+    for candidate in candidates + [scan.text]:
+        fixed_text, fixes = _TRAILING_COMMA_RE.subn('', candidate)
+        if fixes:
+            result = _try_parse_json(fixed_text)
+            if result is not None:
+                yield result
+                return
+
+
+def _outer_brace_candidates(scan: _TextScan) -> Iterator[Dict[str, Any]]:
+    """Strategy 6: everything between the first { and the last } in the text."""
+    text = scan.text
+    first_brace = text.find('{')
+    last_brace = text.rfind('}')
+    if first_brace != -1 and last_brace != -1 and last_brace > first_brace:
+        result = _try_parse_json(text[first_brace:last_brace + 1])
+        if result is not None:
+            yield result
+
+
+_STRATEGIES = (
+    _fenced_block_candidates,
+    _balanced_span_candidates,
+    _whole_text_candidates,
+    _escaped_string_candidates,
+    _repaired_candidates,
+    _outer_brace_candidates,
+)
+
+
 def _try_parse_json(text: str) -> Optional[Dict[str, Any]]:
     """
     Try to parse text as JSON with error handling.
@@ -246,18 +315,48 @@ def _try_parse_json(text: str) -> Optional[Dict[str, Any]]:
         text = text[1:]
     
     try:
-        parsed = json.loads(text)
-        if isinstance(parsed, dict):
-            return parsed
-        elif isinstance(parsed, list) and len(parsed) > 0 and isinstance(parsed[0], dict):
-            # If it's a list of objects, return the first one
-            return parsed[0]
+        return _as_object(json.loads(text))
     except json.JSONDecodeError:
-        pass
+        return None
+
+
+def _as_object(parsed: Any) -> Optional[Dict[str, Any]]:
+    """
+    Narrow a decoded JSON value to the object an agent response is expected to hold.
     
+    Args:
+        parsed: Decoded JSON value
+        
+    Returns:
+        The dict itself, the first dict of a list of objects, or None
+    """
+    if isinstance(parsed, dict):
+        return parsed
+    elif isinstance(parsed, list) and len(parsed) > 0 and isinstance(parsed[0], dict):
+        # If it's a list of objects, return the first one
+        return parsed[0]
     return None
 
 
+def _try_parse_yaml(text: str) -> Optional[Dict[str, Any]]:
+    """
+    Try to parse text as a YAML mapping, if it looks like YAML at all.
+    
+    Args:
+        text: Text to parse
+        
+    Returns:
+        Parsed YAML dict or None if it is not YAML or parsing fails
+    """
+    if not _looks_like_yaml(text):
+        return None
+    try:
+        yaml_data = yaml.safe_load(text)
+    except (yaml.YAMLError, Exception):
+        return None
+    return yaml_data if isinstance(yaml_data, dict) else None
+
+
 def _has_preferred_keys(obj: Dict[str, Any], preferred_keys: List[str]) -> bool:
     """
     Check if object has any of the preferred keys.
@@ -297,13 +396,12 @@ def _looks_like_yaml(text: str) -> bool:
     if text.startswith('---'):
         return True
     
-    if 'openapi:' in text.lower()[:100]:  # Check first 100 chars
+    if _OPENAPI_RE.search(text, 0, 100):  # Check first 100 chars
         return True
     
     # Check for YAML key: value pattern (not JSON "key": value)
-    yaml_pattern = r'^\s*[a-zA-Z_][a-zA-Z0-9_]*\s*:\s*'
-    lines = text.split('\n')[:5]  # Check first 5 lines
-    yaml_lines = sum(1 for line in lines if re.match(yaml_pattern, line))
+    lines = text.split('\n', 5)[:5]  # Check first 5 lines
+    yaml_lines = sum(1 for line in lines if _YAML_LINE_RE.match(line))
     if yaml_lines >= 2:  # At least 2 lines look like YAML
         return True
     
@@ -360,9 +458,7 @@ def extract_yaml_from_text(text: str) -> Optional[Dict[str, Any]]:
     
     try:
         # Try to extract YAML from code blocks
-        yaml_block_pattern = r'```(?:yaml|yml)?\s*\n?(.*?)```'
-        matches = re.findall(yaml_block_pattern, text, re.DOTALL | re.IGNORECASE)
-        for match in matches:
+        for match in _YAML_BLOCK_RE.findall(text):
             try:
                 yaml_data = yaml.safe_load(match.strip())
                 if isinstance(yaml_data, dict):
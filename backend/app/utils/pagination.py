@@ -0,0 +1,96 @@
+"""Keyset (cursor) pagination helpers for list endpoints."""
+import base64
+import json
+import os
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+from fastapi import HTTPException, Response
+from sqlalchemy import and_, or_
+
+# Page size settings from environment variables (the default applies to
+# requests that pass a cursor without a limit)
+LIST_DEFAULT_PAGE_SIZE = int(os.getenv("LIST_DEFAULT_PAGE_SIZE", "100"))
+LIST_MAX_PAGE_SIZE = int(os.getenv("LIST_MAX_PAGE_SIZE", "500"))
+
+# Summary projections return this many leading characters of large text columns
+PREVIEW_CHARS = 200
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    """
+    Encode the (created_at, id) position of the last row on a page.
+
+    Args:
+        created_at: Row creation time
+        row_id: Row ID
+
+    Returns:
+        Opaque URL-safe cursor string
+    """
+    raw = json.dumps([created_at.isoformat(), row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Raises:
+        HTTPException: 400 if the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def clamp_page_size(limit: Optional[int]) -> int:
+    """Apply the default and maximum page size."""
+    if not limit or limit < 1:
+        return LIST_DEFAULT_PAGE_SIZE
+    return min(limit, LIST_MAX_PAGE_SIZE)
+
+
+def paginate(query, model, cursor: Optional[str], limit: Optional[int]) -> Tuple[List[Any], Optional[str]]:
+    """
+    Fetch one page of a query, newest first, ordered by (created_at, id).
+
+    Paging is opt-in: without a cursor or limit every row is returned, as
+    list endpoints did before they were paginated. With either, uses a
+    keyset condition instead of OFFSET, so every page costs the same
+    regardless of how deep it is. The query may select the model or a column
+    projection, as long as created_at and id are included.
+
+    Args:
+        query: Filtered SQLAlchemy query (without ordering or limit)
+        model: Mapped class with created_at and id columns
+        cursor: Cursor from the previous page, or None for the first page
+        limit: Requested page size (clamped)
+
+    Returns:
+        (rows, next_cursor) where next_cursor is None on the last page
+    """
+    if not cursor and not limit:
+        return query.order_by(model.created_at.desc(), model.id.desc()).all(), None
+
+    page_size = clamp_page_size(limit)
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        query = query.filter(or_(
+            model.created_at < created_at,
+            and_(model.created_at == created_at, model.id < row_id)
+        ))
+
+    rows = query.order_by(model.created_at.desc(), model.id.desc()).limit(page_size + 1).all()
+    if len(rows) <= page_size:
+        return rows, None
+    rows = rows[:page_size]
+    return rows, encode_cursor(rows[-1].created_at, rows[-1].id)
+
+
+def set_next_cursor(response: Response, next_cursor: Optional[str]) -> None:
+    """Expose the next page cursor in the X-Next-Cursor header (list bodies stay plain arrays)."""
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
@@ -0,0 +1,189 @@
+"""Extract definitions, imports and call references from source code."""
+import ast
+import re
+from bisect import bisect_right
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+# Symbol kinds
+DEFINITION = "definition"
+IMPORT = "import"
+REFERENCE = "reference"
+
+MAX_NAME_LENGTH = 255
+
+# Definitions in C-like, scripting and JVM languages; group "name" is the symbol
+_REGEX_DEFINITIONS: List[Tuple[str, re.Pattern]] = [
+    ("class", re.compile(
+        r'^\s*(?:export\s+)?(?:default\s+)?(?:public\s+|private\s+|protected\s+|internal\s+)?'
+        r'(?:abstract\s+|final\s+|sealed\s+|data\s+|static\s+)*'
+        r'(?:class|interface|enum|struct|trait|record|object|module|protocol)\s+(?P<name>[A-Za-z_]\w*)',
+        re.MULTILINE
+    )),
+    ("type", re.compile(r'^\s*(?:export\s+)?type\s+(?P<name>[A-Za-z_]\w*)', re.MULTILINE)),
+    ("function", re.compile(
+        r'^\s*(?:export\s+)?(?:default\s+)?(?:async\s+)?function\s*\*?\s*(?P<name>[A-Za-z_$][\w$]*)',
+        re.MULTILINE
+    )),
+    ("function", re.compile(
+        r'^\s*(?:export\s+)?(?:const|let|var)\s+(?P<name>[A-Za-z_$][\w$]*)\s*=\s*(?:async\s+)?'
+        r'(?:function\b|\([^)]*\)\s*=>|[A-Za-z_$][\w$]*\s*=>)',
+        re.MULTILINE
+    )),
+    ("function", re.compile(r'^\s*(?:pub(?:\([^)]*\))?\s+)?(?:async\s+)?fn\s+(?P<name>[A-Za-z_]\w*)', re.MULTILINE)),
+    ("function", re.compile(r'^\s*func\s+(?:\([^)]*\)\s*)?(?P<name>[A-Za-z_]\w*)', re.MULTILINE)),
+    ("function", re.compile(r'^\s*def\s+(?:self\.)?(?P<name>[A-Za-z_]\w*[?!]?)', re.MULTILINE)),
+    ("method", re.compile(
+        r'^\s*(?:@\w+\s+)*(?:(?:public|private|protected|internal|static|final|abstract|override|'
+        r'synchronized|virtual|async|suspend)\s+)+[\w<>\[\],.? ]*?\b(?P<name>[A-Za-z_]\w*)\s*\(',
+        re.MULTILINE
+    )),
+]
+
+_REGEX_IMPORTS = [
+    re.compile(r'^\s*import\s+(?:[\w*{}\s,$]+\s+from\s+)?[\'"](?P<name>[^\'"]+)[\'"]', re.MULTILINE),  # JS/TS
+    re.compile(r'require\(\s*[\'"](?P<name>[^\'"]+)[\'"]\s*\)'),
+    re.compile(r'^\s*import\s+(?:static\s+)?(?P<name>[\w.]+(?:\.\*)?)\s*;', re.MULTILINE),  # Java/Kotlin/Scala
+    re.compile(r'^\s*#\s*include\s*[<"](?P<name>[^>"]+)[>"]', re.MULTILINE),  # C/C++
+    re.compile(r'^\s*use\s+(?P<name>[\w:\\]+)', re.MULTILINE),  # Rust/PHP
+    re.compile(r'^\s*(?:import\s+)?(?:\w+\s+)?"(?P<name>[\w./-]+)"\s*$', re.MULTILINE),  # Go import blocks
+    re.compile(r'^\s*using\s+(?P<name>[\w.]+)\s*;', re.MULTILINE),  # C#
+]
+
+_CALL_RE = re.compile(r'(?<![\w$])(?P<name>[A-Za-z_$][\w$]*)\s*\(')
+_NOT_CALLS = frozenset("""
+if for while switch catch return function fn func def class new sizeof typeof await async yield
+elif with assert print super this self not and or in is lambda match case else do try throw
+""".split())
+
+
+@dataclass
+class ExtractedSymbol:
+    """One definition, import or call reference found in a file."""
+    name: str
+    kind: str  # definition, import, reference
+    symbol_type: Optional[str]  # module, class, function, method, variable, call, ...
+    line: int
+    qualified_name: Optional[str] = None
+
+
+def module_name(file_path: str) -> str:
+    """Dotted module name of a file path (src/app/util.py -> src.app.util)."""
+    path = re.sub(r'\.[^./\\]+$', '', file_path.replace('\\', '/')).strip('/')
+    if path.endswith('/__init__'):
+        path = path[:-len('/__init__')]
+    return (path.replace('/', '.') or file_path)[-MAX_NAME_LENGTH:]
+
+
+def extract_symbols(content: str, file_path: str, language: Optional[str] = None) -> List[ExtractedSymbol]:
+    """
+    Extract the symbols of one file.
+
+    Python is parsed with ast (falling back to the regex tokenizer on
+    syntax errors); other languages use lightweight regex tokenizers. The
+    first entry is always the file's own module definition. References are
+    deduplicated per name, keeping the first line.
+
+    Args:
+        content: File content
+        file_path: Path of the file (module name, language fallback)
+        language: Language name as stored on CodeFile
+
+    Returns:
+        Symbols in the order found
+    """
+    symbols = [ExtractedSymbol(module_name(file_path), DEFINITION, "module", 1, file_path[-512:])]
+    content = content or ""
+    is_python = (language or "").lower() == "python" or file_path.endswith((".py", ".pyi"))
+    if is_python:
+        try:
+            symbols.extend(_python_symbols(ast.parse(content)))
+            return _dedupe(symbols)
+        except (SyntaxError, ValueError, RecursionError):
+            pass
+    symbols.extend(_regex_symbols(content))
+    return _dedupe(symbols)
+
+
+def _python_symbols(tree: ast.AST) -> List[ExtractedSymbol]:
+    symbols: List[ExtractedSymbol] = []
+
+    def visit(node: ast.AST, scope: List[str], in_class: bool) -> None:
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                if isinstance(child, ast.ClassDef):
+                    symbol_type = "class"
+                else:
+                    symbol_type = "method" if in_class else "function"
+                qualified = ".".join(scope + [child.name])
+                symbols.append(ExtractedSymbol(child.name, DEFINITION, symbol_type, child.lineno, qualified))
+                visit(child, scope + [child.name], isinstance(child, ast.ClassDef))
+                continue
+            if isinstance(child, ast.Import):
+                for alias in child.names:
+                    symbols.append(ExtractedSymbol(alias.name, IMPORT, "module", child.lineno, alias.name))
+            elif isinstance(child, ast.ImportFrom):
+                base = "." * child.level + (child.module or "")
+                for alias in child.names:
+                    qualified = f"{base}.{alias.name}" if child.module else f"{base}{alias.name}"
+                    symbols.append(ExtractedSymbol(alias.name, IMPORT, "name", child.lineno, qualified))
+            elif isinstance(child, (ast.Assign, ast.AnnAssign)) and not scope:
+                targets = child.targets if isinstance(child, ast.Assign) else [child.target]
+                for target in targets:
+                    if isinstance(target, ast.Name):
+                        symbols.append(ExtractedSymbol(target.id, DEFINITION, "variable", child.lineno, target.id))
+            elif isinstance(child, ast.Call):
+                func = child.func
+                if isinstance(func, ast.Name):
+                    symbols.append(ExtractedSymbol(func.id, REFERENCE, "call", child.lineno))
+                elif isinstance(func, ast.Attribute):
+                    symbols.append(ExtractedSymbol(func.attr, REFERENCE, "call", child.lineno))
+            visit(child, scope, in_class)
+
+    visit(tree, [], False)
+    return symbols
+
+
+def _regex_symbols(content: str) -> List[ExtractedSymbol]:
+    symbols: List[ExtractedSymbol] = []
+    line_starts = [0] + [match.end() for match in re.finditer(r'\n', content)]
+
+    def line_of(offset: int) -> int:
+        return bisect_right(line_starts, offset)
+
+    defined: Dict[str, int] = {}
+    for symbol_type, pattern in _REGEX_DEFINITIONS:
+        for match in pattern.finditer(content):
+            name = match.group("name")
+            if name in _NOT_CALLS or name in defined:
+                continue
+            defined[name] = match.start("name")
+            symbols.append(ExtractedSymbol(name, DEFINITION, symbol_type, line_of(match.start("name")), name))
+    for pattern in _REGEX_IMPORTS:
+        for match in pattern.finditer(content):
+            name = match.group("name")
+            symbols.append(ExtractedSymbol(name, IMPORT, "module", line_of(match.start("name")), name))
+    for match in _CALL_RE.finditer(content):
+        name = match.group("name")
+        # A definition's own "name(" is not a call
+        if name in _NOT_CALLS or defined.get(name) == match.start("name"):
+            continue
+        symbols.append(ExtractedSymbol(name, REFERENCE, "call", line_of(match.start("name"))))
+    symbols.sort(key=lambda symbol: symbol.line)
+    return symbols
+
+
+def _dedupe(symbols: List[ExtractedSymbol]) -> List[ExtractedSymbol]:
+    """Drop repeated references/imports of a name and over-long names."""
+    seen = set()
+    result = []
+    for symbol in symbols:
+        if not symbol.name or len(symbol.name) > MAX_NAME_LENGTH:
+            continue
+        if symbol.kind != DEFINITION:
+            key = (symbol.kind, symbol.name)
+            if key in seen:
+                continue
+            seen.add(key)
+        result.append(symbol)
+    return result
@@ -0,0 +1,159 @@
+"""Micro-benchmark for utils.json_extractor over representative agent responses.
+
+The built-in corpus is generated: raw LLM responses are not stored anywhere
+(suggestions keep the re-serialized JSON), so it mirrors the shapes agents
+produce instead. Real responses saved one per file can be timed with --corpus.
+
+Usage:
+    python benchmark_json_extractor.py                  # time the current extractor
+    python benchmark_json_extractor.py --baseline REF   # compare with the version at git REF
+    python benchmark_json_extractor.py --corpus DIR     # time the responses saved in DIR
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import timeit
+import types
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.utils import json_extractor
+
+EXTRACTOR_PATH = 'backend/app/utils/json_extractor.py'
+
+
+def _openapi_spec(paths: int) -> dict:
+    """A generated OpenAPI document, roughly 1 KB of JSON per path."""
+    spec = {
+        "openapi": "3.0.3",
+        "info": {"title": "Payments Service", "version": "1.0.0", "description": "Payment {orders} & [refunds]"},
+        "servers": [{"url": "https://api.example.com/v1"}],
+        "paths": {},
+    }
+    for i in range(paths):
+        spec["paths"][f"/resources{i}/{{id}}"] = {
+            "get": {
+                "summary": f"Fetch resource {i}",
+                "description": "Returns the resource; braces like {id} or [0] in text must not confuse the scanner.",
+                "parameters": [{"name": "id", "in": "path", "required": True, "schema": {"type": "string"}}],
+                "responses": {
+                    "200": {"description": "OK", "content": {"application/json": {"schema": {
+                        "type": "object",
+                        "properties": {"id": {"type": "string"}, "amount": {"type": "number"}, "status": {"type": "string"}},
+                    }}}},
+                    "404": {"description": "Not found"},
+                },
+            }
+        }
+    return spec
+
+
+def _integration_response(paths: int) -> str:
+    """IntegrationAgent style: prose, then a ```json block with the spec embedded as a string."""
+    payload = {
+        "serviceName": "payments",
+        "version": "1.0.0",
+        "baseUrl": "https://api.example.com/v1",
+        "description": "Payment orchestration",
+        "openapi_spec": json.dumps(_openapi_spec(paths), indent=2),
+        "endpoints": [{"method": "GET", "path": f"/resources{i}/{{id}}"} for i in range(paths)],
+    }
+    return (
+        "Here is the integration specification you asked for. The schema fragment "
+        '{"type": "object", "properties": {}} is reused below.\n\n'
+        f"```json\n{json.dumps(payload, indent=2)}\n```\n\nLet me know if you need changes."
+    )
+
+
+def _bare_spec_response(paths: int) -> str:
+    """API spec agent style: an unfenced JSON spec surrounded by prose."""
+    return (
+        "Sure! Below is the generated OpenAPI document (see [notes] at the end).\n"
+        f"{json.dumps(_openapi_spec(paths), indent=2)}\n"
+        "Notes: paths follow the {resource}/{id} convention."
+    )
+
+
+def _trailing_comma_response(findings: int) -> str:
+    """
+    Bug scanner style: a findings list with the trailing commas models like to emit.
+
+    The baseline extractor cannot repair this one and returns {}, so its
+    timing covers less work than the current one.
+    """
+    items = ",\n".join(
+        f'    {{"file": "app/module_{i}.py", "line": {i}, "severity": "high", '
+        f'"description": "Possible None dereference in handler {i}",}}'
+        for i in range(findings)
+    )
+    return f'Analysis complete.\n{{\n  "bugs": [\n{items},\n  ],\n  "summary": "{findings} issues"\n}}'
+
+
+def build_corpus() -> dict:
+    """Named responses in the 50-100 KB range plus a small everyday one."""
+    return {
+        "integration_fenced_json_95kb": (_integration_response(60), ["openapi_spec", "serviceName"]),
+        "bare_openapi_json_80kb": (_bare_spec_response(70), ["openapi", "paths"]),
+        "trailing_commas_60kb": (_trailing_comma_response(500), None),
+        "small_fenced_json_1kb": (_integration_response(0), None),
+    }
+
+
+def load_corpus(directory: str) -> dict:
+    """Responses saved one per file in a directory (no preferred keys)."""
+    corpus = {}
+    for name in sorted(os.listdir(directory)):
+        path = os.path.join(directory, name)
+        if os.path.isfile(path):
+            with open(path, encoding='utf-8') as f:
+                corpus[name] = (f.read(), None)
+    return corpus
+
+
+def load_baseline(ref: str) -> types.ModuleType:
+    """Load json_extractor as it was at a git ref, for side-by-side timing."""
+    repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    source = subprocess.run(
+        ['git', 'show', f'{ref}:{EXTRACTOR_PATH}'],
+        cwd=repo_root, check=True, capture_output=True, text=True,
+    ).stdout
+    module = types.ModuleType('json_extractor_baseline')
+    exec(compile(source, f'{ref}:{EXTRACTOR_PATH}', 'exec'), module.__dict__)
+    return module
+
+
+def time_extractor(module: types.ModuleType, text: str, preferred_keys, number: int) -> float:
+    """Best-of-5 mean seconds per extract_json_from_text call."""
+    call = lambda: module.extract_json_from_text(text, fallback_to_text=False, preferred_keys=preferred_keys)
+    return min(timeit.repeat(call, number=number, repeat=5)) / number
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--baseline', help='git ref to compare against (e.g. HEAD~1)')
+    parser.add_argument('--number', type=int, default=20, help='calls per timing run')
+    parser.add_argument('--corpus', help='directory of saved agent responses, one per file')
+    args = parser.parse_args()
+
+    baseline = load_baseline(args.baseline) if args.baseline else None
+
+    print(f"{'response':<32} {'size':>8} {'current':>11}" + (f" {'baseline':>11} {'speedup':>8}" if baseline else ""))
+    corpus = load_corpus(args.corpus) if args.corpus else build_corpus()
+    for name, (text, preferred_keys) in corpus.items():
+        current_result = json_extractor.extract_json_from_text(text, fallback_to_text=False, preferred_keys=preferred_keys)
+        current = time_extractor(json_extractor, text, preferred_keys, args.number)
+        line = f"{name:<32} {len(text) / 1024:>6.1f}KB {current * 1000:>9.2f}ms"
+        if baseline:
+            baseline_result = baseline.extract_json_from_text(text, fallback_to_text=False, preferred_keys=preferred_keys)
+            previous = time_extractor(baseline, text, preferred_keys, args.number)
+            line += f" {previous * 1000:>9.2f}ms {previous / current:>7.1f}x"
+            if baseline_result != current_result:
+                line += "  (results differ)"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Script to smoke-check that every app module imports and the ORM mappers configure.
+
+Needs no database: app.main is skipped because it creates the tables on
+import. Exits non-zero on the first module that fails, so mapper errors
+(e.g. loader options built before all tables are imported) are caught
+before deployment.
+
+Usage:
+    python check_app_imports.py
+"""
+import importlib
+import pkgutil
+import sys
+import os
+import traceback
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy.orm import configure_mappers
+
+# Modules that connect to the database at import time
+SKIPPED_MODULES = {"app.main"}
+
+
+def check_app_imports() -> bool:
+    """Import every module under app/ and configure the mappers; True if all succeed."""
+    import app
+
+    ok = True
+    for module in pkgutil.walk_packages(app.__path__, prefix="app."):
+        if module.name in SKIPPED_MODULES:
+            continue
+        try:
+            importlib.import_module(module.name)
+        except Exception:
+            ok = False
+            print(f"[FAIL] import {module.name}")
+            traceback.print_exc()
+    try:
+        configure_mappers()
+        print("[OK] mappers configured")
+    except Exception:
+        ok = False
+        print("[FAIL] configure mappers")
+        traceback.print_exc()
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if check_app_imports() else 1)
@@ -0,0 +1,110 @@
+"""Script to check that the hot repository queries use their composite indexes.
+
+Runs EXPLAIN (MySQL) or EXPLAIN QUERY PLAN (SQLite) for each query and exits
+non-zero if the optimizer picks a different index. Run it against a database
+with representative data: on near-empty tables the optimizer may prefer a
+single-column index or a table scan.
+
+Usage:
+    python check_query_indexes.py [--project-id ID]
+"""
+import argparse
+import sys
+import os
+from pathlib import Path
+from dotenv import load_dotenv
+
+# Load environment variables from .env file
+env_path = Path(__file__).parent / '.env'
+load_dotenv(dotenv_path=env_path)
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+from app.database import SessionLocal, init_db
+from app.tables import (
+    Suggestion, SuggestionStatus, AgentRun, AgentType, BusinessRule, RuleStatus, CodeFile
+)
+
+
+def hot_queries(db, project_id: int):
+    """(description, query, expected index) for the main repository access paths."""
+    return [
+        (
+            "suggestions of a project by status, newest first",
+            db.query(Suggestion).filter(
+                Suggestion.project_id == project_id,
+                Suggestion.status == SuggestionStatus.PENDING
+            ).order_by(Suggestion.created_at.desc(), Suggestion.id.desc()).limit(100),
+            "ix_suggestions_project_status_created",
+        ),
+        (
+            "latest run of an agent for a project",
+            db.query(AgentRun).filter(
+                AgentRun.project_id == project_id,
+                AgentRun.agent_type == AgentType.BUSINESS_LOGIC_POLICY
+            ).order_by(AgentRun.created_at.desc()).limit(1),
+            "ix_agent_runs_project_agent_created",
+        ),
+        (
+            "approved business rules of a project",
+            db.query(BusinessRule).filter(
+                BusinessRule.project_id == project_id,
+                BusinessRule.status == RuleStatus.APPROVED
+            ),
+            "ix_business_rules_project_status",
+        ),
+        (
+            "code file by project and path",
+            db.query(CodeFile).filter(
+                CodeFile.project_id == project_id,
+                CodeFile.file_path == "src/main.py"
+            ).limit(1),
+            "ix_code_files_project_path",
+        ),
+        (
+            "existing-row lookup of upsert_batch",
+            db.query(CodeFile.id, CodeFile.file_path, CodeFile.content_hash, CodeFile.language).filter(
+                CodeFile.project_id == project_id,
+                CodeFile.file_path.in_(["src/main.py", "src/app.py"])
+            ),
+            "ix_code_files_project_path",
+        ),
+    ]
+
+
+def used_indexes(db, query) -> str:
+    """Indexes the database plans to use for a query, as reported by EXPLAIN."""
+    dialect = db.get_bind().dialect
+    sql = str(query.statement.compile(dialect=dialect, compile_kwargs={"literal_binds": True}))
+    if dialect.name == "sqlite":
+        rows = db.execute(text(f"EXPLAIN QUERY PLAN {sql}")).mappings().all()
+        return "; ".join(row["detail"] for row in rows)
+    rows = db.execute(text(f"EXPLAIN {sql}")).mappings().all()
+    return "; ".join(f"{row['table']}: {row['key']} ({row['Extra'] or ''})" for row in rows)
+
+
+def check_query_indexes(project_id: int) -> bool:
+    """Print the plan of each hot query; True if all use their expected index."""
+    init_db()
+    db = SessionLocal()
+
+    try:
+        ok = True
+        for description, query, index in hot_queries(db, project_id):
+            plan = used_indexes(db, query)
+            passed = index in plan
+            ok = ok and passed
+            print(f"[{'OK' if passed else 'MISS'}] {description}: expected {index}")
+            print(f"       {plan}")
+        return ok
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--project-id", type=int, default=1, help="Project ID to plan the queries for")
+    args = parser.parse_args()
+    sys.exit(0 if check_query_indexes(args.project_id) else 1)
@@ -13,6 +13,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from app.database import SessionLocal, init_db
 from app.tables import Project, CodeFile
+from app.tables.code_files import compute_content_hash
 
 def create_demo_data():
     """Create sample project and code files for demo."""
@@ -142,7 +143,8 @@ def validate_price(price):
                 project_id=project.id,
                 file_path=file_data["file_path"],
                 content=file_data["content"],
-                language=file_data["language"]
+                language=file_data["language"],
+                content_hash=compute_content_hash(file_data["content"])
             )
             db.add(code_file)
             print(f"Created file: {file_data['file_path']}")
@@ -0,0 +1,34 @@
+"""Script to rebuild the code symbol index from the code_files table."""
+import sys
+import os
+from pathlib import Path
+from dotenv import load_dotenv
+
+# Load environment variables from .env file
+env_path = Path(__file__).parent / '.env'
+load_dotenv(dotenv_path=env_path)
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import SessionLocal, init_db
+from app.tables import CodeSymbolRepository
+
+def rebuild_code_symbol_index():
+    """Re-extract code_symbols (backfill after upgrade, or repair drift)."""
+    init_db()
+    db = SessionLocal()
+
+    try:
+        files = CodeSymbolRepository(db).rebuild()
+        print(f"Rebuilt code symbol index: {files} files indexed")
+    except Exception as e:
+        db.rollback()
+        print(f"Error rebuilding code symbol index: {e}")
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    rebuild_code_symbol_index()
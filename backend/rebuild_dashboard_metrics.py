@@ -0,0 +1,34 @@
+"""Script to rebuild the dashboard metrics rollup from the source tables."""
+import sys
+import os
+from pathlib import Path
+from dotenv import load_dotenv
+
+# Load environment variables from .env file
+env_path = Path(__file__).parent / '.env'
+load_dotenv(dotenv_path=env_path)
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import SessionLocal, init_db
+from app.tables import DashboardMetricRepository
+
+def rebuild_dashboard_metrics():
+    """Recompute dashboard_daily_metrics (backfill after upgrade, or repair drift)."""
+    init_db()
+    db = SessionLocal()
+
+    try:
+        rows = DashboardMetricRepository(db).rebuild()
+        print(f"Rebuilt dashboard metrics: {rows} rollup rows")
+    except Exception as e:
+        db.rollback()
+        print(f"Error rebuilding dashboard metrics: {e}")
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    rebuild_dashboard_metrics()
@@ -0,0 +1,34 @@
+"""Script to rebuild the business rule term index from the business_rules table."""
+import sys
+import os
+from pathlib import Path
+from dotenv import load_dotenv
+
+# Load environment variables from .env file
+env_path = Path(__file__).parent / '.env'
+load_dotenv(dotenv_path=env_path)
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import SessionLocal, init_db
+from app.tables import RuleTermRepository
+
+def rebuild_rule_term_index():
+    """Recompute business_rule_terms (backfill after upgrade, or repair drift)."""
+    init_db()
+    db = SessionLocal()
+
+    try:
+        rules = RuleTermRepository(db).rebuild()
+        print(f"Rebuilt rule term index: {rules} rules indexed")
+    except Exception as e:
+        db.rollback()
+        print(f"Error rebuilding rule term index: {e}")
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    rebuild_rule_term_index()